@@ -8,7 +8,7 @@ import os
 from typing import List, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings
-from functools import lru_cache
+from functools import cache
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
@@ -44,6 +44,10 @@ class Settings(BaseSettings):
         default=None,
         env="TEXT_SUMMARIZER_LORA"
     )
+    TEXT_SUMMARIZER_DRAFT_MODEL: Optional[str] = Field(
+        default=None,
+        env="TEXT_SUMMARIZER_DRAFT_MODEL"
+    )  # e.g. sshleifer/distilbart-cnn-6-6, enables speculative (greedy) decoding
     
     # Image model settings
     IMAGE_CAPTION_MODEL: str = Field(
@@ -61,8 +65,24 @@ class Settings(BaseSettings):
         env="AUDIO_ASR_MODEL"
     )
     
+    # Inference optimization settings
+    TORCH_COMPILE: bool = Field(default=True, env="TORCH_COMPILE")
+    CPU_INT8_QUANTIZATION: bool = Field(default=True, env="CPU_INT8_QUANTIZATION")
+    QUANT_MODE: Optional[str] = Field(default=None, env="QUANT_MODE")  # None, int8, nf4
+    # Files accepted per batch upload request
+    MAX_BATCH_SIZE: int = Field(default=8, env="MAX_BATCH_SIZE")
+    # Inputs per model forward pass; also the largest warmed-up CUDA-graph bucket
+    MAX_INFERENCE_BATCH_SIZE: int = Field(default=8, env="MAX_INFERENCE_BATCH_SIZE")
+    MAX_BATCH_WAIT_MS: int = Field(default=5, env="MAX_BATCH_WAIT_MS")
+    # Model calls in flight per route module; keep >= MAX_INFERENCE_BATCH_SIZE so batches can fill
+    MAX_CONCURRENT_REQUESTS: int = Field(default=16, env="MAX_CONCURRENT_REQUESTS")
+    # Results reused for byte-identical inputs; 0 disables the cache
+    RESULT_CACHE_SIZE: int = Field(default=2048, env="RESULT_CACHE_SIZE")
+    RESULT_CACHE_TTL: int = Field(default=3600, env="RESULT_CACHE_TTL")  # seconds
+    
     # File upload settings
     MAX_FILE_SIZE: int = Field(default=10 * 1024 * 1024, env="MAX_FILE_SIZE")  # 10MB
+    UPLOAD_BUFFER_POOL_SIZE: int = Field(default=4, env="UPLOAD_BUFFER_POOL_SIZE")
     ALLOWED_IMAGE_TYPES: List[str] = Field(
         default=["image/jpeg", "image/png", "image/webp", "image/bmp"],
         env="ALLOWED_IMAGE_TYPES"
@@ -76,10 +96,13 @@ class Settings(BaseSettings):
     MAX_TEXT_LENGTH: int = Field(default=10000, env="MAX_TEXT_LENGTH")
     MAX_SUMMARY_LENGTH: int = Field(default=500, env="MAX_SUMMARY_LENGTH")
     MAX_CAPTION_LENGTH: int = Field(default=200, env="MAX_CAPTION_LENGTH")
+    # Side length the captioner resizes to; JPEGs are downscaled toward it while decoding
+    IMAGE_INPUT_SIZE: int = Field(default=384, env="IMAGE_INPUT_SIZE")
     
     # Rate limiting
     RATE_LIMIT_REQUESTS: int = Field(default=100, env="RATE_LIMIT_REQUESTS")
     RATE_LIMIT_WINDOW: int = Field(default=3600, env="RATE_LIMIT_WINDOW")  # seconds
+    REDIS_URL: Optional[str] = Field(default=None, env="REDIS_URL")
     
     # Logging
     LOG_LEVEL: str = Field(default="INFO", env="LOG_LEVEL")
@@ -91,7 +114,7 @@ class Settings(BaseSettings):
         case_sensitive = True
         extra = "ignore"
 
-@lru_cache()
+@cache
 def get_settings() -> Settings:
     """Get cached settings instance."""
     return Settings()
@@ -4,13 +4,20 @@ This module contains common FastAPI dependencies used across different routes,
 including authentication, rate limiting, and model access.
 """
 
-from fastapi import Depends, HTTPException, status, UploadFile
+from fastapi import Depends, HTTPException, Request, status, UploadFile
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Callable, List, NamedTuple
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from functools import lru_cache
+import queue
 import time
-from collections import defaultdict
+import uuid
+from collections import defaultdict, deque
+from streaming_form_data import StreamingFormDataParser
+from streaming_form_data.targets import BaseTarget
 
-from .config import settings
+from .config import settings, get_settings
 from .models.utils import ModelLoader
 from .models.text_summarizer import TextSummarizer
 from .models.image_captioning import ImageCaptioner
@@ -19,8 +26,41 @@ from .models.audio_asr import AudioASR
 # Security scheme
 security = HTTPBearer(auto_error=False)
 
-# Rate limiting storage (in production, use Redis)
-rate_limit_storage: Dict[str, list] = defaultdict(list)
+# Allowed upload content types, hashed once for O(1) membership checks
+_IMAGE_TYPES = frozenset(settings.ALLOWED_IMAGE_TYPES)
+_AUDIO_TYPES = frozenset(settings.ALLOWED_AUDIO_TYPES)
+
+# Chunk size used when streaming uploads into pooled buffers
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Allowance for multipart boundaries, part headers and small form fields when
+# rejecting oversized bodies from Content-Length alone
+_MULTIPART_OVERHEAD = 64 * 1024
+
+# Leading bytes of the container formats accepted as audio (WAV, Ogg, FLAC,
+# MP3 with an ID3 tag); bare MPEG frames are matched by their sync word
+_AUDIO_MAGIC = (b"RIFF", b"OggS", b"fLaC", b"ID3")
+
+# Rate limiting storage (fallback when Redis is not configured), monotonic timestamps per IP
+rate_limit_storage: Dict[str, deque] = defaultdict(deque)
+
+# Rolling-window rate limit executed atomically inside Redis.
+# KEYS[1] = bucket key, ARGV = now, window, max_requests, member
+# Returns 1 if the request is allowed, 0 if the limit is exceeded.
+RATE_LIMIT_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local max_requests = tonumber(ARGV[3])
+redis.call('ZREMRANGEBYSCORE', key, 0, now - window)
+local count = redis.call('ZCARD', key)
+if count >= max_requests then
+    return 0
+end
+redis.call('ZADD', key, now, ARGV[4])
+redis.call('EXPIRE', key, window)
+return 1
+"""
 
 def get_model_loader() -> ModelLoader:
     """Dependency to get the global model loader instance."""
@@ -43,29 +83,60 @@ def get_current_user(
     # For now, return a mock user
     return {"user_id": "anonymous", "username": "anonymous"}
 
-def rate_limit_dependency(
-    client_ip: str,
+async def rate_limit_dependency(
+    request: Request,
     max_requests: int = settings.RATE_LIMIT_REQUESTS,
     window_seconds: int = settings.RATE_LIMIT_WINDOW
 ):
-    """Rate limiting dependency."""
-    current_time = time.time()
+    """Rate limiting dependency.
+
+    Uses a Redis sorted-set rolling window when a client is available on
+    ``app.state.redis`` so limits are shared across workers, and falls back
+    to in-process storage otherwise.
+    """
+    client_ip = request.client.host if request.client else "unknown"
+    redis_client = getattr(request.app.state, "redis", None)
     
-    # Clean old requests
-    rate_limit_storage[client_ip] = [
-        req_time for req_time in rate_limit_storage[client_ip]
-        if current_time - req_time < window_seconds
-    ]
+    if redis_client is not None:
+        current_time = time.time()
+        allowed = await redis_client.evalsha(
+            request.app.state.rate_limit_sha,
+            1,
+            f"rate_limit:{client_ip}",
+            current_time,
+            window_seconds,
+            max_requests,
+            f"{current_time}:{uuid.uuid4().hex}"
+        )
+    else:
+        requests = rate_limit_storage[client_ip]
+        current_time = time.monotonic()
+        
+        # Clean old requests
+        cutoff = current_time - window_seconds
+        while requests and requests[0] <= cutoff:
+            requests.popleft()
+        
+        allowed = len(requests) < max_requests
+        if allowed:
+            requests.append(current_time)
     
     # Check rate limit
-    if len(rate_limit_storage[client_ip]) >= max_requests:
+    if not allowed:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail=f"Rate limit exceeded. Max {max_requests} requests per {window_seconds} seconds."
         )
-    
-    # Add current request
-    rate_limit_storage[client_ip].append(current_time)
+
+def sweep_rate_limit_storage(window_seconds: int = settings.RATE_LIMIT_WINDOW):
+    """Drop expired timestamps and forget IPs with no requests in the window."""
+    cutoff = time.monotonic() - window_seconds
+    for client_ip in list(rate_limit_storage):
+        requests = rate_limit_storage[client_ip]
+        while requests and requests[0] <= cutoff:
+            requests.popleft()
+        if not requests:
+            del rate_limit_storage[client_ip]
 
 def validate_file_size(file: UploadFile, max_size: int = settings.MAX_FILE_SIZE):
     """Validate uploaded file size."""
@@ -76,9 +147,274 @@ def validate_file_size(file: UploadFile, max_size: int = settings.MAX_FILE_SIZE)
         )
     return file
 
+def _acquire_buffer(request: Request, max_size: int) -> bytearray:
+    """Take a preallocated upload buffer from the pool, or allocate one.
+    
+    Requests larger than ``MAX_FILE_SIZE`` never fit a pooled buffer, so they
+    get a one-off allocation and leave the pool untouched.
+    """
+    pool: Optional[queue.Queue] = getattr(request.app.state, "buffer_pool", None)
+    buffer = None
+    if pool is not None and max_size <= settings.MAX_FILE_SIZE:
+        try:
+            buffer = pool.get_nowait()
+        except queue.Empty:
+            pass
+    if buffer is None or len(buffer) < max_size:
+        buffer = bytearray(max_size)
+    return buffer
+
+def _release_buffer(request: Request, buffer: bytearray):
+    """Return an upload buffer to the pool.
+    
+    Only standard ``MAX_FILE_SIZE`` buffers are kept, and only while the pool
+    has room, so neither oversized one-off buffers nor the extra buffers
+    allocated under load stay resident.
+    """
+    pool: Optional[queue.Queue] = getattr(request.app.state, "buffer_pool", None)
+    if pool is None or len(buffer) != settings.MAX_FILE_SIZE:
+        return
+    try:
+        pool.put_nowait(buffer)
+    except queue.Full:
+        pass
+
+@asynccontextmanager
+async def read_upload(
+    request: Request,
+    file: UploadFile,
+    max_size: int = settings.MAX_FILE_SIZE
+) -> AsyncIterator[memoryview]:
+    """Read an upload into a pooled, preallocated buffer.
+    
+    The upload is copied in chunks so oversized bodies are rejected as soon
+    as they cross ``max_size``. The yielded view is only valid inside the
+    ``async with`` block; the buffer is returned to the pool afterwards.
+    """
+    validate_file_size(file, max_size)
+    
+    buffer = _acquire_buffer(request, max_size)
+    view = memoryview(buffer)
+    length = 0
+    try:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            if length + len(chunk) > max_size:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"File exceeds maximum allowed size {max_size} bytes"
+                )
+            view[length:length + len(chunk)] = chunk
+            length += len(chunk)
+        
+        contents = view[:length]
+        try:
+            yield contents
+        finally:
+            contents.release()
+    finally:
+        view.release()
+        _release_buffer(request, buffer)
+
+class UploadPart(NamedTuple):
+    """One file part of a streamed multipart upload."""
+    filename: Optional[str]
+    content_type: Optional[str]
+    data: memoryview
+    size: int
+
+class _BufferTarget(BaseTarget):
+    """streaming-form-data target that writes every part of a field into one buffer."""
+    
+    def __init__(self, view: memoryview, max_size: int, part_max_size: Optional[int] = None):
+        super().__init__()
+        self.view = view
+        self.max_size = max_size
+        self.part_max_size = part_max_size
+        self.length = 0
+        self.overflow = False
+        self.parts: List[tuple] = []
+        self._start = 0
+        self._size = 0
+    
+    def on_start(self):
+        self._start = self.length
+        self._size = 0
+    
+    def on_data_received(self, chunk: bytes):
+        self._size += len(chunk)
+        if self.part_max_size is not None and self._size > self.part_max_size:
+            # Oversized part: drop what was buffered and only keep counting
+            self.length = self._start
+            return
+        if self.length + len(chunk) > self.max_size:
+            self.overflow = True
+            return
+        self.view[self.length:self.length + len(chunk)] = chunk
+        self.length += len(chunk)
+    
+    def on_finish(self):
+        self.parts.append((self.multipart_filename, self.multipart_content_type, self._start, self.length, self._size))
+
+@asynccontextmanager
+async def stream_upload(
+    request: Request,
+    field: str = "file",
+    max_size: int = settings.MAX_FILE_SIZE,
+    part_max_size: Optional[int] = None
+) -> AsyncIterator[List[UploadPart]]:
+    """Parse a multipart body straight from ``request.stream()`` into a pooled buffer.
+    
+    Unlike ``UploadFile``, nothing is spooled to a temporary file: each
+    chunk is parsed as it arrives and the file bytes land directly in the
+    buffer. ``max_size`` bounds the combined size of all parts of ``field``
+    and is enforced before reading when Content-Length already exceeds it,
+    and otherwise while streaming. Parts larger than ``part_max_size`` are
+    discarded as they stream and come back with empty ``data`` but their
+    true ``size``, so callers can reject them individually. The yielded views
+    are only valid inside the ``async with`` block.
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_size + _MULTIPART_OVERHEAD:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds maximum allowed size {max_size} bytes"
+        )
+    
+    # The body bounds the file bytes, so size the buffer from Content-Length
+    # rather than allocating the full multi-file limit up front
+    capacity = max_size
+    if content_length and content_length.isdigit():
+        capacity = min(max_size, int(content_length))
+    
+    buffer = _acquire_buffer(request, capacity)
+    view = memoryview(buffer)
+    target = _BufferTarget(view, capacity, part_max_size)
+    parser = StreamingFormDataParser(headers=request.headers)
+    parser.register(field, target)
+    
+    parts: List[UploadPart] = []
+    try:
+        async for chunk in request.stream():
+            parser.data_received(chunk)
+            if target.overflow:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"File exceeds maximum allowed size {max_size} bytes"
+                )
+        
+        if not target.parts:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"No file uploaded in field '{field}'"
+            )
+        
+        parts = [
+            UploadPart(filename, content_type, view[start:end], size)
+            for filename, content_type, start, end, size in target.parts
+        ]
+        yield parts
+    finally:
+        for part in parts:
+            part.data.release()
+        view.release()
+        _release_buffer(request, buffer)
+
+class _SniffTarget(BaseTarget):
+    """streaming-form-data target that keeps only the first bytes of a part and counts the rest."""
+    
+    def __init__(self, head_size: int):
+        super().__init__()
+        self.head_size = head_size
+        self.head = bytearray()
+        self.size = 0
+        self.started = False
+        self.finished = False
+    
+    def on_start(self):
+        self.started = True
+    
+    def on_data_received(self, chunk: bytes):
+        if len(self.head) < self.head_size:
+            self.head += chunk[:self.head_size - len(self.head)]
+        self.size += len(chunk)
+    
+    def on_finish(self):
+        self.finished = True
+
+async def sniff_upload(
+    request: Request,
+    field: str = "file",
+    head_size: int = 16,
+    max_size: int = settings.MAX_FILE_SIZE,
+    validate_content_type: Optional[Callable[[Optional[str]], None]] = None
+) -> UploadPart:
+    """Read a single-file multipart body without buffering it.
+    
+    Only the first ``head_size`` bytes of the file are kept (for magic-byte
+    checks); the rest is counted and discarded as it streams. ``max_size``
+    is enforced the same way as in ``stream_upload``. If given,
+    ``validate_content_type`` runs as soon as the part headers are parsed, so
+    a wrong declared type is rejected before the body is read.
+    
+    Returns:
+        UploadPart whose ``data`` holds the leading bytes and ``size`` the full length
+    """
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_size + _MULTIPART_OVERHEAD:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds maximum allowed size {max_size} bytes"
+        )
+    
+    target = _SniffTarget(head_size)
+    parser = StreamingFormDataParser(headers=request.headers)
+    parser.register(field, target)
+    
+    checked = validate_content_type is None
+    async for chunk in request.stream():
+        parser.data_received(chunk)
+        if not checked and target.started:
+            validate_content_type(target.multipart_content_type)
+            checked = True
+        if target.size > max_size:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"File exceeds maximum allowed size {max_size} bytes"
+            )
+        if target.finished:
+            break
+    
+    if not target.started:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"No file uploaded in field '{field}'"
+        )
+    
+    return UploadPart(
+        target.multipart_filename,
+        target.multipart_content_type,
+        memoryview(bytes(target.head)),
+        target.size
+    )
+
+def looks_like_audio(head: bytes) -> bool:
+    """Check the leading bytes of a file against common audio container signatures."""
+    if head.startswith(_AUDIO_MAGIC):
+        return True
+    # MPEG audio frame sync: eleven set bits
+    return len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0
+
+def validate_audio_content_type(content_type: Optional[str]):
+    """Validate the declared content type of an audio upload."""
+    if content_type not in _AUDIO_TYPES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid audio type. Allowed types: {settings.ALLOWED_AUDIO_TYPES}"
+        )
+
 def validate_image_file(file: UploadFile) -> UploadFile:
     """Validate uploaded image file."""
-    if file.content_type not in settings.ALLOWED_IMAGE_TYPES:
+    if file.content_type not in _IMAGE_TYPES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid image type. Allowed types: {settings.ALLOWED_IMAGE_TYPES}"
@@ -87,11 +423,7 @@ def validate_image_file(file: UploadFile) -> UploadFile:
 
 def validate_audio_file(file: UploadFile) -> UploadFile:
     """Validate uploaded audio file."""
-    if file.content_type not in settings.ALLOWED_AUDIO_TYPES:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid audio type. Allowed types: {settings.ALLOWED_AUDIO_TYPES}"
-        )
+    validate_audio_content_type(file.content_type)
     return validate_file_size(file)
 
 def validate_text_length(text: str, max_length: int = settings.MAX_TEXT_LENGTH) -> str:
@@ -103,37 +435,28 @@ def validate_text_length(text: str, max_length: int = settings.MAX_TEXT_LENGTH)
         )
     return text
 
-# Global text summarizer instance
-_text_summarizer: Optional[TextSummarizer] = None
-
-def get_text_summarizer() -> TextSummarizer:
-    """Dependency to get the text summarizer instance."""
-    global _text_summarizer
-    if _text_summarizer is None:
-        _text_summarizer = TextSummarizer()
-    return _text_summarizer
-
-# Global image captioner instance
-_image_captioner: Optional[ImageCaptioner] = None
-
-def get_image_captioner() -> ImageCaptioner:
-    """Dependency to get the image captioner instance."""
-    global _image_captioner
-    if _image_captioner is None:
-        model_loader = get_model_loader()
-        _image_captioner = ImageCaptioner(model_loader=model_loader)
-    return _image_captioner
-
-# Global audio ASR instance
-_audio_asr: Optional[AudioASR] = None
-
-def get_audio_asr() -> AudioASR:
-    """Dependency to get the audio ASR instance."""
-    global _audio_asr
-    if _audio_asr is None:
-        model_loader = get_model_loader()
-        _audio_asr = AudioASR(model_loader=model_loader)
-    return _audio_asr
+@lru_cache(maxsize=1)
+def _iso_second(second: int) -> str:
+    return datetime.fromtimestamp(second, tz=timezone.utc).isoformat()
+
+def utc_timestamp() -> str:
+    """Current UTC time as an ISO 8601 string with second precision.
+    
+    Formatted once per second and reused, since every response carries one.
+    """
+    return _iso_second(time.time_ns() // 1_000_000_000)
+
+def get_text_summarizer(request: Request) -> TextSummarizer:
+    """Dependency to get the text summarizer instance created at startup."""
+    return request.app.state.text_summarizer
+
+def get_image_captioner(request: Request) -> ImageCaptioner:
+    """Dependency to get the image captioner instance created at startup."""
+    return request.app.state.image_captioner
+
+def get_audio_asr(request: Request) -> AudioASR:
+    """Dependency to get the audio ASR instance created at startup."""
+    return request.app.state.audio_asr
 
 def validate_text_input(text: str) -> str:
     """Validate text input for processing."""
@@ -144,14 +467,9 @@ def validate_text_input(text: str) -> str:
         )
     return validate_text_length(text.strip())
 
-def check_rate_limit():
+async def check_rate_limit(request: Request):
     """Check rate limit for requests."""
-    # For now, just pass - implement actual rate limiting as needed
-    pass
-
-def get_settings() -> Any:
-    """Get application settings."""
-    return settings
+    await rate_limit_dependency(request)
 
 class CommonDependencies:
     """Class to group common dependencies for easier injection."""
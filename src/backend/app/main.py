@@ -6,14 +6,22 @@ middleware configuration, and startup/shutdown event handlers.
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import uvicorn
+import asyncio
 import logging
+import queue
+import torch
+import redis.asyncio as aioredis
 from contextlib import asynccontextmanager
 
 from .config import settings
 from .routes import text_router, image_router, audio_router, health_router
 from .models.utils import ModelLoader
+from .models.text_summarizer import TextSummarizer
+from .models.image_captioning import ImageCaptioner
+from .models.audio_asr import AudioASR
+from .dependencies import RATE_LIMIT_SCRIPT, sweep_rate_limit_storage
 
 # Configure logging
 logging.basicConfig(
@@ -25,6 +33,12 @@ logger = logging.getLogger(__name__)
 # Global model loader instance
 model_loader = None
 
+async def _sweep_rate_limits_periodically():
+    """Bound in-process rate-limit memory against IP churn."""
+    while True:
+        await asyncio.sleep(settings.RATE_LIMIT_WINDOW)
+        sweep_rate_limit_storage()
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup and shutdown events."""
@@ -32,18 +46,59 @@ async def lifespan(app: FastAPI):
     
     # Startup
     logger.info("Starting EnnovateX AI Platform Backend...")
+    
+    # Input shapes are fixed (e.g. Whisper's 80x3000 mel window), so let cuDNN
+    # autotune once, and allow TF32 matmuls on GPUs that support them
+    torch.backends.cudnn.benchmark = True
+    torch.set_float32_matmul_precision("high")
+    
     try:
         model_loader = ModelLoader()
         await model_loader.initialize_models()
+        
+        # Model wrappers are singletons shared by all requests
+        app.state.text_summarizer = TextSummarizer(model_loader=model_loader)
+        await app.state.text_summarizer.warmup()
+        app.state.image_captioner = ImageCaptioner(model_loader=model_loader)
+        await app.state.image_captioner.warmup()
+        app.state.audio_asr = AudioASR(model_loader=model_loader)
         logger.info("All models loaded successfully")
     except Exception as e:
         logger.error(f"Failed to load models: {e}")
         raise
     
+    # Preallocated upload buffers reused across requests
+    app.state.buffer_pool = queue.Queue(maxsize=settings.UPLOAD_BUFFER_POOL_SIZE)
+    for _ in range(settings.UPLOAD_BUFFER_POOL_SIZE):
+        app.state.buffer_pool.put_nowait(bytearray(settings.MAX_FILE_SIZE))
+    
+    # Shared rate-limit state (falls back to in-process storage without Redis)
+    app.state.redis = None
+    app.state.rate_limit_sha = None
+    if settings.REDIS_URL:
+        try:
+            redis_client = aioredis.from_url(settings.REDIS_URL)
+            app.state.rate_limit_sha = await redis_client.script_load(RATE_LIMIT_SCRIPT)
+            app.state.redis = redis_client
+            logger.info("Redis rate limiter initialized")
+        except Exception as e:
+            logger.warning(f"Redis unavailable, using in-process rate limiting: {e}")
+    
+    sweep_task = None
+    if app.state.redis is None:
+        sweep_task = asyncio.create_task(_sweep_rate_limits_periodically())
+    
     yield
     
     # Shutdown
     logger.info("Shutting down EnnovateX AI Platform Backend...")
+    if sweep_task is not None:
+        sweep_task.cancel()
+    await app.state.text_summarizer.batcher.stop()
+    await app.state.image_captioner.stop()
+    await app.state.audio_asr.batcher.stop()
+    if app.state.redis is not None:
+        await app.state.redis.aclose()
     if model_loader:
         await model_loader.cleanup()
     logger.info("Shutdown complete")
@@ -55,6 +110,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -71,7 +127,7 @@ app.add_middleware(
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     logger.error(f"Global exception: {exc}")
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"detail": "Internal server error", "error": str(exc)}
     )
@@ -5,19 +5,62 @@ with support for multiple languages and audio formats.
 """
 
 import torch
+import asyncio
+import functools
 import logging
+import re
+import threading
 from typing import List, Dict, Any, Optional, Union
-import librosa
 import numpy as np
+import soundfile as sf
+import soxr
 import io
-import base64
+import pybase64
 from transformers import WhisperForConditionalGeneration, WhisperProcessor
 
 from ..config import settings
-from .utils import get_device, clear_memory
+from .batcher import DynamicBatcher
+from .utils import get_device, get_autocast_context, clear_memory, batch_buckets
 
 logger = logging.getLogger(__name__)
 
+# Whitespace-delimited words, compiled once for the untimed long-audio path
+_WORD_RE = re.compile(r'\S+')
+
+class _BufferReader(io.RawIOBase):
+    """Seekable read-only file over a bytes-like object, without copying it.
+    
+    ``io.BytesIO`` copies any buffer that is not ``bytes`` up front, which for
+    a pooled upload view is a full-file memcpy before decoding even starts.
+    """
+    
+    def __init__(self, data: Union[bytes, bytearray, memoryview]):
+        self._view = memoryview(data).cast('B')
+        self._pos = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        chunk = self._view[self._pos:self._pos + len(buffer)]
+        buffer[:len(chunk)] = chunk
+        self._pos += len(chunk)
+        return len(chunk)
+    
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += len(self._view)
+        self._pos = max(0, offset)
+        return self._pos
+    
+    def tell(self) -> int:
+        return self._pos
+
 class AudioASR:
     """Whisper-based automatic speech recognition."""
     
@@ -25,6 +68,27 @@ class AudioASR:
         self.model_loader = model_loader
         self.device = get_device()
         self.sample_rate = 16000  # Whisper expects 16kHz audio
+        self.batch_size = settings.MAX_INFERENCE_BATCH_SIZE  # Maximum clips per generate call
+        self.n_fft = 400
+        self.hop_length = 160
+        self.n_samples = 30 * self.sample_rate  # Whisper's fixed 30s input window
+        self.batch_buckets = batch_buckets(settings.MAX_INFERENCE_BATCH_SIZE)
+        self._model_info: Optional[Dict[str, Any]] = None
+        self.batcher = DynamicBatcher(self._transcribe_batch, name="audio_asr")
+        if model_loader:
+            model_loader.add_reload_callback(self._clear_model_info)
+        self._mel_filters: Optional[torch.Tensor] = None
+        self._stft_window: Optional[torch.Tensor] = None
+        
+        # Pinned staging buffer for waveform -> GPU copies, reused across calls
+        self._pinned: Optional[torch.Tensor] = None
+        self._pinned_event = None
+        self._pinned_lock = threading.Lock()
+        if self.device == "cuda":
+            self._pinned = torch.empty(
+                self.batch_size, self.n_samples, dtype=torch.float32, pin_memory=True
+            )
+            self._pinned_event = torch.cuda.Event()
         
     def _get_model_and_processor(self):
         """Get model and processor from model loader."""
@@ -39,36 +103,121 @@ class AudioASR:
         
         return model, processor
     
-    def _process_audio_input(self, audio_input: Union[bytes, str, np.ndarray]) -> np.ndarray:
+    def _log_mel(self, audios: List[np.ndarray], processor) -> torch.Tensor:
+        """Compute Whisper log-mel input features on the model device.
+        
+        Equivalent to ``processor(audios, return_tensors="pt").input_features``
+        but runs the STFT as a single batched torch kernel with a mel
+        filterbank that is cached after the first call.
+        
+        Args:
+            audios: List of mono 16kHz float32 arrays
+            processor: Whisper processor providing the mel filterbank
+            
+        Returns:
+            Tensor of shape [B, n_mels, 3000]
+        """
+        if self._mel_filters is None:
+            self._mel_filters = torch.from_numpy(
+                processor.feature_extractor.mel_filters.T
+            ).to(self.device, dtype=torch.float32)
+            self._stft_window = torch.hann_window(self.n_fft, device=self.device)
+        
+        waveform = self._stage_waveforms(audios)
+        
+        stft = torch.stft(
+            waveform,
+            self.n_fft,
+            self.hop_length,
+            window=self._stft_window,
+            return_complex=True
+        )
+        magnitudes = stft[..., :-1].abs() ** 2
+        mel_spec = self._mel_filters @ magnitudes
+        
+        log_spec = torch.clamp(mel_spec, min=1e-10).log10()
+        log_spec = torch.maximum(log_spec, log_spec.amax(dim=(-2, -1), keepdim=True) - 8.0)
+        return (log_spec + 4.0) / 4.0
+    
+    def _stage_waveforms(self, audios: List[np.ndarray]) -> torch.Tensor:
+        """Pad or truncate clips to the 30s window and move them to the model device.
+        
+        On CUDA the clips are written into a pinned host buffer and copied
+        with ``non_blocking=True``; a CUDA event keeps the next call from
+        overwriting the buffer before that copy has finished.
+        
+        Args:
+            audios: List of mono 16kHz float32 arrays
+            
+        Returns:
+            Tensor of shape [B, n_samples] on the model device
+        """
+        if self._pinned is None or len(audios) > self._pinned.shape[0]:
+            batch = np.zeros((len(audios), self.n_samples), dtype=np.float32)
+            for i, audio in enumerate(audios):
+                length = min(len(audio), self.n_samples)
+                batch[i, :length] = audio[:length]
+            return torch.from_numpy(batch).to(self.device)
+        
+        with self._pinned_lock:
+            self._pinned_event.synchronize()
+            staging = self._pinned[:len(audios)]
+            staging.zero_()
+            for i, audio in enumerate(audios):
+                length = min(len(audio), self.n_samples)
+                staging[i, :length] = torch.from_numpy(audio[:length])
+            waveform = staging.to(self.device, non_blocking=True)
+            self._pinned_event.record()
+        return waveform
+    
+    async def _process_audio_input(self, audio_input: Union[bytes, str, np.ndarray]) -> np.ndarray:
+        """Decode audio input in a worker thread so the event loop stays free."""
+        if isinstance(audio_input, np.ndarray):
+            return self._process_audio_input_sync(audio_input)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._process_audio_input_sync, audio_input)
+    
+    def _process_audio_input_sync(self, audio_input: Union[bytes, str, np.ndarray]) -> np.ndarray:
         """Process various audio input formats into numpy array.
         
         Args:
-            audio_input: Audio bytes, base64 string, or numpy array
+            audio_input: Audio bytes (or a bytes-like view), base64 string, or numpy array
             
         Returns:
             Numpy array of audio samples
         """
         if isinstance(audio_input, np.ndarray):
             audio = audio_input
-        elif isinstance(audio_input, bytes):
-            # Load audio from bytes
-            audio, sr = librosa.load(io.BytesIO(audio_input), sr=self.sample_rate)
+            if audio.ndim > 1:
+                # Convert (channels, samples) to mono
+                audio = audio.mean(axis=0)
+        elif isinstance(audio_input, (bytes, bytearray, memoryview)):
+            audio = self._decode_audio_bytes(audio_input)
         elif isinstance(audio_input, str):
             # Assume base64 encoded audio
             try:
-                audio_data = base64.b64decode(audio_input)
-                audio, sr = librosa.load(io.BytesIO(audio_data), sr=self.sample_rate)
+                audio_data = pybase64.b64decode(audio_input, validate=False)
+                audio = self._decode_audio_bytes(audio_data)
             except Exception as e:
                 raise ValueError(f"Invalid base64 audio data: {e}")
         else:
             raise ValueError(f"Unsupported audio input type: {type(audio_input)}")
         
-        # Ensure correct sample rate
-        if hasattr(audio, 'shape') and len(audio.shape) > 1:
-            # Convert stereo to mono if needed
-            audio = librosa.to_mono(audio)
+        return audio.astype(np.float32, copy=False)
+    
+    def _decode_audio_bytes(self, audio_bytes: Union[bytes, bytearray, memoryview]) -> np.ndarray:
+        """Decode encoded audio bytes into mono float32 samples at the model rate."""
+        audio, sr = sf.read(_BufferReader(audio_bytes), dtype='float32', always_2d=False)
+        
+        if audio.ndim == 2:
+            # Convert (samples, channels) to mono
+            audio = audio.mean(axis=1, dtype=np.float32)
         
-        return audio.astype(np.float32)
+        # Only resample when the source rate differs from Whisper's 16kHz
+        if sr != self.sample_rate:
+            audio = soxr.resample(audio, sr, self.sample_rate)
+        
+        return audio
     
     async def transcribe(
         self,
@@ -77,7 +226,8 @@ class AudioASR:
         task: str = "transcribe",
         return_timestamps: bool = False,
         chunk_length_s: Optional[float] = None,
-        stride_length_s: Optional[float] = None
+        stride_length_s: Optional[float] = None,
+        temperature: float = 0.0
     ) -> Dict[str, Any]:
         """Transcribe audio to text using Whisper model.
         
@@ -88,68 +238,34 @@ class AudioASR:
             return_timestamps: Whether to return word-level timestamps
             chunk_length_s: Length of audio chunks in seconds for long audio
             stride_length_s: Stride length for overlapping chunks
+            temperature: Sampling temperature; 0.0 decodes greedily
             
         Returns:
             Dictionary containing transcription and metadata
         """
         try:
-            model, processor = self._get_model_and_processor()
-            
             # Process audio
-            audio = self._process_audio_input(audio_input)
+            audio = await self._process_audio_input(audio_input)
             
             # Handle long audio by chunking if specified
             if chunk_length_s and len(audio) > chunk_length_s * self.sample_rate:
                 return await self._transcribe_long_audio(
-                    audio, language, task, return_timestamps, chunk_length_s, stride_length_s
-                )
-            
-            # Prepare inputs
-            inputs = processor(
-                audio,
-                sampling_rate=self.sample_rate,
-                return_tensors="pt"
-            ).to(self.device)
-            
-            # Set generation parameters
-            generate_kwargs = {
-                "task": task,
-                "return_timestamps": return_timestamps
-            }
-            
-            if language:
-                generate_kwargs["language"] = language
-            
-            # Generate transcription
-            with torch.no_grad():
-                predicted_ids = model.generate(
-                    inputs["input_features"],
-                    **generate_kwargs
+                    audio, language, task, return_timestamps, chunk_length_s, stride_length_s,
+                    temperature
                 )
             
-            # Decode transcription
-            transcription = processor.batch_decode(
-                predicted_ids,
-                skip_special_tokens=True,
-                clean_up_tokenization_spaces=True
-            )[0]
+            # Queue for a shared generate call with other in-flight requests
+            output = await self.batcher.submit(
+                audio, key=(language, task, return_timestamps, temperature)
+            )
+            transcription = output["text"]
             
             # Calculate audio metadata
             duration = len(audio) / self.sample_rate
             
-            # Detect language if not specified
-            detected_language = language
-            if not language:
-                # Use Whisper's language detection
-                try:
-                    with torch.no_grad():
-                        # Get language probabilities from the model
-                        logits = model.detect_language(inputs["input_features"])
-                        detected_language_id = torch.argmax(logits, dim=-1).item()
-                        detected_language = processor.tokenizer.convert_ids_to_tokens([detected_language_id])[0]
-                        detected_language = detected_language.replace('<|', '').replace('|>', '')
-                except:
-                    detected_language = "unknown"
+            # Whisper emits the language token right after start-of-transcript,
+            # so no second pass is needed when the language was not specified
+            detected_language = language or output["language"]
             
             result = {
                 "transcription": transcription,
@@ -163,25 +279,14 @@ class AudioASR:
                 "parameters": {
                     "language": language,
                     "task": task,
-                    "return_timestamps": return_timestamps
+                    "return_timestamps": return_timestamps,
+                    "temperature": temperature
                 }
             }
             
             # Add timestamps if requested
             if return_timestamps:
-                # Note: This is a simplified implementation
-                # For full timestamp support, you'd need to use the Whisper timestamp features
-                words = transcription.split()
-                word_duration = duration / len(words) if words else 0
-                timestamps = [
-                    {
-                        "word": word,
-                        "start": round(i * word_duration, 2),
-                        "end": round((i + 1) * word_duration, 2)
-                    }
-                    for i, word in enumerate(words)
-                ]
-                result["timestamps"] = timestamps
+                result["timestamps"] = output["timestamps"]
             
             logger.info(f"Audio transcribed: {duration:.2f}s -> '{transcription[:50]}...'")
             return result
@@ -197,63 +302,102 @@ class AudioASR:
         task: str,
         return_timestamps: bool,
         chunk_length_s: float,
-        stride_length_s: Optional[float]
+        stride_length_s: Optional[float],
+        temperature: float = 0.0
     ) -> Dict[str, Any]:
-        """Transcribe long audio by processing in chunks."""
+        """Transcribe long audio by processing overlapping chunks in batches."""
         chunk_length = int(chunk_length_s * self.sample_rate)
         stride_length = int((stride_length_s or chunk_length_s / 4) * self.sample_rate)
+        hop = chunk_length - stride_length
+        if hop <= 0:
+            raise ValueError("stride_length_s must be smaller than chunk_length_s")
         
+        # Zero-copy [n_chunks, chunk_length] view over every full-length chunk,
+        # plus a tail view when the last full chunk stops short of the end
         chunks = []
-        transcriptions = []
+        if len(audio) >= chunk_length:
+            chunks = list(np.lib.stride_tricks.sliding_window_view(audio, chunk_length)[::hop])
+        tail_start = len(chunks) * hop
+        if not chunks or tail_start - hop + chunk_length < len(audio):
+            chunks.append(audio[tail_start:])
+        starts = (np.arange(len(chunks)) * hop).tolist()
         
-        # Split audio into chunks
-        for start in range(0, len(audio), chunk_length - stride_length):
-            end = min(start + chunk_length, len(audio))
-            chunk = audio[start:end]
-            chunks.append((start / self.sample_rate, end / self.sample_rate, chunk))
+        generate_kwargs = {"task": task}
+        if language:
+            generate_kwargs["language"] = language
+        if temperature > 0:
+            generate_kwargs.update(do_sample=True, temperature=temperature)
         
-        # Transcribe each chunk
-        for start_time, end_time, chunk in chunks:
+        # Transcribe all chunks with batched generate calls in a worker thread
+        loop = asyncio.get_running_loop()
+        outputs: List[Optional[Dict[str, Any]]] = []
+        for i in range(0, len(chunks), self.batch_size):
+            group = chunks[i:i + self.batch_size]
             try:
-                result = await self.transcribe(
-                    chunk,
-                    language=language,
-                    task=task,
-                    return_timestamps=return_timestamps
-                )
-                
-                chunk_transcription = {
-                    "text": result["transcription"],
-                    "start_time": start_time,
-                    "end_time": end_time,
-                    "duration": end_time - start_time
-                }
-                
-                if return_timestamps and "timestamps" in result:
-                    # Adjust timestamps to global time
-                    adjusted_timestamps = [
-                        {
-                            "word": ts["word"],
-                            "start": ts["start"] + start_time,
-                            "end": ts["end"] + start_time
-                        }
-                        for ts in result["timestamps"]
-                    ]
-                    chunk_transcription["timestamps"] = adjusted_timestamps
-                
-                transcriptions.append(chunk_transcription)
-                
+                outputs.extend(await loop.run_in_executor(None, functools.partial(
+                    self._batched_generate,
+                    group,
+                    return_timestamps=return_timestamps,
+                    **generate_kwargs
+                )))
             except Exception as e:
-                logger.error(f"Error transcribing chunk {start_time}-{end_time}: {e}")
+                logger.error(f"Error transcribing chunks {i}-{i + len(group) - 1}: {e}")
+                outputs.extend([None] * len(group))
+        
+        # Drop the words spoken in the half-stride overlap shared with each neighbour
+        half_stride = stride_length / 2
+        transcriptions = []
+        for i, (start, chunk, output) in enumerate(zip(starts, chunks, outputs)):
+            if output is None:
                 continue
+            length = len(chunk)
+            end = start + length
+            trim_start = half_stride if i > 0 else 0
+            trim_end = half_stride if i < len(chunks) - 1 else 0
+            start_time = (start + trim_start) / self.sample_rate
+            end_time = (end - trim_end) / self.sample_rate
+            
+            chunk_transcription = {
+                "start_time": start_time,
+                "end_time": end_time,
+                "duration": end_time - start_time
+            }
+            
+            if return_timestamps:
+                # Keep words that start inside the untrimmed span, shifted to global time
+                offset = start / self.sample_rate
+                kept = [
+                    {
+                        "word": ts["word"],
+                        "start": round(ts["start"] + offset, 2),
+                        "end": round(ts["end"] + offset, 2)
+                    }
+                    for ts in output["timestamps"]
+                    if start_time <= ts["start"] + offset < end_time
+                ]
+                chunk_transcription["text"] = " ".join(ts["word"] for ts in kept)
+                chunk_transcription["timestamps"] = kept
+            else:
+                # Without alignment, trim a word-proportional share of the overlap
+                words = _WORD_RE.findall(output["text"])
+                first = round(len(words) * trim_start / length)
+                last = len(words) - round(len(words) * trim_end / length)
+                chunk_transcription["text"] = " ".join(words[first:max(first, last)])
+            
+            transcriptions.append(chunk_transcription)
         
         # Combine transcriptions
         full_transcription = " ".join([t["text"] for t in transcriptions])
         total_duration = len(audio) / self.sample_rate
         
+        # Report the language Whisper detected on the first transcribed chunk
+        detected_language = language or next(
+            (output["language"] for output in outputs if output is not None), "auto"
+        )
+        
         result = {
             "transcription": full_transcription,
-            "language": language or "auto",
+            "language": detected_language,
             "task": task,
             "duration": round(total_duration, 2),
             "sample_rate": self.sample_rate,
@@ -280,34 +424,218 @@ class AudioASR:
         
         return result
     
+    def _generate(
+        self,
+        model,
+        input_features: torch.Tensor,
+        return_timestamps: bool = False,
+        **generate_kwargs
+    ):
+        """Run Whisper generate, optionally with per-token timestamps.
+        
+        Returns:
+            Tuple of (predicted_ids, token_timestamps or None)
+        """
+        with torch.inference_mode(), get_autocast_context(self.device):
+            if return_timestamps:
+                outputs = model.generate(
+                    input_features,
+                    return_timestamps=True,
+                    return_token_timestamps=True,
+                    **generate_kwargs
+                )
+                return outputs["sequences"], outputs["token_timestamps"]
+            
+            return model.generate(input_features, **generate_kwargs), None
+    
+    def _word_timestamps(
+        self,
+        processor,
+        token_ids: torch.Tensor,
+        token_times: torch.Tensor
+    ) -> List[Dict[str, Any]]:
+        """Group Whisper's aligned token timestamps into words.
+        
+        Args:
+            processor: Whisper processor used for decoding
+            token_ids: Generated token ids for one clip
+            token_times: Timestamp (seconds) of each generated token
+            
+        Returns:
+            List of ``{"word", "start", "end"}`` dictionaries
+        """
+        tokenizer = processor.tokenizer
+        ids = token_ids.tolist()
+        times = token_times.tolist()
+        
+        words = []
+        for i, token_id in enumerate(ids):
+            # Special, language, task and timestamp tokens all sit above EOS
+            if token_id >= tokenizer.eos_token_id:
+                continue
+            text = tokenizer.decode([token_id])
+            end = times[i + 1] if i + 1 < len(times) else times[i]
+            if text.startswith(" ") or not words:
+                words.append({"word": text.strip(), "start": round(times[i], 2), "end": round(end, 2)})
+            else:
+                words[-1]["word"] += text
+                words[-1]["end"] = round(end, 2)
+        
+        return [word for word in words if word["word"]]
+    
+    def _batched_generate(
+        self,
+        audios: List[np.ndarray],
+        return_timestamps: bool = False,
+        **generate_kwargs
+    ) -> List[Dict[str, Any]]:
+        """Transcribe several decoded clips with a single Whisper generate call.
+        
+        Args:
+            audios: List of mono 16kHz float32 arrays
+            return_timestamps: Whether to return aligned word timestamps
+            **generate_kwargs: Arguments forwarded to ``model.generate``
+            
+        Returns:
+            List of ``{"text", "language", "timestamps"}`` dictionaries in input order
+        """
+        model, processor = self._get_model_and_processor()
+        
+        # A CUDA-graph encoder is captured per batch size, so pad with silent
+        # clips up to the next warmed-up bucket instead of capturing a new shape
+        count = len(audios)
+        if self.model_loader and self.model_loader.compile_modes.get("audio_asr") == "reduce-overhead":
+            padded = next((size for size in self.batch_buckets if size >= count), count)
+            audios = list(audios) + [np.zeros(self.hop_length, dtype=np.float32)] * (padded - count)
+        
+        input_features = self._log_mel(audios, processor)
+        predicted_ids, token_timestamps = self._generate(
+            model, input_features, return_timestamps, **generate_kwargs
+        )
+        predicted_ids = predicted_ids[:count]
+        
+        texts = processor.batch_decode(
+            predicted_ids,
+            skip_special_tokens=True,
+            clean_up_tokenization_spaces=True
+        )
+        
+        # The language token follows start-of-transcript in every sequence
+        language_tokens = processor.tokenizer.convert_ids_to_tokens(predicted_ids[:, 1].tolist())
+        
+        outputs = []
+        for i, text in enumerate(texts):
+            output = {"text": text.strip(), "language": language_tokens[i].strip('<|>')}
+            if return_timestamps:
+                output["timestamps"] = self._word_timestamps(
+                    processor, predicted_ids[i], token_timestamps[i]
+                )
+            outputs.append(output)
+        return outputs
+    
+    def _transcribe_batch(self, key: tuple, audios: List[np.ndarray]) -> List[Dict[str, Any]]:
+        """Batcher callback: transcribe queued clips that share generation parameters.
+        
+        Args:
+            key: ``(language, task, return_timestamps, temperature)`` shared by the batch
+            audios: Decoded clips from concurrent ``transcribe`` calls
+            
+        Returns:
+            One ``_batched_generate`` output per clip
+        """
+        language, task, return_timestamps, temperature = key
+        generate_kwargs = {"task": task}
+        if language:
+            generate_kwargs["language"] = language
+        if temperature > 0:
+            generate_kwargs.update(do_sample=True, temperature=temperature)
+        return self._batched_generate(audios, return_timestamps=return_timestamps, **generate_kwargs)
+    
     async def batch_transcribe(
         self,
         audio_inputs: List[Union[bytes, str, np.ndarray]],
-        **kwargs
+        language: Optional[str] = None,
+        task: str = "transcribe",
+        return_timestamps: bool = False,
+        batch_size: Optional[int] = None,
+        temperature: float = 0.0
     ) -> List[Dict[str, Any]]:
         """Transcribe multiple audio files in batch.
         
+        Inputs are decoded concurrently and then transcribed together in
+        groups of ``batch_size`` per model forward pass.
+        
         Args:
             audio_inputs: List of input audio files
-            **kwargs: Additional arguments for transcription
+            language: Language code or None for auto-detection
+            task: 'transcribe' or 'translate'
+            return_timestamps: Whether to return word-level timestamps
+            batch_size: Maximum number of clips per generate call (defaults to ``self.batch_size``)
+            temperature: Sampling temperature; 0.0 decodes greedily
             
         Returns:
             List of transcription results
         """
-        results = []
+        results: List[Optional[Dict[str, Any]]] = [None] * len(audio_inputs)
+        
+        decoded = await asyncio.gather(
+            *(self._process_audio_input(audio) for audio in audio_inputs),
+            return_exceptions=True
+        )
+        
+        valid = []
+        for i, audio in enumerate(decoded):
+            if isinstance(audio, Exception):
+                logger.error(f"Error decoding audio {i}: {audio}")
+                results[i] = {"error": str(audio), "batch_index": i, "transcription": None}
+            else:
+                valid.append((i, audio))
         
-        for i, audio in enumerate(audio_inputs):
+        generate_kwargs = {"task": task}
+        if language:
+            generate_kwargs["language"] = language
+        if temperature > 0:
+            generate_kwargs.update(do_sample=True, temperature=temperature)
+        
+        # Generate in a worker thread so the event loop keeps serving requests
+        loop = asyncio.get_running_loop()
+        batch_size = batch_size or self.batch_size
+        for start in range(0, len(valid), batch_size):
+            bucket = valid[start:start + batch_size]
             try:
-                result = await self.transcribe(audio, **kwargs)
-                result["batch_index"] = i
-                results.append(result)
+                outputs = await loop.run_in_executor(None, functools.partial(
+                    self._batched_generate,
+                    [audio for _, audio in bucket],
+                    return_timestamps=return_timestamps,
+                    **generate_kwargs
+                ))
             except Exception as e:
-                logger.error(f"Error transcribing audio {i}: {e}")
-                results.append({
-                    "error": str(e),
+                logger.error(f"Error transcribing batch starting at {bucket[0][0]}: {e}")
+                for i, _ in bucket:
+                    results[i] = {"error": str(e), "batch_index": i, "transcription": None}
+                continue
+            
+            for (i, audio), output in zip(bucket, outputs):
+                duration = len(audio) / self.sample_rate
+                result = {
+                    "transcription": output["text"],
+                    "language": language or output["language"],
+                    "task": task,
+                    "duration": round(duration, 2),
+                    "sample_rate": self.sample_rate,
+                    "audio_length": len(audio),
+                    "model_used": "audio_asr",
+                    "confidence": 1.0,
                     "batch_index": i,
-                    "transcription": None
-                })
+                    "parameters": {
+                        "language": language,
+                        "task": task,
+                        "return_timestamps": return_timestamps
+                    }
+                }
+                if return_timestamps:
+                    result["timestamps"] = output["timestamps"]
+                results[i] = result
         
         return results
     
@@ -327,7 +655,7 @@ class AudioASR:
             model, processor = self._get_model_and_processor()
             
             # Process audio
-            audio = self._process_audio_input(audio_input)
+            audio = await self._process_audio_input(audio_input)
             
             # Take only first 30 seconds for language detection
             max_samples = 30 * self.sample_rate
@@ -335,15 +663,11 @@ class AudioASR:
                 audio = audio[:max_samples]
             
             # Prepare inputs
-            inputs = processor(
-                audio,
-                sampling_rate=self.sample_rate,
-                return_tensors="pt"
-            ).to(self.device)
+            input_features = self._log_mel([audio], processor)
             
             # Detect language
-            with torch.no_grad():
-                logits = model.detect_language(inputs["input_features"])
+            with torch.inference_mode(), get_autocast_context(self.device):
+                logits = model.detect_language(input_features)
                 language_probs = torch.softmax(logits, dim=-1)
                 
                 # Get top 5 languages
@@ -370,15 +694,28 @@ class AudioASR:
             logger.error(f"Error in language detection: {e}")
             raise
     
+    def _clear_model_info(self):
+        """Forget the cached model info after the loader drops its models."""
+        self._model_info = None
+    
     def get_model_info(self) -> Dict[str, Any]:
-        """Get information about the loaded model."""
+        """Get information about the loaded model.
+        
+        The result is static for a loaded model, so it is built once and
+        shared; callers must not mutate it.
+        """
+        if self._model_info is not None:
+            return self._model_info
+        
         try:
             model, processor = self._get_model_and_processor()
             
-            return {
+            self._model_info = {
                 "model_type": "audio_asr",
                 "base_model": settings.AUDIO_ASR_MODEL,
                 "device": self.device,
+                "compute_type": self.model_loader.compute_types.get("audio_asr"),
+                "compile_mode": self.model_loader.compile_modes.get("audio_asr", "eager"),
                 "sample_rate": self.sample_rate,
                 "supported_formats": ["WAV", "MP3", "FLAC", "OGG"],
                 "supported_tasks": ["transcribe", "translate"],
@@ -392,6 +729,7 @@ class AudioASR:
                 "max_audio_length": "unlimited (chunked processing)",
                 "languages_supported": "99+ languages"
             }
+            return self._model_info
             
         except Exception as e:
             logger.error(f"Error getting model info: {e}")
@@ -0,0 +1,128 @@
+"""Dynamic Request Batching
+
+This module contains the DynamicBatcher class, which collects concurrent
+single-item inference requests into batches so a model runs one batched
+generate call instead of many sequential ones.
+"""
+
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+class DynamicBatcher:
+    """Micro-batching request queue for a single model.
+    
+    Requests are grouped by a hashable key (typically the generation
+    parameters), since only requests with identical parameters can share a
+    generate call. The worker waits up to ``max_wait_ms`` after the first
+    pending request for more to arrive, then runs ``process_batch`` once per
+    key on a single worker thread and resolves each request's future. Keeping
+    every call for a model on one thread avoids contending for the device
+    across the shared default executor. Batchers serving the same model
+    should be given one shared ``executor`` so their calls are serialized
+    too; otherwise each creates its own and shuts it down on ``stop``.
+    """
+    
+    def __init__(
+        self,
+        process_batch: Callable[[Hashable, List[Any]], List[Any]],
+        name: str,
+        max_batch_size: int = settings.MAX_INFERENCE_BATCH_SIZE,
+        max_wait_ms: int = settings.MAX_BATCH_WAIT_MS,
+        executor: Optional[ThreadPoolExecutor] = None
+    ):
+        self.process_batch = process_batch
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._pending: List[Tuple[Hashable, Any, asyncio.Future]] = []
+        self._executor = executor
+        self._owns_executor = executor is None
+    
+    async def submit(self, item: Any, key: Hashable = None) -> Any:
+        """Queue one item and wait for its result.
+        
+        Args:
+            item: Model input for a single request
+            key: Requests are only batched with others sharing this key
+            
+        Returns:
+            The result ``process_batch`` produced for this item
+        """
+        if self._worker is None or self._worker.done():
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self.name)
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((key, item, future))
+        return await future
+    
+    async def stop(self):
+        """Cancel the worker task, fail every request still waiting on it and release its thread."""
+        if self._worker is not None:
+            self._worker.cancel()
+            self._worker = None
+        
+        waiting, self._pending = self._pending, []
+        while self._queue is not None and not self._queue.empty():
+            waiting.append(self._queue.get_nowait())
+        for _, _, future in waiting:
+            if not future.done():
+                future.set_exception(RuntimeError(f"{self.name} batcher stopped"))
+        
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    async def _collect(self) -> List[Tuple[Hashable, Any, asyncio.Future]]:
+        """Wait for one request, then gather more until the batch is full or the wait expires."""
+        # Kept on the instance so stop() can fail requests the worker already took
+        self._pending = pending = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.max_wait
+        
+        while len(pending) < self.max_batch_size:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        
+        return pending
+    
+    async def _run(self):
+        """Worker loop: collect, group by key, run each group once."""
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            pending = await self._collect()
+            
+            groups: Dict[Hashable, List[Tuple[Any, asyncio.Future]]] = {}
+            for key, item, future in pending:
+                groups.setdefault(key, []).append((item, future))
+            
+            for key, group in groups.items():
+                items = [item for item, _ in group]
+                try:
+                    results = await loop.run_in_executor(self._executor, self.process_batch, key, items)
+                except Exception as e:
+                    logger.error(f"Error in {self.name} batch of {len(items)}: {e}")
+                    for _, future in group:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                
+                for (_, future), result in zip(group, results):
+                    if not future.done():
+                        future.set_result(result)
@@ -5,18 +5,104 @@ with optional LoRA adapter support for fine-tuned image understanding.
 """
 
 import torch
+import asyncio
+import contextlib
+import functools
 import logging
-from typing import List, Dict, Any, Optional, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, BinaryIO, List, Dict, Any, Optional, Tuple, Union
 from PIL import Image
+import numpy as np
 import io
-import base64
+import pybase64
 from transformers import BlipForConditionalGeneration, BlipProcessor
 
 from ..config import settings
-from .utils import get_device, clear_memory
+from .utils import get_device, get_autocast_context, clear_memory, batch_buckets, run_with_retry
+from .batcher import DynamicBatcher
 
 logger = logging.getLogger(__name__)
 
+# libjpeg-turbo SIMD decoder, falls back to PIL when the library is missing
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    _tj = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _tj = None
+    logger.warning("libjpeg-turbo not available, decoding JPEGs with PIL")
+
+_JPEG_MAGIC = b'\xff\xd8\xff'
+
+def _to_rgb(image: Image.Image) -> Image.Image:
+    """Convert to RGB only when needed; convert() always copies the pixels."""
+    return image if image.mode == 'RGB' else image.convert('RGB')
+
+def decode_image(image_bytes: Union[bytes, BinaryIO], target_size: int = settings.IMAGE_INPUT_SIZE) -> Image.Image:
+    """Decode encoded image bytes into an RGB PIL Image sized for the model.
+    
+    JPEGs are scaled down by 1/2, 1/4 or 1/8 inside the IDCT (libjpeg-turbo
+    when available, else ``Image.draft``) while both sides stay at least
+    ``target_size``, so the captioner's own resize sees the same content at a
+    fraction of the decode cost. The source dimensions are kept in
+    ``image.info["original_size"]``.
+    
+    Args:
+        image_bytes: Encoded image, or a seekable binary file positioned at its start
+        target_size: Smallest side length the decoded image may be reduced to
+        
+    Returns:
+        Decoded RGB image
+    """
+    if not isinstance(image_bytes, bytes):
+        # PIL decodes straight from the file; only libjpeg-turbo needs the bytes in memory
+        is_jpeg = image_bytes.read(len(_JPEG_MAGIC)) == _JPEG_MAGIC
+        image_bytes.seek(0)
+        if _tj is not None and is_jpeg:
+            image_bytes = image_bytes.read()
+    
+    if isinstance(image_bytes, bytes) and _tj is not None and image_bytes.startswith(_JPEG_MAGIC):
+        width, height, _, _ = _tj.decode_header(image_bytes)
+        scale = min(width, height) // target_size
+        denominator = next((d for d in (8, 4, 2) if d <= scale), 1)
+        image = Image.fromarray(_tj.decode(
+            image_bytes,
+            pixel_format=TJPF_RGB,
+            scaling_factor=(1, denominator) if denominator > 1 else None
+        ))
+    else:
+        # Close our BytesIO as soon as the pixels are loaded; a caller's file is left open
+        source = io.BytesIO(image_bytes) if isinstance(image_bytes, bytes) else contextlib.nullcontext(image_bytes)
+        with source as fp:
+            image = Image.open(fp)
+            width, height = image.size
+            image.draft('RGB', (target_size, target_size))
+            image.load()
+        image = _to_rgb(image)
+    
+    image.info["original_size"] = (width, height)
+    return image
+
+def _image_info(image: Image.Image) -> Dict[str, Any]:
+    """Metadata reported for a captioned image, using its pre-downscale size."""
+    width, height = image.info.get("original_size", image.size)
+    return {
+        "width": width,
+        "height": height,
+        "mode": image.mode,
+        "format": getattr(image, 'format', 'Unknown')
+    }
+
+# Fixed prompts used by describe_image_details, tokenized once and cached
+_FOCUS_AREA_PROMPTS = {
+    'general': "Describe this image:",
+    'objects': "What objects are in this image?",
+    'scene': "Describe the scene in this image:",
+    'colors': "What are the main colors in this image?",
+    'people': "Describe the people in this image:",
+    'activities': "What activities are happening in this image?"
+}
+
 class ImageCaptioner:
     """BLIP-based image captioner with LoRA adapter support."""
     
@@ -24,9 +110,87 @@ class ImageCaptioner:
         self.model_loader = model_loader
         self.device = get_device()
         self.max_length = settings.MAX_CAPTION_LENGTH
+        self.batch_size = settings.MAX_INFERENCE_BATCH_SIZE  # Maximum images per generate call
+        self.batch_buckets = batch_buckets(settings.MAX_INFERENCE_BATCH_SIZE)
+        self._model_and_processor: Optional[tuple] = None
+        if model_loader:
+            model_loader.add_reload_callback(self._clear_model_cache)
+        
+        # Preprocessing constants, cached from the processor on first use
+        self._image_size: Optional[tuple] = None
+        self._pixel_mean: Optional[torch.Tensor] = None
+        self._pixel_std: Optional[torch.Tensor] = None
+        self._prompt_inputs: Dict[str, Dict[str, torch.Tensor]] = {}
         
+        # Pinned staging buffer for image -> GPU copies, allocated on first use
+        self._pinned: Optional[torch.Tensor] = None
+        self._pinned_event = None
+        self._pinned_lock = threading.Lock()
+        self._copy_stream = None
+        
+        # Every BLIP call runs on this one thread: the compiled vision encoder replays
+        # CUDA graphs, which must not be launched from several threads at once
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image_captioner")
+        
+        # Concurrent caption_image calls with matching parameters share a generate call
+        self.batcher = DynamicBatcher(self._caption_batch, name="image_captioner", executor=self.executor)
+        # Concurrent describe_image_details calls with the same focus areas share one
+        self.describe_batcher = DynamicBatcher(self._describe_batch, name="image_describer", executor=self.executor)
+        # Concurrent analyze_image calls caption and describe from one vision pass
+        self.analyze_batcher = DynamicBatcher(self._analyze_batch, name="image_analyzer", executor=self.executor)
+        
+    async def warmup(self):
+        """Caption one blank image so decoder kernels are selected at startup, not on the first request."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            self.executor,
+            lambda: self._generate_captions(
+                [Image.new('RGB', (settings.IMAGE_INPUT_SIZE, settings.IMAGE_INPUT_SIZE))],
+                None,
+                max_length=20,
+                min_length=5,
+                num_beams=5,
+                length_penalty=1.0,
+                repetition_penalty=1.2,
+                do_sample=False,
+                temperature=1.0,
+                top_p=0.9
+            )
+        )
+        logger.info("Image captioner warmed up")
+    
+    async def stop(self):
+        """Stop the batchers, failing queued requests, and release the model thread."""
+        await self.batcher.stop()
+        await self.describe_batcher.stop()
+        await self.analyze_batcher.stop()
+        self.executor.shutdown(wait=False)
+    
+    def _pad_to_bucket(self, pixel_values: torch.Tensor) -> torch.Tensor:
+        """Pad a batch with blank images up to the next batch size the vision encoder was warmed at.
+        
+        Only applies when the encoder replays CUDA graphs, which are captured
+        per input shape; otherwise the batch is returned unchanged.
+        """
+        if not self.model_loader or self.model_loader.compile_modes.get("image_captioner") != "reduce-overhead":
+            return pixel_values
+        count = pixel_values.shape[0]
+        padded = next((size for size in self.batch_buckets if size >= count), count)
+        if padded == count:
+            return pixel_values
+        # Keep the filler channels_last so the padded batch keeps the strides the graphs were captured with
+        filler = pixel_values.new_zeros(padded - count, *pixel_values.shape[1:])
+        return torch.cat([pixel_values, filler.contiguous(memory_format=torch.channels_last)])
+    
+    def _clear_model_cache(self):
+        """Forget the cached model and processor after the loader drops them."""
+        self._model_and_processor = None
+    
     def _get_model_and_processor(self):
-        """Get model and processor from model loader."""
+        """Get model and processor from model loader, cached after the first fetch."""
+        if self._model_and_processor is not None:
+            return self._model_and_processor
+        
         if not self.model_loader:
             raise RuntimeError("Model loader not available")
         
@@ -36,31 +200,298 @@ class ImageCaptioner:
         if not model or not processor:
             raise RuntimeError("Image captioner model not loaded")
         
-        return model, processor
+        self._model_and_processor = (model, processor)
+        return self._model_and_processor
+    
+    def _fast_preprocess(self, images: List[Image.Image], processor, dtype: torch.dtype) -> torch.Tensor:
+        """Resize and normalize images into BLIP pixel values on the model device.
+        
+        Equivalent to ``processor(images=images).pixel_values`` but keeps the
+        normalization constants on the device and normalizes in place after
+        a single uint8 host->device copy. On CUDA that copy comes from a
+        pinned buffer on a dedicated stream, and the compute stream only
+        waits for it right before normalization.
+        
+        Args:
+            images: List of RGB PIL images
+            processor: BLIP processor providing size, mean and std
+            dtype: Dtype of the model's vision tower
+            
+        Returns:
+            Tensor of shape [B, 3, H, W]
+        """
+        if self._pixel_mean is None:
+            image_processor = processor.image_processor
+            self._image_size = (image_processor.size["width"], image_processor.size["height"])
+            self._pixel_mean = torch.tensor(image_processor.image_mean, device=self.device).view(1, 3, 1, 1) * 255
+            self._pixel_std = torch.tensor(image_processor.image_std, device=self.device).view(1, 3, 1, 1) * 255
+            if self.device == "cuda":
+                width, height = self._image_size
+                self._pinned = torch.empty(
+                    self.batch_size, height, width, 3, dtype=torch.uint8, pin_memory=True
+                )
+                self._pinned_event = torch.cuda.Event()
+                self._copy_stream = torch.cuda.Stream()
+        
+        # Raw RGB bytes of each resized image; np.asarray would call tobytes()
+        # anyway, so copy them once straight into the batch instead of stacking
+        width, height = self._image_size
+        frames = [
+            np.frombuffer(image.resize(self._image_size, Image.BICUBIC).tobytes(), dtype=np.uint8)
+            .reshape(height, width, 3)
+            for image in images
+        ]
+        
+        if self._pinned is None or len(images) > self._pinned.shape[0]:
+            pixels = torch.from_numpy(np.stack(frames)).to(self.device)
+        else:
+            with self._pinned_lock:
+                self._pinned_event.synchronize()
+                staging = self._pinned[:len(images)]
+                staging_array = staging.numpy()
+                for i, frame in enumerate(frames):
+                    staging_array[i] = frame
+                
+                # Upload on a side stream so it overlaps work queued on the compute stream
+                compute_stream = torch.cuda.current_stream()
+                with torch.cuda.stream(self._copy_stream):
+                    pixels = staging.to(self.device, non_blocking=True)
+                    self._pinned_event.record(self._copy_stream)
+                compute_stream.wait_stream(self._copy_stream)
+                pixels.record_stream(compute_stream)
+        
+        # The NHWC -> NCHW permute is a view, so the batch is channels_last from here on
+        pixel_values = pixels.permute(0, 3, 1, 2).float()
+        pixel_values.sub_(self._pixel_mean).div_(self._pixel_std)
+        return pixel_values.to(dtype)
     
-    def _process_image_input(self, image_input: Union[Image.Image, bytes, str]) -> Image.Image:
+    def _encode_prompt(self, prompt: str, processor) -> Dict[str, torch.Tensor]:
+        """Tokenize a captioning prompt, caching the fixed focus-area prompts."""
+        cached = self._prompt_inputs.get(prompt)
+        if cached is not None:
+            return cached
+        
+        encoded = processor.tokenizer(prompt, return_tensors="pt").to(self.device)
+        inputs = {"input_ids": encoded.input_ids, "attention_mask": encoded.attention_mask}
+        if prompt in _FOCUS_AREA_PROMPTS.values():
+            self._prompt_inputs[prompt] = inputs
+        return inputs
+    
+    def _generate_captions(
+        self,
+        images: List[Image.Image],
+        prompt: Optional[str],
+        **generation
+    ) -> List[str]:
+        """Caption a list of decoded images with a single BLIP generate call.
+        
+        Args:
+            images: List of RGB PIL images
+            prompt: Optional text prompt applied to every image
+            **generation: Generation parameters shared by every image
+            
+        Returns:
+            List of captions in input order
+        """
+        model, processor = self._get_model_and_processor()
+        
+        pixel_values = self._pad_to_bucket(self._fast_preprocess(images, processor, model.dtype))
+        inputs = {"pixel_values": pixel_values}
+        prompt_len = 0
+        if prompt:
+            # Conditional captioning with prompt
+            prompt_inputs = self._encode_prompt(prompt, processor)
+            # BLIP drops the trailing [SEP] and echoes the rest of the prompt
+            prompt_len = prompt_inputs["input_ids"].shape[1] - 1
+            inputs.update({
+                name: tensor.expand(pixel_values.shape[0], -1)
+                for name, tensor in prompt_inputs.items()
+            })
+        
+        do_sample = generation["do_sample"]
+        with torch.inference_mode(), get_autocast_context(self.device):
+            caption_ids = model.generate(
+                **inputs,
+                max_length=generation["max_length"],
+                min_length=generation["min_length"],
+                num_beams=generation["num_beams"],
+                num_return_sequences=1,
+                length_penalty=generation["length_penalty"],
+                repetition_penalty=generation["repetition_penalty"],
+                do_sample=do_sample,
+                temperature=generation["temperature"] if do_sample else 1.0,
+                top_p=generation["top_p"] if do_sample else 1.0,
+                pad_token_id=processor.tokenizer.pad_token_id,
+                eos_token_id=processor.tokenizer.eos_token_id
+            )
+        
+        # Decode only the generated tokens, not the echoed prompt
+        return processor.batch_decode(
+            caption_ids[:len(images), prompt_len:],
+            skip_special_tokens=True,
+            clean_up_tokenization_spaces=True
+        )
+    
+    def _caption_batch(self, key: tuple, images: List[Image.Image]) -> List[str]:
+        """DynamicBatcher callback; ``key`` is ``(prompt, generation items)``."""
+        prompt, generation = key
+        return self._generate_captions(images, prompt, **dict(generation))
+    
+    def _describe_batch(self, focus_areas: tuple, images: List[Image.Image]) -> List[Dict[str, str]]:
+        """Describe several images across the same focus areas.
+        
+        The vision encoder runs once for the whole batch; each image's
+        embeddings are then shared by every focus-area prompt.
+        
+        Args:
+            focus_areas: Areas to describe, shared by every image in the batch
+            images: List of RGB PIL images
+            
+        Returns:
+            One ``{area: description}`` dictionary per image, in input order
+        """
+        model, processor = self._get_model_and_processor()
+        
+        pixel_values = self._fast_preprocess(images, processor, model.dtype)
+        with torch.inference_mode(), get_autocast_context(self.device):
+            # Encode every image once and share it across every focus area
+            image_embeds = model.vision_model(pixel_values=self._pad_to_bucket(pixel_values))[0][:len(images)]
+            return self._describe_embeds(model, processor, image_embeds, focus_areas)
+    
+    def _analyze_batch(self, key: tuple, images: List[Image.Image]) -> List[Tuple[str, Dict[str, str]]]:
+        """Caption and describe several images from a single vision encoder pass.
+        
+        Args:
+            key: ``(focus_areas, caption generation items)``
+            images: List of RGB PIL images
+            
+        Returns:
+            One ``(caption, {area: description})`` pair per image, in input order
+        """
+        focus_areas, generation = key
+        generation = dict(generation)
+        model, processor = self._get_model_and_processor()
+        text_config = model.config.text_config
+        
+        pixel_values = self._fast_preprocess(images, processor, model.dtype)
+        with torch.inference_mode(), get_autocast_context(self.device):
+            image_embeds = model.vision_model(pixel_values=self._pad_to_bucket(pixel_values))[0][:len(images)]
+            
+            # Unprompted caption: the decoder starts from BOS alone, as in BLIP's generate
+            caption_ids = model.text_decoder.generate(
+                input_ids=torch.full((len(images), 1), text_config.bos_token_id, dtype=torch.long, device=self.device),
+                encoder_hidden_states=image_embeds,
+                encoder_attention_mask=torch.ones(image_embeds.shape[:-1], dtype=torch.long, device=self.device),
+                eos_token_id=text_config.sep_token_id,
+                pad_token_id=text_config.pad_token_id,
+                **generation
+            )
+            captions = processor.batch_decode(
+                caption_ids,
+                skip_special_tokens=True,
+                clean_up_tokenization_spaces=True
+            )
+            
+            descriptions = self._describe_embeds(model, processor, image_embeds, focus_areas)
+        
+        return list(zip(captions, descriptions))
+    
+    def _describe_embeds(
+        self,
+        model,
+        processor,
+        image_embeds: torch.Tensor,
+        focus_areas: tuple
+    ) -> List[Dict[str, str]]:
+        """Generate focus-area descriptions from already encoded images.
+        
+        Must be called under inference mode and the autocast context.
+        
+        Args:
+            model: BLIP model
+            processor: BLIP processor
+            image_embeds: Vision encoder output of shape [B, N, D]
+            focus_areas: Areas to describe, shared by every image
+            
+        Returns:
+            One ``{area: description}`` dictionary per image, in input order
+        """
+        prompts = {
+            area: _FOCUS_AREA_PROMPTS.get(area, f"Describe the {area} in this image:")
+            for area in focus_areas
+        }
+        
+        # Batch prompts of equal token length; BLIP's text decoder uses absolute
+        # positions, so mixing lengths would need padding inside the prompt
+        groups: Dict[int, List[str]] = {}
+        for area, prompt in prompts.items():
+            length = self._encode_prompt(prompt, processor)["input_ids"].shape[1]
+            groups.setdefault(length, []).append(area)
+        
+        batch = image_embeds.shape[0]
+        descriptions: List[Dict[str, str]] = [{} for _ in range(batch)]
+        for areas in groups.values():
+            # Rows are image-major: image b, area a sits at b * len(areas) + a
+            input_ids = torch.cat([
+                self._encode_prompt(prompts[area], processor)["input_ids"] for area in areas
+            ]).repeat(batch, 1)
+            input_ids[:, 0] = model.config.text_config.bos_token_id
+            encoder_hidden_states = image_embeds.repeat_interleave(len(areas), dim=0)
+            
+            caption_ids = model.text_decoder.generate(
+                input_ids=input_ids[:, :-1],
+                encoder_hidden_states=encoder_hidden_states,
+                encoder_attention_mask=torch.ones(
+                    encoder_hidden_states.shape[:-1], dtype=torch.long, device=self.device
+                ),
+                max_length=100,
+                min_length=25,
+                num_beams=5,
+                repetition_penalty=1.2,
+                eos_token_id=model.config.text_config.sep_token_id,
+                pad_token_id=model.config.text_config.pad_token_id
+            )
+            
+            # Decode only the generated tokens, not the echoed prompt
+            captions = processor.batch_decode(
+                caption_ids[:, input_ids.shape[1] - 1:],
+                skip_special_tokens=True,
+                clean_up_tokenization_spaces=True
+            )
+            for row, caption in enumerate(captions):
+                descriptions[row // len(areas)][areas[row % len(areas)]] = caption
+        
+        return descriptions
+    
+    def _process_image_input(self, image_input: Union[Image.Image, bytes, BinaryIO, str]) -> Image.Image:
         """Process various image input formats into PIL Image.
         
         Args:
-            image_input: PIL Image, bytes, or base64 string
+            image_input: PIL Image, bytes, binary file, or base64 string
             
         Returns:
             PIL Image object
         """
         if isinstance(image_input, Image.Image):
-            return image_input.convert('RGB')
-        elif isinstance(image_input, bytes):
-            return Image.open(io.BytesIO(image_input)).convert('RGB')
+            return _to_rgb(image_input)
+        elif isinstance(image_input, bytes) or hasattr(image_input, 'read'):
+            return self._decode_image_bytes(image_input)
         elif isinstance(image_input, str):
-            # Assume base64 encoded image
+            # Assume base64 encoded image, optionally wrapped in a data URL
+            if image_input.startswith('data:'):
+                image_input = image_input.partition(',')[2]
             try:
-                image_data = base64.b64decode(image_input)
-                return Image.open(io.BytesIO(image_data)).convert('RGB')
+                image_data = pybase64.b64decode(image_input, validate=False)
+                return self._decode_image_bytes(image_data)
             except Exception as e:
                 raise ValueError(f"Invalid base64 image data: {e}")
         else:
             raise ValueError(f"Unsupported image input type: {type(image_input)}")
     
+    def _decode_image_bytes(self, image_bytes: Union[bytes, BinaryIO]) -> Image.Image:
+        """Decode encoded image bytes into an RGB PIL Image downscaled toward the model input size."""
+        return decode_image(image_bytes)
+    
     async def caption_image(
         self,
         image_input: Union[Image.Image, bytes, str],
@@ -92,8 +523,6 @@ class ImageCaptioner:
             Dictionary containing caption and metadata
         """
         try:
-            model, processor = self._get_model_and_processor()
-            
             # Process image
             image = self._process_image_input(image_input)
             
@@ -103,61 +532,24 @@ class ImageCaptioner:
             if min_length is None:
                 min_length = max(5, max_length // 4)
             
-            # Prepare inputs
-            if prompt:
-                # Conditional captioning with prompt
-                inputs = processor(
-                    images=image,
-                    text=prompt,
-                    return_tensors="pt",
-                    padding=True
-                ).to(self.device)
-            else:
-                # Unconditional captioning
-                inputs = processor(
-                    images=image,
-                    return_tensors="pt"
-                ).to(self.device)
-            
-            # Generate caption
-            with torch.no_grad():
-                caption_ids = model.generate(
-                    **inputs,
-                    max_length=max_length,
-                    min_length=min_length,
-                    num_beams=num_beams,
-                    length_penalty=length_penalty,
-                    repetition_penalty=repetition_penalty,
-                    do_sample=do_sample,
-                    temperature=temperature if do_sample else 1.0,
-                    top_p=top_p if do_sample else 1.0,
-                    pad_token_id=processor.tokenizer.pad_token_id,
-                    eos_token_id=processor.tokenizer.eos_token_id
-                )
-            
-            # Decode caption
-            caption = processor.decode(
-                caption_ids[0],
-                skip_special_tokens=True,
-                clean_up_tokenization_spaces=True
-            )
-            
-            # Remove prompt from caption if it was used
-            if prompt and caption.startswith(prompt):
-                caption = caption[len(prompt):].strip()
-            
-            # Get image metadata
-            image_info = {
-                "width": image.width,
-                "height": image.height,
-                "mode": image.mode,
-                "format": getattr(image, 'format', 'Unknown')
+            generation = {
+                "max_length": max_length,
+                "min_length": min_length,
+                "num_beams": num_beams,
+                "length_penalty": length_penalty,
+                "repetition_penalty": repetition_penalty,
+                "do_sample": do_sample,
+                "temperature": temperature,
+                "top_p": top_p
             }
             
+            # Generate caption, batched with concurrent requests using the same parameters
+            caption = await self.batcher.submit(image, key=(prompt, tuple(generation.items())))
+            
             result = {
                 "caption": caption,
                 "confidence": 1.0,  # BLIP doesn't provide confidence scores directly
-                "image_info": image_info,
+                "image_info": _image_info(image),
                 "model_used": "image_captioner",
                 "prompt_used": prompt,
                 "parameters": {
@@ -169,7 +561,7 @@ class ImageCaptioner:
                 }
             }
             
-            logger.info(f"Image captioned: {image.width}x{image.height} -> '{caption[:50]}...'")
+            logger.info("Image captioned: %dx%d -> '%.50s...'", image.width, image.height, caption)
             return result
             
         except Exception as e:
@@ -179,33 +571,149 @@ class ImageCaptioner:
     async def batch_caption(
         self,
         images: List[Union[Image.Image, bytes, str]],
-        **kwargs
+        max_length: Optional[int] = None,
+        min_length: Optional[int] = None,
+        num_beams: int = 5,
+        length_penalty: float = 1.0,
+        repetition_penalty: float = 1.2,
+        do_sample: bool = False,
+        temperature: float = 1.0,
+        top_p: float = 0.9,
+        prompt: Optional[str] = None,
+        batch_size: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Caption multiple images in batch.
+        """Caption multiple images with batched BLIP generate calls.
         
         Args:
             images: List of input images
-            **kwargs: Additional arguments for captioning
+            max_length: Maximum length of caption
+            min_length: Minimum length of caption
+            num_beams: Number of beams for beam search
+            length_penalty: Length penalty for beam search
+            repetition_penalty: Repetition penalty
+            do_sample: Whether to use sampling
+            temperature: Temperature for sampling
+            top_p: Top-p value for nucleus sampling
+            prompt: Optional text prompt applied to every image
+            batch_size: Maximum images per generate call
             
         Returns:
-            List of caption results
+            List of caption results in input order
         """
-        results = []
+        results: List[Optional[Dict[str, Any]]] = [None] * len(images)
+        async for i, result in self.iter_batch_caption(
+            images,
+            max_length=max_length,
+            min_length=min_length,
+            num_beams=num_beams,
+            length_penalty=length_penalty,
+            repetition_penalty=repetition_penalty,
+            do_sample=do_sample,
+            temperature=temperature,
+            top_p=top_p,
+            prompt=prompt,
+            batch_size=batch_size
+        ):
+            results[i] = result
         
-        for i, image in enumerate(images):
+        logger.info("Batch captioned %d images", len(images))
+        return results
+    
+    async def iter_batch_caption(
+        self,
+        images: List[Union[Image.Image, bytes, str]],
+        max_length: Optional[int] = None,
+        min_length: Optional[int] = None,
+        num_beams: int = 5,
+        length_penalty: float = 1.0,
+        repetition_penalty: float = 1.2,
+        do_sample: bool = False,
+        temperature: float = 1.0,
+        top_p: float = 0.9,
+        prompt: Optional[str] = None,
+        batch_size: Optional[int] = None
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Caption multiple images, yielding each result as soon as its chunk finishes.
+        
+        Takes the same arguments as ``batch_caption``. Images are decoded and
+        captioned one ``batch_size`` chunk at a time, with decoding and generation
+        both running in worker threads.
+        
+        Yields:
+            ``(index, result)`` pairs; failed images carry an ``error`` entry
+        """
+        batch_size = batch_size or self.batch_size
+        
+        if max_length is None:
+            max_length = self.max_length
+        if min_length is None:
+            min_length = max(5, max_length // 4)
+        
+        generation = {
+            "max_length": max_length,
+            "min_length": min_length,
+            "num_beams": num_beams,
+            "length_penalty": length_penalty,
+            "repetition_penalty": repetition_penalty,
+            "do_sample": do_sample,
+            "temperature": temperature,
+            "top_p": top_p
+        }
+        
+        loop = asyncio.get_running_loop()
+        for start in range(0, len(images), batch_size):
+            chunk = range(start, min(start + batch_size, len(images)))
+            
+            # Decode one chunk concurrently in worker threads, reporting failures right away;
+            # decoding per chunk keeps at most one chunk of pixels alive at a time
+            raw = await asyncio.gather(
+                *(loop.run_in_executor(None, self._process_image_input, images[i]) for i in chunk),
+                return_exceptions=True
+            )
+            group = []
+            for i, image in zip(chunk, raw):
+                if isinstance(image, Exception):
+                    logger.error(f"Error captioning image {i}: {image}")
+                    yield i, {"error": str(image), "batch_index": i, "caption": None}
+                else:
+                    group.append((i, image))
+            if not group:
+                continue
+            
+            indices = [i for i, _ in group]
+            image_list = [image for _, image in group]
             try:
-                result = await self.caption_image(image, **kwargs)
-                result["batch_index"] = i
-                results.append(result)
+                captions = await run_with_retry(
+                    loop.run_in_executor,
+                    self.executor,
+                    functools.partial(self._generate_captions, image_list, prompt, **generation)
+                )
             except Exception as e:
-                logger.error(f"Error captioning image {i}: {e}")
-                results.append({
-                    "error": str(e),
-                    "batch_index": i,
-                    "caption": None
-                })
-        
-        return results
+                logger.error(f"Error captioning images {indices[0]}-{indices[-1]}: {e}")
+                for i in indices:
+                    yield i, {"error": str(e), "batch_index": i, "caption": None}
+            else:
+                for i, image, caption in zip(indices, image_list, captions):
+                    yield i, {
+                        "caption": caption,
+                        "confidence": 1.0,  # BLIP doesn't provide confidence scores directly
+                        "image_info": _image_info(image),
+                        "model_used": "image_captioner",
+                        "prompt_used": prompt,
+                        "parameters": {
+                            "max_length": max_length,
+                            "min_length": min_length,
+                            "num_beams": num_beams,
+                            "length_penalty": length_penalty,
+                            "do_sample": do_sample
+                        },
+                        "batch_index": i
+                    }
+            finally:
+                # Free the pixels of images decoded here; caller-owned images are left open
+                for i, image in group:
+                    if not isinstance(images[i], Image.Image):
+                        image.close()
     
     async def visual_question_answering(
         self,
@@ -260,43 +768,17 @@ class ImageCaptioner:
             Dictionary containing detailed descriptions
         """
         try:
-            descriptions = {}
+            image = self._process_image_input(image_input)
             
             # Default focus areas
             if focus_areas is None:
                 focus_areas = ['general', 'objects', 'scene', 'colors']
             
-            # Generate descriptions for each focus area
-            for area in focus_areas:
-                if area == 'general':
-                    prompt = "Describe this image:"
-                elif area == 'objects':
-                    prompt = "What objects are in this image?"
-                elif area == 'scene':
-                    prompt = "Describe the scene in this image:"
-                elif area == 'colors':
-                    prompt = "What are the main colors in this image?"
-                elif area == 'people':
-                    prompt = "Describe the people in this image:"
-                elif area == 'activities':
-                    prompt = "What activities are happening in this image?"
-                else:
-                    prompt = f"Describe the {area} in this image:"
-                
-                result = await self.caption_image(
-                    image_input=image_input,
-                    prompt=prompt,
-                    max_length=100
-                )
-                
-                descriptions[area] = result["caption"]
-            
-            # Get image info from the last result
-            image_info = result.get("image_info", {})
+            descriptions = await self.describe_batcher.submit(image, key=tuple(focus_areas))
             
             return {
-                "detailed_descriptions": descriptions,
-                "image_info": image_info,
+                "detailed_descriptions": {area: descriptions[area] for area in focus_areas},
+                "image_info": _image_info(image),
                 "focus_areas": focus_areas,
                 "model_used": "image_captioner",
                 "task": "detailed_description"
@@ -306,6 +788,69 @@ class ImageCaptioner:
             logger.error(f"Error in detailed image description: {e}")
             raise
     
+    async def analyze_image(
+        self,
+        image_input: Union[Image.Image, bytes, str],
+        focus_areas: Optional[List[str]] = None,
+        max_length: Optional[int] = None,
+        min_length: Optional[int] = None,
+        num_beams: int = 5,
+        length_penalty: float = 1.0,
+        repetition_penalty: float = 1.2
+    ) -> Dict[str, Any]:
+        """Caption and describe an image, running the vision encoder only once.
+        
+        Equivalent to ``caption_image`` followed by ``describe_image_details``
+        on the same image, but both heads decode from shared image embeddings.
+        
+        Args:
+            image_input: Input image (PIL Image, bytes, or base64 string)
+            focus_areas: List of areas to describe
+            max_length: Maximum length of caption
+            min_length: Minimum length of caption
+            num_beams: Number of beams for the caption
+            length_penalty: Length penalty for the caption
+            repetition_penalty: Repetition penalty for the caption
+            
+        Returns:
+            Dictionary containing the caption, descriptions and metadata
+        """
+        try:
+            image = self._process_image_input(image_input)
+            
+            if focus_areas is None:
+                focus_areas = ['general', 'objects', 'scene', 'colors']
+            if max_length is None:
+                max_length = self.max_length
+            if min_length is None:
+                min_length = max(5, max_length // 4)
+            
+            generation = {
+                "max_length": max_length,
+                "min_length": min_length,
+                "num_beams": num_beams,
+                "length_penalty": length_penalty,
+                "repetition_penalty": repetition_penalty
+            }
+            
+            caption, descriptions = await self.analyze_batcher.submit(
+                image,
+                key=(tuple(focus_areas), tuple(generation.items()))
+            )
+            
+            return {
+                "caption": caption,
+                "detailed_descriptions": {area: descriptions[area] for area in focus_areas},
+                "image_info": _image_info(image),
+                "focus_areas": focus_areas,
+                "model_used": "image_captioner",
+                "parameters": generation
+            }
+            
+        except Exception as e:
+            logger.error(f"Error in image analysis: {e}")
+            raise
+    
     def get_model_info(self) -> Dict[str, Any]:
         """Get information about the loaded model."""
         try:
@@ -327,7 +872,8 @@ class ImageCaptioner:
                 "capabilities": [
                     "image_captioning",
                     "visual_question_answering",
-                    "detailed_description"
+                    "detailed_description",
+                    "image_analysis"
                 ]
             }
             
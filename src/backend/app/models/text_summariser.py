@@ -5,12 +5,15 @@ for text summarization tasks.
 """
 
 import torch
+import contextlib
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 from peft import get_peft_model, LoraConfig
 import logging
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+from ..config import settings
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -27,13 +30,22 @@ LORA_PATH = "./lora-bart-summarizer"
 tokenizer: Optional[AutoTokenizer] = None
 model: Optional[AutoModelForSeq2SeqLM] = None
 
+# Optional small draft model for speculative (assisted) decoding
+draft_model: Optional[AutoModelForSeq2SeqLM] = None
+
 
-def load_model_and_tokenizer(model_name: str = MODEL_NAME, lora_path: str = LORA_PATH) -> tuple:
+def load_model_and_tokenizer(
+    model_name: str = MODEL_NAME,
+    lora_path: str = LORA_PATH,
+    load_kwargs: Optional[Dict[str, Any]] = None
+) -> tuple:
     """Load tokenizer and model with LoRA adapter.
     
     Args:
         model_name: Name of the base model to load
         lora_path: Path to the LoRA adapter
+        load_kwargs: Extra ``from_pretrained`` arguments for the base model,
+            e.g. the dtype or bitsandbytes config from ``ModelLoader``
         
     Returns:
         Tuple of (tokenizer, model)
@@ -41,15 +53,18 @@ def load_model_and_tokenizer(model_name: str = MODEL_NAME, lora_path: str = LORA
     Raises:
         Exception: If model or LoRA adapter loading fails
     """
-    global tokenizer, model
+    global tokenizer, model, draft_model
     
     try:
         logger.info(f"Loading tokenizer from {model_name}")
-        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
         
         logger.info(f"Loading base model from {model_name}")
-        model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
-        model.to(device)
+        load_kwargs = load_kwargs or {}
+        model = AutoModelForSeq2SeqLM.from_pretrained(model_name, **load_kwargs)
+        # bitsandbytes places quantized weights itself
+        if "quantization_config" not in load_kwargs:
+            model.to(device)
         
         # Check if LoRA adapter exists
         lora_path_obj = Path(lora_path)
@@ -61,6 +76,18 @@ def load_model_and_tokenizer(model_name: str = MODEL_NAME, lora_path: str = LORA
         else:
             logger.warning(f"LoRA adapter not found at {lora_path}. Using base model only.")
         
+        model.eval()
+        
+        # The draft shares BART's vocabulary, so it can propose tokens for the full model
+        if settings.TEXT_SUMMARIZER_DRAFT_MODEL:
+            logger.info(f"Loading draft model from {settings.TEXT_SUMMARIZER_DRAFT_MODEL}")
+            draft_model = AutoModelForSeq2SeqLM.from_pretrained(
+                settings.TEXT_SUMMARIZER_DRAFT_MODEL,
+                torch_dtype=load_kwargs.get("torch_dtype")
+            )
+            draft_model.to(device)
+            draft_model.eval()
+        
         logger.info("Model and tokenizer loaded successfully")
         return tokenizer, model
         
@@ -129,23 +156,59 @@ def summarize_text(
         ValueError: If model is not loaded or text is empty
         Exception: If summarization fails
     """
+    return summarize_texts(
+        [text],
+        max_input_length=max_input_length,
+        max_output_length=max_output_length,
+        num_beams=num_beams,
+        length_penalty=length_penalty,
+        early_stopping=early_stopping
+    )[0]
+
+
+def summarize_texts(
+    texts: list[str],
+    max_input_length: int = 512,
+    max_output_length: int = 150,
+    num_beams: int = 5,
+    length_penalty: float = 1.2,
+    early_stopping: bool = True
+) -> list[str]:
+    """Summarize several texts with a single generate call.
+    
+    Args:
+        texts: Input texts to summarize
+        max_input_length: Maximum length of input tokens
+        max_output_length: Maximum length of output summary
+        num_beams: Number of beams for beam search
+        length_penalty: Length penalty for generation
+        early_stopping: Whether to use early stopping
+        
+    Returns:
+        Generated summaries in input order
+        
+    Raises:
+        ValueError: If model is not loaded or any text is empty
+        Exception: If summarization fails
+    """
     global model, tokenizer
     
     if model is None or tokenizer is None:
         raise ValueError("Model and tokenizer must be loaded first. Call load_model_and_tokenizer().")
     
-    if not text or not text.strip():
+    if not texts or any(not text or not text.strip() for text in texts):
         raise ValueError("Input text cannot be empty")
     
     try:
-        logger.info(f"Summarizing text of length: {len(text)}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Summarizing %d text(s) of total length: %d", len(texts), sum(len(text) for text in texts))
         
         # Prepare input with summarization prompt
-        input_text = "summarize: " + text.strip()
+        input_texts = ["summarize: " + text.strip() for text in texts]
         
         # Tokenize input
         inputs = tokenizer(
-            input_text,
+            input_texts,
             return_tensors="pt",
             truncation=True,
             padding="max_length",
@@ -156,23 +219,44 @@ def summarize_text(
         inputs = {k: v.to(device) for k, v in inputs.items()}
         
         # Generate summary
-        with torch.no_grad():
+        autocast = (
+            torch.autocast(device_type="cuda", dtype=torch.float16)
+            if device.type == "cuda" else contextlib.nullcontext()
+        )
+        generate_kwargs = {
+            "max_length": max_output_length,
+            "num_beams": num_beams,
+            "length_penalty": length_penalty,
+            "early_stopping": early_stopping
+        }
+        # Assisted generation verifies several draft tokens per forward pass of
+        # the full model, but only supports greedy search on a single sequence.
+        # Configuring a draft model opts into greedy decoding for every request,
+        # so single texts and batches of several summarize alike.
+        if draft_model is not None:
+            generate_kwargs["num_beams"] = 1
+            if len(texts) == 1:
+                generate_kwargs["assistant_model"] = draft_model
+        
+        with torch.inference_mode(), autocast:
             summary_ids = model.generate(
                 **inputs,
-                max_length=max_output_length,
-                num_beams=num_beams,
-                length_penalty=length_penalty,
-                early_stopping=early_stopping,
+                **generate_kwargs,
                 do_sample=False,  # Use deterministic generation
                 pad_token_id=tokenizer.pad_token_id,
                 eos_token_id=tokenizer.eos_token_id
             )
         
         # Decode summary
-        summary = tokenizer.decode(summary_ids[0], skip_special_tokens=True)
+        summaries = tokenizer.batch_decode(
+            summary_ids,
+            skip_special_tokens=True,
+            clean_up_tokenization_spaces=False  # Byte-level BPE already encodes spacing
+        )
         
-        logger.info(f"Generated summary of length: {len(summary)}")
-        return summary.strip()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Generated summary lengths: %s", [len(summary) for summary in summaries])
+        return [summary.strip() for summary in summaries]
         
     except Exception as e:
         logger.error(f"Error during summarization: {str(e)}")
@@ -228,13 +312,18 @@ def batch_summarize(
 
 def cleanup_model():
     """Clean up model and tokenizer from memory."""
-    global model, tokenizer
+    global model, tokenizer, draft_model
     
     if model is not None:
         del model
         model = None
         logger.info("Model cleaned up")
     
+    if draft_model is not None:
+        del draft_model
+        draft_model = None
+        logger.info("Draft model cleaned up")
+    
     if tokenizer is not None:
         del tokenizer
         tokenizer = None
@@ -4,55 +4,74 @@ This module contains the TextSummarizer class for BART-based text summarization
 with LoRA adapter support using the custom model implementation.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-import sys
-import os
-
-# Add the backend directory to the path to import model.py
-sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-
-try:
-    from text_summariser import (
-        load_model_and_tokenizer,
-        get_model_info,
-        summarize_text,
-        batch_summarize,
-        cleanup_model
-    )
-except ImportError:
-    # Fallback if text_summariser.py is not available
-    load_model_and_tokenizer = None
-    get_model_info = None
-    summarize_text = None
-    batch_summarize = None
-    cleanup_model = None
+import re
+from collections import Counter
+from typing import List, Dict, Any, Optional, Callable
 
 from ..config import settings
+from .batcher import DynamicBatcher
+from . import text_summariser as _ts
 
 logger = logging.getLogger(__name__)
 
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+_WORD = re.compile(r"[a-z0-9']+")
+
 class TextSummarizer:
     """BART-based text summarizer with LoRA adapter support."""
     
-    def __init__(self):
+    def __init__(self, model_loader=None):
+        self.model_loader = model_loader
         self.model_loaded = False
         self.max_length = getattr(settings, 'MAX_SUMMARY_LENGTH', 150)
         self.max_input_length = getattr(settings, 'MAX_TEXT_LENGTH', 1024)
+        self._summarize_texts: Callable[..., List[str]] = _ts.summarize_texts
         self._ensure_model_loaded()
         
+        # Concurrent summarize calls with matching parameters share a generate call
+        self.batcher = DynamicBatcher(self._summarize_batch, name="text_summarizer")
+        
     def _ensure_model_loaded(self):
-        """Ensure the model is loaded."""
-        if not self.model_loaded and load_model_and_tokenizer:
+        """Ensure the model is loaded.
+        
+        A ``ModelLoader`` that already loaded the summarizer has populated
+        ``text_summariser``'s weights, so they are not loaded a second time.
+        """
+        if self.model_loader and self.model_loader.get_model("text_summarizer") is not None:
+            self.model_loaded = True
+        if not self.model_loaded:
             try:
-                load_model_and_tokenizer()
+                _ts.load_model_and_tokenizer()
                 self.model_loaded = True
                 logger.info("LoRA BART model loaded successfully")
             except Exception as e:
                 logger.error(f"Failed to load LoRA BART model: {e}")
                 raise RuntimeError(f"Failed to load text summarizer model: {e}")
-        elif not load_model_and_tokenizer:
-            raise RuntimeError("Custom model functions not available")
+    
+    async def warmup(self):
+        """Run one dummy summary so CUDA context setup and kernel selection happen at startup."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            None,
+            self._summarize_batch,
+            (16, 1, 1.0, True),
+            ["The quick brown fox jumps over the lazy dog."]
+        )
+        logger.info("Text summarizer warmed up")
+    
+    def _summarize_batch(self, key: tuple, texts: List[str]) -> List[str]:
+        """DynamicBatcher callback; ``key`` holds the shared generation parameters."""
+        max_length, num_beams, length_penalty, early_stopping = key
+        return self._summarize_texts(
+            texts,
+            max_input_length=512,
+            max_output_length=max_length,
+            num_beams=num_beams,
+            length_penalty=length_penalty,
+            early_stopping=early_stopping
+        )
     
     async def summarize(
         self,
@@ -81,36 +100,55 @@ class TextSummarizer:
             Generated summary text
         """
         try:
-            self._ensure_model_loaded()
-            
             # Set default lengths
             if max_length is None:
                 max_length = min(self.max_length, len(text.split()) // 2)
             
             # Validate input length
             if len(text) > self.max_input_length:
-                logger.warning(f"Input text truncated from {len(text)} to {self.max_input_length} characters")
+                logger.warning("Input text truncated from %d to %d characters", len(text), self.max_input_length)
                 text = text[:self.max_input_length]
             
-            # Use the custom summarize_text function
-            if not summarize_text:
-                raise RuntimeError("Summarize function not available")
-            
-            summary = summarize_text(
-                text=text,
-                max_input_length=512,
-                max_output_length=max_length,
-                num_beams=num_beams,
-                length_penalty=length_penalty,
-                early_stopping=early_stopping
+            # Batched with concurrent requests using the same parameters
+            summary = await self.batcher.submit(
+                text,
+                key=(max_length, num_beams, length_penalty, early_stopping)
             )
             
-            logger.info(f"Successfully generated summary of length {len(summary)} from input of length {len(text)}")
+            logger.info("Successfully generated summary of length %d from input of length %d", len(summary), len(text))
             return summary
             
         except Exception as e:
             logger.error(f"Error in text summarization: {e}")
             raise
+    
+    def extractive_summarize(self, text: str, num_sentences: int = 3) -> str:
+        """Pick the highest-scoring sentences from the text, in original order.
+        
+        Sentences are scored by the mean corpus frequency of their words. This
+        is pure CPU work and synchronous, so async callers should run it in an
+        executor.
+        
+        Args:
+            text: Input text to summarize
+            num_sentences: Number of sentences to keep
+            
+        Returns:
+            Extracted summary text
+        """
+        sentences = [s.strip() for s in _SENTENCE_SPLIT.split(text.strip()) if s.strip()]
+        if len(sentences) <= num_sentences:
+            return " ".join(sentences)
+        
+        sentence_words = [_WORD.findall(s.lower()) for s in sentences]
+        frequencies = Counter(word for words in sentence_words for word in words)
+        scores = [
+            sum(frequencies[word] for word in words) / len(words) if words else 0.0
+            for words in sentence_words
+        ]
+        
+        top = sorted(range(len(sentences)), key=scores.__getitem__, reverse=True)[:num_sentences]
+        return " ".join(sentences[i] for i in sorted(top))
 
     
     def get_model_info(self) -> Dict[str, Any]:
@@ -5,10 +5,15 @@ including device detection, model caching, and LoRA adapter management.
 """
 
 import torch
+import asyncio
+import contextlib
+import hashlib
 import logging
-from typing import Optional, Dict, Any, Union
+import time
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Union, Callable, List, Tuple, Awaitable
 from pathlib import Path
-from transformers import AutoModel, AutoTokenizer, AutoProcessor
+from transformers import AutoModel, AutoTokenizer, AutoProcessor, BitsAndBytesConfig
 from peft import PeftModel, PeftConfig
 import gc
 
@@ -28,12 +33,122 @@ def get_device() -> str:
     else:
         return "cpu"
 
+def get_autocast_context(device: str):
+    """Get a mixed-precision autocast context for inference on the given device.
+    
+    Uses FP16 on CUDA. Other devices keep full precision: CPU BF16 autocast
+    would also break int8 dynamically quantized layers, which expect float
+    activations.
+    """
+    if "cuda" not in str(device):
+        return contextlib.nullcontext()
+    return torch.autocast(device_type="cuda", dtype=torch.float16)
+
+def batch_buckets(max_batch_size: int) -> Tuple[int, ...]:
+    """Batch sizes a fixed-shape compiled model is specialized for.
+    
+    Powers of two up to ``max_batch_size``, plus ``max_batch_size`` itself.
+    Padding batches up to the next bucket keeps the number of distinct
+    shapes (and so recompilations and captured CUDA graphs) small.
+    """
+    buckets = []
+    size = 1
+    while size < max_batch_size:
+        buckets.append(size)
+        size *= 2
+    buckets.append(max_batch_size)
+    return tuple(buckets)
+
 def clear_memory():
     """Clear GPU/CPU memory."""
     gc.collect()
     if torch.cuda.is_available():
         torch.cuda.empty_cache()
 
+def is_transient_error(error: BaseException) -> bool:
+    """Whether a model error is worth retrying (device out of memory or busy)."""
+    if isinstance(error, torch.cuda.OutOfMemoryError):
+        return True
+    message = str(error).lower()
+    return isinstance(error, RuntimeError) and ("out of memory" in message or "busy" in message)
+
+async def run_with_retry(
+    fn: Callable[..., Awaitable[Any]],
+    *args,
+    attempts: int = 3,
+    delay: float = 0.1,
+    **kwargs
+) -> Any:
+    """Await a model call, retrying transient failures with exponential backoff.
+    
+    Cached device memory is released between attempts so a retry after an
+    allocation spike can succeed; any other error is raised immediately.
+    
+    Args:
+        fn: Coroutine function performing the model call
+        attempts: Maximum number of attempts
+        delay: Backoff before the first retry, doubled after each one
+        
+    Returns:
+        The result of ``fn``
+    """
+    for attempt in range(attempts):
+        try:
+            return await fn(*args, **kwargs)
+        except Exception as e:
+            if attempt == attempts - 1 or not is_transient_error(e):
+                raise
+            logger.warning(f"Transient model error, retrying in {delay:.2f}s: {e}")
+            clear_memory()
+            await asyncio.sleep(delay)
+            delay *= 2
+
+class ResultCache:
+    """LRU cache of inference results keyed by a hash of the input content.
+    
+    Only touched from the event loop, so no locking is needed. Entries expire
+    ``ttl`` seconds after they are stored.
+    """
+    
+    def __init__(self, maxsize: int = settings.RESULT_CACHE_SIZE, ttl: float = settings.RESULT_CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, Any]]" = OrderedDict()
+    
+    @staticmethod
+    def key(content: Union[bytes, str], *params: Any) -> bytes:
+        """Hash input content together with the parameters that shape the result."""
+        if isinstance(content, str):
+            content = content.encode()
+        digest = hashlib.blake2b(content, digest_size=16)
+        digest.update(repr(params).encode())
+        return digest.digest()
+    
+    def get(self, key: bytes) -> Optional[Any]:
+        """Return the cached value, or None if it is missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: bytes, value: Any):
+        """Store a value, evicting the least recently used entry when full."""
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Drop every entry, e.g. after the underlying model changes."""
+        self._entries.clear()
+
 class ModelLoader:
     """Centralized model loader and manager."""
     
@@ -42,14 +157,107 @@ class ModelLoader:
         self.models: Dict[str, Any] = {}
         self.tokenizers: Dict[str, Any] = {}
         self.processors: Dict[str, Any] = {}
+        self.reload_callbacks: List[Callable[[], None]] = []
+        self.compute_types: Dict[str, str] = {}
+        self.compile_modes: Dict[str, str] = {}
         # Removed foundation_models dependency
         
         # Create cache directory
         self.cache_dir = Path(settings.MODEL_CACHE_DIR)
         self.cache_dir.mkdir(exist_ok=True)
         
+        # Let attention that goes through scaled_dot_product_attention pick fused kernels
+        if self.device == "cuda":
+            torch.backends.cuda.enable_flash_sdp(True)
+            torch.backends.cuda.enable_mem_efficient_sdp(True)
+        
         logger.info(f"ModelLoader initialized with device: {self.device}")
     
+    def _load_kwargs(self) -> Dict[str, Any]:
+        """Build ``from_pretrained`` keyword arguments for the configured precision.
+        
+        Returns bitsandbytes weight-only quantization settings when
+        ``QUANT_MODE`` is set and the GPU supports it (compute capability
+        7.5+), FP16 on other accelerators and FP32 on CPU.
+        """
+        dtype = torch.float16 if self.device != "cpu" else torch.float32
+        kwargs = {"cache_dir": self.cache_dir, "torch_dtype": dtype}
+        
+        if not settings.QUANT_MODE:
+            return kwargs
+        if self.device != "cuda" or torch.cuda.get_device_capability() < (7, 5):
+            logger.warning(f"QUANT_MODE={settings.QUANT_MODE} needs a CUDA GPU with compute capability 7.5+, using {dtype}")
+            return kwargs
+        
+        if settings.QUANT_MODE == "int8":
+            kwargs["quantization_config"] = BitsAndBytesConfig(load_in_8bit=True)
+        elif settings.QUANT_MODE == "nf4":
+            # Weights stay packed as 4-bit NF4 and are dequantized per matmul;
+            # LoRA adapters loaded on top keep FP16 weights
+            kwargs["quantization_config"] = BitsAndBytesConfig(
+                load_in_4bit=True,
+                bnb_4bit_compute_dtype=torch.float16,
+                bnb_4bit_quant_type="nf4",
+                bnb_4bit_use_double_quant=True
+            )
+        else:
+            raise ValueError(f"Unsupported QUANT_MODE: {settings.QUANT_MODE}")
+        
+        # bitsandbytes places the quantized weights itself
+        kwargs["device_map"] = {"": 0}
+        return kwargs
+    
+    def _compute_type(self, load_kwargs: Dict[str, Any]) -> str:
+        """Describe the weight precision a model was loaded with."""
+        if "quantization_config" in load_kwargs:
+            return settings.QUANT_MODE
+        return str(load_kwargs["torch_dtype"]).replace("torch.", "")
+    
+    def _place(self, model, load_kwargs: Dict[str, Any]):
+        """Move a freshly loaded model to the device unless bitsandbytes already placed it."""
+        if "quantization_config" in load_kwargs:
+            return model
+        return model.to(self.device)
+    
+    def _compile_encoder(
+        self,
+        encoder: torch.nn.Module,
+        load_kwargs: Dict[str, Any],
+        example_input: Optional[torch.Tensor] = None,
+        batch_sizes: Tuple[int, ...] = (1,),
+        memory_format: torch.memory_format = torch.contiguous_format
+    ) -> Optional[str]:
+        """Compile an encoder's forward with torch.compile and warm it up.
+        
+        Fixed-shape encoders (given an ``example_input``) use
+        ``reduce-overhead`` on CUDA so each forward replays a captured CUDA
+        graph; variable-length encoders and CPU use the default mode.
+        
+        Args:
+            encoder: Encoder module whose forward is replaced in place
+            load_kwargs: Keyword arguments the model was loaded with
+            example_input: Representative single-item input used to trigger compilation at startup
+            batch_sizes: Batch sizes to warm up ``example_input`` at
+            memory_format: Layout of the encoder's real inputs; compiled graphs
+                are specialized on strides, so warm-up inputs must match it
+            
+        Returns:
+            The torch.compile mode used, or None if the encoder was left eager
+        """
+        if not settings.TORCH_COMPILE or self.device == "mps" or "quantization_config" in load_kwargs:
+            return None
+        
+        mode = "reduce-overhead" if self.device == "cuda" and example_input is not None else "default"
+        encoder.forward = torch.compile(encoder.forward, mode=mode, dynamic=example_input is None)
+        
+        if example_input is not None:
+            with torch.inference_mode(), get_autocast_context(self.device):
+                for batch_size in batch_sizes:
+                    encoder(example_input.expand(batch_size, *example_input.shape[1:]).contiguous(memory_format=memory_format))
+        
+        logger.info(f"{type(encoder).__name__} compiled with torch.compile (mode={mode})")
+        return mode
+    
     async def initialize_models(self):
         """Initialize all required models."""
         logger.info("Starting model initialization...")
@@ -71,7 +279,11 @@ class ModelLoader:
             raise
     
     async def _load_text_summarizer(self):
-        """Load text summarization model with optional LoRA adapter."""
+        """Load text summarization model with optional LoRA adapter.
+        
+        The weights are loaded through ``text_summariser`` so the model
+        ``TextSummarizer`` serves is the one quantized and compiled here.
+        """
         config = MODEL_CONFIGS["text_summarizer"]
         model_name = config["model_name"]
         lora_adapter = config["lora_adapter"]
@@ -79,20 +291,20 @@ class ModelLoader:
         logger.info(f"Loading text summarizer: {model_name}")
         
         try:
-            # Load base model without adapter for now
-            from transformers import AutoModelForSeq2SeqLM
-            model = AutoModelForSeq2SeqLM.from_pretrained(
-                model_name,
-                cache_dir=self.cache_dir,
-                torch_dtype=torch.float16 if self.device != "cpu" else torch.float32
-            ).to(self.device)
-            
-            tokenizer = AutoTokenizer.from_pretrained(
+            from . import text_summariser
+            load_kwargs = self._load_kwargs()
+            tokenizer, model = text_summariser.load_model_and_tokenizer(
                 model_name,
-                cache_dir=self.cache_dir
+                lora_adapter or text_summariser.LORA_PATH,
+                load_kwargs=load_kwargs
             )
             
+            compile_mode = self._compile_encoder(model.get_encoder(), load_kwargs)
+            
             self.models["text_summarizer"] = model
+            if compile_mode:
+                self.compile_modes["text_summarizer"] = compile_mode
+            self.compute_types["text_summarizer"] = self._compute_type(load_kwargs)
             self.tokenizers["text_summarizer"] = tokenizer
             
             logger.info("Text summarizer loaded successfully")
@@ -112,18 +324,33 @@ class ModelLoader:
         try:
             # Load base model without adapter for now
             from transformers import BlipForConditionalGeneration, BlipProcessor
-            model = BlipForConditionalGeneration.from_pretrained(
-                model_name,
-                cache_dir=self.cache_dir,
-                torch_dtype=torch.float16 if self.device != "cpu" else torch.float32
-            ).to(self.device)
+            load_kwargs = self._load_kwargs()
+            model = self._place(BlipForConditionalGeneration.from_pretrained(model_name, **load_kwargs), load_kwargs)
+            model.eval()
+            if "quantization_config" not in load_kwargs:
+                # Pixel batches arrive NHWC-strided from the captioner's preprocessing;
+                # matching the patch-embedding conv avoids a weight relayout per call
+                model.vision_model.to(memory_format=torch.channels_last)
             
             processor = BlipProcessor.from_pretrained(
                 model_name,
-                cache_dir=self.cache_dir
+                cache_dir=self.cache_dir,
+                use_fast=True
+            )
+            
+            size = processor.image_processor.size
+            compile_mode = self._compile_encoder(
+                model.vision_model,
+                load_kwargs,
+                torch.zeros(1, 3, size["height"], size["width"], dtype=model.dtype, device=self.device),
+                batch_buckets(settings.MAX_INFERENCE_BATCH_SIZE),
+                memory_format=torch.channels_last
             )
             
             self.models["image_captioner"] = model
+            if compile_mode:
+                self.compile_modes["image_captioner"] = compile_mode
+            self.compute_types["image_captioner"] = self._compute_type(load_kwargs)
             self.processors["image_captioner"] = processor
             
             logger.info("Image captioner loaded successfully")
@@ -142,18 +369,39 @@ class ModelLoader:
         try:
             from transformers import WhisperForConditionalGeneration, WhisperProcessor
             
-            model = WhisperForConditionalGeneration.from_pretrained(
-                model_name,
-                cache_dir=self.cache_dir,
-                torch_dtype=torch.float16 if self.device != "cpu" else torch.float32
-            ).to(self.device)
+            load_kwargs = self._load_kwargs()
+            model = self._place(WhisperForConditionalGeneration.from_pretrained(model_name, **load_kwargs), load_kwargs)
+            model.eval()
             
             processor = WhisperProcessor.from_pretrained(
                 model_name,
                 cache_dir=self.cache_dir
             )
             
+            # Run linear layers as int8 GEMMs on CPU; GPU deployments keep FP16
+            compute_type = self._compute_type(load_kwargs)
+            if self.device == "cpu" and settings.CPU_INT8_QUANTIZATION:
+                model = torch.ao.quantization.quantize_dynamic(
+                    model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+                compute_type = "int8"
+                logger.info("Whisper linear layers quantized to int8")
+            
+            # Whisper always encodes a fixed [n_mels, 3000] log-mel window; AudioASR
+            # pads batches to these buckets so only a few shapes are ever captured.
+            # Its log-mel features stay float32 (autocast handles FP16), so warm up
+            # with float32 too or the first real batch would recompile
+            compile_mode = self._compile_encoder(
+                model.model.encoder,
+                load_kwargs,
+                torch.zeros(1, model.config.num_mel_bins, 3000, dtype=torch.float32, device=self.device),
+                batch_buckets(settings.MAX_INFERENCE_BATCH_SIZE)
+            )
+            
             self.models["audio_asr"] = model
+            if compile_mode:
+                self.compile_modes["audio_asr"] = compile_mode
+            self.compute_types["audio_asr"] = compute_type
             self.processors["audio_asr"] = processor
             
             logger.info("Audio ASR loaded successfully")
@@ -174,7 +422,9 @@ class ModelLoader:
         """Get a processor by model type."""
         return self.processors.get(model_type)
     
-
+    def add_reload_callback(self, callback: Callable[[], None]):
+        """Register a callback run whenever loaded models are replaced or dropped."""
+        self.reload_callbacks.append(callback)
     
     async def cleanup(self):
         """Clean up models and free memory."""
@@ -184,6 +434,10 @@ class ModelLoader:
         self.models.clear()
         self.tokenizers.clear()
         self.processors.clear()
+        self.compute_types.clear()
+        self.compile_modes.clear()
+        for callback in self.reload_callbacks:
+            callback()
         
         # Clear memory
         clear_memory()
@@ -199,10 +453,12 @@ class ModelLoader:
         }
         
         if torch.cuda.is_available() and self.device == "cuda":
+            free, total = torch.cuda.mem_get_info()
             stats.update({
                 "gpu_memory_allocated": torch.cuda.memory_allocated(),
                 "gpu_memory_reserved": torch.cuda.memory_reserved(),
-                "gpu_memory_cached": torch.cuda.memory_cached()
+                "gpu_memory_free": free,
+                "gpu_memory_total": total
             })
         
         return stats
\ No newline at end of file
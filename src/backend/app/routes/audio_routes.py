@@ -3,15 +3,20 @@
 Provides endpoints for speech-to-text conversion and audio analysis.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from typing import Dict, Any, List, Optional
 import logging
-import io
+import time
+import orjson
 from ..dependencies import (
     get_audio_asr,
-    validate_audio_file,
+    validate_audio_content_type,
     check_rate_limit,
-    get_settings
+    get_settings,
+    looks_like_audio,
+    sniff_upload,
+    stream_upload,
+    utc_timestamp
 )
 from ..models.audio_asr import AudioASR
 from ..schemas.audio_schemas import (
@@ -19,14 +24,53 @@ from ..schemas.audio_schemas import (
     SpeechToTextResponse,
     BatchAudioRequest,
     BatchAudioResponse,
+    BatchAudioResult,
+    BatchAudioStats,
     AudioUploadResponse,
     AudioTranslationRequest,
-    AudioTranslationResponse
+    AudioTranslationResponse,
+    WordTimestamp,
+    construct_trusted
 )
 from ..config import Settings
 
 logger = logging.getLogger(__name__)
 
+# Common languages supported by Whisper, serialized once at import
+_SUPPORTED_LANGUAGES_JSON = orjson.dumps({
+    "codes": [
+        "en", "es", "fr", "de", "it", "pt", "ru", "ja", "ko", "zh",
+        "ar", "hi", "tr", "pl", "nl", "sv", "da", "no", "fi", "cs"
+    ],
+    "names": [
+        "English", "Spanish", "French", "German", "Italian", "Portuguese",
+        "Russian", "Japanese", "Korean", "Chinese", "Arabic", "Hindi",
+        "Turkish", "Polish", "Dutch", "Swedish", "Danish", "Norwegian",
+        "Finnish", "Czech"
+    ]
+})
+
+
+def _word_timestamps(result: Dict[str, Any]) -> List[WordTimestamp]:
+    """Convert ``AudioASR`` word timings to response timestamps.
+    
+    Whisper has no per-word confidence, so each word carries the clip's.
+    """
+    return [
+        WordTimestamp(word=word["word"], start=word["start"], end=word["end"], confidence=result["confidence"])
+        for word in result.get("timestamps", [])
+    ]
+
+
+def _validate_audio_part_type(content_type: Optional[str]):
+    """Basic audio file validation on the declared content type."""
+    if not content_type or not content_type.startswith('audio/'):
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid audio file format"
+        )
+
+
 router = APIRouter(
     prefix="/audio",
     tags=["audio processing"]
@@ -35,16 +79,15 @@ router = APIRouter(
 
 @router.post("/upload", response_model=AudioUploadResponse)
 async def upload_audio(
-    file: UploadFile = File(...),
+    request: Request,
     _: None = Depends(check_rate_limit),
-    _validated: UploadFile = Depends(validate_audio_file),
     settings: Settings = Depends(get_settings)
 ) -> AudioUploadResponse:
     """Upload and validate an audio file.
     
-    Args:
-        file: Uploaded audio file
-        
+    The multipart body is streamed; the audio file is expected in the
+    ``file`` field.
+    
     Returns:
         AudioUploadResponse with file information
         
@@ -52,25 +95,28 @@ async def upload_audio(
         HTTPException: If file upload or validation fails
     """
     try:
-        # Read file contents
-        contents = await file.read()
+        # Validate the declared type from the part headers, then keep only
+        # the leading bytes; the rest of the body is counted, not buffered
+        upload = await sniff_upload(request, validate_content_type=_validate_audio_part_type)
+        size_bytes = upload.size
         
-        # Basic audio file validation
-        if not file.content_type or not file.content_type.startswith('audio/'):
+        if not looks_like_audio(upload.data.tobytes()):
             raise HTTPException(
                 status_code=400,
-                detail="Invalid audio file format"
+                detail="File content does not match an audio format"
             )
         
-        logger.info(f"Audio uploaded successfully: {file.filename}, size: {len(contents)} bytes")
+        logger.info(f"Audio uploaded successfully: {upload.filename}, size: {size_bytes} bytes")
         
         return AudioUploadResponse(
-            filename=file.filename,
-            size_bytes=len(contents),
-            content_type=file.content_type,
+            filename=upload.filename,
+            size_bytes=size_bytes,
+            content_type=upload.content_type,
             message="Audio file uploaded and validated successfully"
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error uploading audio: {str(e)}")
         raise HTTPException(
@@ -81,26 +127,25 @@ async def upload_audio(
 
 @router.post("/speech-to-text", response_model=SpeechToTextResponse)
 async def speech_to_text(
-    file: UploadFile = File(...),
+    request: Request,
     language: Optional[str] = None,
     task: Optional[str] = "transcribe",
     temperature: Optional[float] = 0.0,
     word_timestamps: Optional[bool] = False,
-    background_tasks: BackgroundTasks = BackgroundTasks(),
     asr: AudioASR = Depends(get_audio_asr),
     _: None = Depends(check_rate_limit),
-    _validated: UploadFile = Depends(validate_audio_file),
     settings: Settings = Depends(get_settings)
 ) -> SpeechToTextResponse:
     """Convert speech in audio file to text.
     
+    The multipart body is streamed; the audio file is expected in the
+    ``file`` field.
+    
     Args:
-        file: Uploaded audio file
         language: Language code (e.g., 'en', 'es', 'fr')
         task: Task type ('transcribe' or 'translate')
         temperature: Sampling temperature (0.0 to 1.0)
         word_timestamps: Whether to include word-level timestamps
-        background_tasks: FastAPI background tasks
         asr: Audio ASR model instance
         
     Returns:
@@ -110,64 +155,41 @@ async def speech_to_text(
         HTTPException: If transcription fails
     """
     try:
-        logger.info(f"Processing speech-to-text for file: {file.filename}")
-        
-        # Read audio file
-        contents = await file.read()
-        
-        # Validate file size
-        if len(contents) > settings.MAX_AUDIO_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Audio file size exceeds maximum allowed size of {settings.MAX_AUDIO_SIZE} bytes"
+        start_time = time.perf_counter()
+        
+        # Stream audio file into a pooled buffer and transcribe it
+        async with stream_upload(request) as parts:
+            upload = parts[0]
+            validate_audio_content_type(upload.content_type)
+            logger.info(f"Processing speech-to-text for file: {upload.filename}")
+            result = await asr.transcribe(
+                audio_input=upload.data,
+                language=language,
+                task=task,
+                return_timestamps=bool(word_timestamps),
+                temperature=temperature or 0.0
             )
         
-        # Convert to audio format that the model can process
-        audio_data = io.BytesIO(contents)
-        
-        # Transcribe audio
-        result = await asr.transcribe(
-            audio_input=audio_data,
-            language=language,
-            task=task,
-            temperature=temperature,
-            word_timestamps=word_timestamps
-        )
-        
-        # Extract transcription and metadata
-        if isinstance(result, dict):
-            transcription = result.get('text', '')
-            detected_language = result.get('language', language or 'unknown')
-            confidence = result.get('confidence', 0.0)
-            segments = result.get('segments', [])
-            words = result.get('words', [])
-        else:
-            transcription = str(result)
-            detected_language = language or 'unknown'
-            confidence = 0.8  # Default confidence
-            segments = []
-            words = []
-        
-        # Calculate duration estimate (rough)
-        duration_estimate = len(contents) / (16000 * 2)  # Assuming 16kHz, 16-bit audio
+        transcription = result["transcription"]
         
         # Log successful processing
-        background_tasks.add_task(
-            logger.info,
-            f"Successfully transcribed {file.filename}: {len(transcription)} characters"
-        )
+        logger.info(f"Successfully transcribed {upload.filename}: {len(transcription)} characters")
         
         return SpeechToTextResponse(
-            transcription=transcription,
-            filename=file.filename,
-            detected_language=detected_language,
-            confidence=confidence,
-            duration_seconds=duration_estimate,
-            segments=segments,
-            words=words if word_timestamps else [],
-            model_info=asr.get_model_info()
+            text=transcription,
+            original_text=transcription,
+            language=result["language"],
+            confidence=result["confidence"],
+            task=result["task"],
+            text_length=len(transcription),
+            word_count=len(transcription.split()),
+            processing_time_seconds=time.perf_counter() - start_time,
+            timestamp=utc_timestamp(),
+            word_timestamps=_word_timestamps(result) if word_timestamps else None
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in speech-to-text: {str(e)}")
         raise HTTPException(
@@ -178,22 +200,21 @@ async def speech_to_text(
 
 @router.post("/translate", response_model=AudioTranslationResponse)
 async def translate_speech(
-    file: UploadFile = File(...),
+    request: Request,
     target_language: Optional[str] = "en",
     temperature: Optional[float] = 0.0,
-    background_tasks: BackgroundTasks = BackgroundTasks(),
     asr: AudioASR = Depends(get_audio_asr),
     _: None = Depends(check_rate_limit),
-    _validated: UploadFile = Depends(validate_audio_file),
     settings: Settings = Depends(get_settings)
 ) -> AudioTranslationResponse:
     """Translate speech in audio file to target language.
     
+    The multipart body is streamed; the audio file is expected in the
+    ``file`` field.
+    
     Args:
-        file: Uploaded audio file
         target_language: Target language code (default: 'en')
         temperature: Sampling temperature (0.0 to 1.0)
-        background_tasks: FastAPI background tasks
         asr: Audio ASR model instance
         
     Returns:
@@ -203,57 +224,37 @@ async def translate_speech(
         HTTPException: If translation fails
     """
     try:
-        logger.info(f"Processing speech translation for file: {file.filename}")
-        
-        # Read audio file
-        contents = await file.read()
-        
-        # Validate file size
-        if len(contents) > settings.MAX_AUDIO_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Audio file size exceeds maximum allowed size of {settings.MAX_AUDIO_SIZE} bytes"
+        start_time = time.perf_counter()
+        
+        # Stream audio file into a pooled buffer and translate it (transcribe + translate)
+        async with stream_upload(request) as parts:
+            upload = parts[0]
+            validate_audio_content_type(upload.content_type)
+            logger.info(f"Processing speech translation for file: {upload.filename}")
+            result = await asr.transcribe(
+                audio_input=upload.data,
+                task="translate",
+                temperature=temperature or 0.0
             )
         
-        # Convert to audio format
-        audio_data = io.BytesIO(contents)
-        
-        # Translate audio (transcribe + translate)
-        result = await asr.transcribe(
-            audio_input=audio_data,
-            task="translate",
-            temperature=temperature
-        )
-        
-        # Extract translation and metadata
-        if isinstance(result, dict):
-            translation = result.get('text', '')
-            detected_language = result.get('language', 'unknown')
-            confidence = result.get('confidence', 0.0)
-        else:
-            translation = str(result)
-            detected_language = 'unknown'
-            confidence = 0.8
-        
-        # Calculate duration estimate
-        duration_estimate = len(contents) / (16000 * 2)
+        translation = result["transcription"]
         
         # Log successful processing
-        background_tasks.add_task(
-            logger.info,
-            f"Successfully translated {file.filename}: {len(translation)} characters"
-        )
+        logger.info(f"Successfully translated {upload.filename}: {len(translation)} characters")
         
         return AudioTranslationResponse(
-            translation=translation,
-            filename=file.filename,
-            source_language=detected_language,
+            translated_text=translation,
+            source_language=result["language"],
             target_language=target_language,
-            confidence=confidence,
-            duration_seconds=duration_estimate,
-            model_info=asr.get_model_info()
+            confidence=result["confidence"],
+            translation_length=len(translation),
+            word_count=len(translation.split()),
+            processing_time_seconds=time.perf_counter() - start_time,
+            timestamp=utc_timestamp()
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in speech translation: {str(e)}")
         raise HTTPException(
@@ -264,23 +265,23 @@ async def translate_speech(
 
 @router.post("/batch-transcribe", response_model=BatchAudioResponse)
 async def batch_transcribe(
-    files: List[UploadFile] = File(...),
+    request: Request,
     language: Optional[str] = None,
     task: Optional[str] = "transcribe",
     temperature: Optional[float] = 0.0,
-    background_tasks: BackgroundTasks = BackgroundTasks(),
     asr: AudioASR = Depends(get_audio_asr),
     _: None = Depends(check_rate_limit),
     settings: Settings = Depends(get_settings)
 ) -> BatchAudioResponse:
     """Transcribe multiple audio files in a single request.
     
+    The multipart body is streamed; the audio files are expected as
+    repeated ``files`` fields.
+    
     Args:
-        files: List of uploaded audio files
         language: Language code for all files
         task: Task type ('transcribe' or 'translate')
         temperature: Sampling temperature
-        background_tasks: FastAPI background tasks
         asr: Audio ASR model instance
         
     Returns:
@@ -290,91 +291,112 @@ async def batch_transcribe(
         HTTPException: If batch processing fails
     """
     try:
-        logger.info(f"Processing batch transcription for {len(files)} audio files")
-        
-        # Validate batch size
-        if len(files) > settings.MAX_BATCH_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Batch size exceeds maximum allowed size of {settings.MAX_BATCH_SIZE}"
-            )
-        
-        transcriptions = []
-        failed_indices = []
-        
-        # Process each audio file
-        for i, file in enumerate(files):
-            try:
-                # Validate file
-                if not file.content_type or not file.content_type.startswith('audio/'):
-                    raise ValueError(f"Invalid file type: {file.content_type}")
-                
-                # Read audio file
-                contents = await file.read()
-                if len(contents) > settings.MAX_AUDIO_SIZE:
-                    raise ValueError(f"File size exceeds maximum allowed size")
-                
-                # Convert to audio format
-                audio_data = io.BytesIO(contents)
-                
-                # Transcribe audio
-                result = await asr.transcribe(
-                    audio_input=audio_data,
-                    language=language,
-                    task=task,
-                    temperature=temperature
+        start_time = time.perf_counter()
+        
+        # Stream every file into one buffer; oversized files are dropped while
+        # streaming and reported individually rather than failing the batch
+        async with stream_upload(
+            request,
+            field="files",
+            max_size=settings.MAX_FILE_SIZE * settings.MAX_BATCH_SIZE,
+            part_max_size=settings.MAX_FILE_SIZE
+        ) as files:
+            logger.info(f"Processing batch transcription for {len(files)} audio files")
+            
+            # Validate batch size
+            if len(files) > settings.MAX_BATCH_SIZE:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Batch size exceeds maximum allowed size of {settings.MAX_BATCH_SIZE}"
                 )
-                
-                # Extract transcription
-                if isinstance(result, dict):
-                    transcription = result.get('text', '')
-                    detected_language = result.get('language', language or 'unknown')
-                    confidence = result.get('confidence', 0.0)
+            
+            # Validate each file, routing rejects straight to the failure list
+            results: List[Optional[Dict[str, Any]]] = [None] * len(files)
+            valid = []
+            for i, file in enumerate(files):
+                if not file.content_type or not file.content_type.startswith('audio/'):
+                    error = f"Invalid file type: {file.content_type}"
+                elif file.size > settings.MAX_FILE_SIZE:
+                    error = f"File exceeds maximum allowed size {settings.MAX_FILE_SIZE} bytes"
                 else:
-                    transcription = str(result)
-                    detected_language = language or 'unknown'
-                    confidence = 0.8
-                
-                duration_estimate = len(contents) / (16000 * 2)
-                
-                transcriptions.append({
-                    "index": i,
-                    "filename": file.filename,
-                    "transcription": transcription,
-                    "detected_language": detected_language,
-                    "confidence": confidence,
-                    "duration_seconds": duration_estimate
-                })
+                    valid.append(i)
+                    continue
+                results[i] = {"error": error}
+            
+            # Transcribe every valid file with batched model forward passes
+            outputs = await asr.batch_transcribe(
+                audio_inputs=[files[i].data for i in valid],
+                language=language,
+                task=task,
+                temperature=temperature or 0.0
+            )
+            for i, output in zip(valid, outputs):
+                results[i] = output
+            
+            # Files are transcribed together, so each one is charged an equal share of the batch
+            total_processing_time = time.perf_counter() - start_time
+            per_file_time = total_processing_time / len(files) if files else 0.0
+            
+            # Results come from the model, not the client, so they are built
+            # without validation and encoded once below
+            batch_results: List[Optional[BatchAudioResult]] = [None] * len(files)
+            successful_count = 0
+            total_duration = 0.0
+            total_text_length = 0
+            total_confidence = 0.0
+            for i, (file, result) in enumerate(zip(files, results)):
+                if result.get("error") is not None:
+                    logger.warning(f"Failed to transcribe audio {i+1} ({file.filename}): {result['error']}")
+                    batch_results[i] = construct_trusted(
+                        BatchAudioResult, index=i, status="failed", error=result["error"]
+                    )
+                    continue
                 
-            except Exception as e:
-                logger.warning(f"Failed to transcribe audio {i+1} ({file.filename}): {str(e)}")
-                failed_indices.append(i)
-                transcriptions.append({
-                    "index": i,
-                    "filename": file.filename,
-                    "transcription": None,
-                    "error": str(e),
-                    "detected_language": "unknown",
-                    "confidence": 0,
-                    "duration_seconds": 0
-                })
+                text = result["transcription"]
+                batch_results[i] = construct_trusted(
+                    BatchAudioResult,
+                    index=i,
+                    status="success",
+                    text=text,
+                    language=result.get("language", language or "unknown"),
+                    confidence=result.get("confidence", 0.0),
+                    text_length=len(text),
+                    word_count=len(text.split()),
+                    processing_time_seconds=per_file_time
+                )
+                successful_count += 1
+                total_duration += result["duration"]
+                total_text_length += len(text)
+                total_confidence += result.get("confidence", 0.0)
         
         # Log successful processing
-        background_tasks.add_task(
-            logger.info,
-            f"Batch transcription completed. Successful: {len(transcriptions) - len(failed_indices)}, Failed: {len(failed_indices)}"
+        logger.info(f"Batch transcription completed. Successful: {successful_count}, Failed: {len(files) - successful_count}")
+        
+        batch_stats = construct_trusted(
+            BatchAudioStats,
+            total_files=len(files),
+            successful_count=successful_count,
+            failed_count=len(files) - successful_count,
+            total_processing_time_seconds=total_processing_time,
+            total_audio_duration_seconds=total_duration,
+            average_processing_time=per_file_time,
+            average_text_length=total_text_length / successful_count if successful_count else 0.0,
+            average_confidence=total_confidence / successful_count if successful_count else 0.0,
+            throughput_files_per_second=successful_count / total_processing_time if total_processing_time > 0 else 0.0,
+            real_time_factor=total_processing_time / total_duration if total_duration > 0 else 0.0
         )
-        
-        return BatchAudioResponse(
-            transcriptions=transcriptions,
-            total_processed=len(files),
-            successful_count=len(transcriptions) - len(failed_indices),
-            failed_count=len(failed_indices),
-            failed_indices=failed_indices,
-            task=task,
-            model_info=asr.get_model_info()
+        response = construct_trusted(
+            BatchAudioResponse,
+            results=batch_results,
+            batch_stats=batch_stats,
+            timestamp=utc_timestamp()
         )
         
+        # Encode straight to JSON; response_model is kept for the OpenAPI schema only
+        return Response(content=orjson.dumps(response.model_dump()), media_type="application/json")
+        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in batch transcription: {str(e)}")
         raise HTTPException(
@@ -383,27 +405,14 @@ async def batch_transcribe(
         )
 
 
-@router.get("/supported-languages")
-async def get_supported_languages() -> Dict[str, List[str]]:
+@router.get("/supported-languages", response_model=Dict[str, List[str]])
+async def get_supported_languages() -> Response:
     """Get list of supported languages for speech recognition.
     
     Returns:
         Dict containing supported language codes and names
     """
-    # Common languages supported by Whisper
-    languages = {
-        "codes": [
-            "en", "es", "fr", "de", "it", "pt", "ru", "ja", "ko", "zh",
-            "ar", "hi", "tr", "pl", "nl", "sv", "da", "no", "fi", "cs"
-        ],
-        "names": [
-            "English", "Spanish", "French", "German", "Italian", "Portuguese",
-            "Russian", "Japanese", "Korean", "Chinese", "Arabic", "Hindi",
-            "Turkish", "Polish", "Dutch", "Swedish", "Danish", "Norwegian",
-            "Finnish", "Czech"
-        ]
-    }
-    return languages
+    return Response(content=_SUPPORTED_LANGUAGES_JSON, media_type="application/json")
 
 
 @router.get("/model-info")
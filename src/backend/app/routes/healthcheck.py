@@ -4,18 +4,50 @@ Provides endpoints for monitoring the health and status of the API service.
 """
 
 from fastapi import APIRouter, Depends
-from typing import Dict, Any
+from functools import cache
+from typing import Dict, Any, List
 import time
 import psutil
 import torch
 from ..dependencies import get_settings
 from ..config import Settings
 
+# Check once at import whether the model modules load; readiness probes just read the result
+try:
+    from ..models.text_summarizer import TextSummarizer
+    from ..models.image_captioning import ImageCaptioner
+    from ..models.audio_asr import AudioASR
+    _MODELS_IMPORTABLE = True
+    _IMPORT_ERROR = None
+except Exception as e:
+    _MODELS_IMPORTABLE = False
+    _IMPORT_ERROR = str(e)
+
 router = APIRouter(
     prefix="/health",
     tags=["health"]
 )
 
+# Prime the CPU counter so non-blocking cpu_percent() calls report usage since the previous call
+psutil.cpu_percent(interval=None)
+
+
+@cache
+def _gpu_static_info() -> List[Dict[str, Any]]:
+    """Device properties never change for the life of the process; query them once."""
+    if not torch.cuda.is_available():
+        return []
+    
+    devices = []
+    for i in range(torch.cuda.device_count()):
+        gpu_props = torch.cuda.get_device_properties(i)
+        devices.append({
+            "id": i,
+            "name": gpu_props.name,
+            "memory_total_gb": round(gpu_props.total_memory / (1024**3), 2)
+        })
+    return devices
+
 
 @router.get("/ping")
 async def ping() -> Dict[str, str]:
@@ -40,11 +72,12 @@ async def health_status(settings: Settings = Depends(get_settings)) -> Dict[str,
     """
     # Get system resources
     memory = psutil.virtual_memory()
-    cpu_percent = psutil.cpu_percent(interval=1)
+    cpu_percent = psutil.cpu_percent(interval=None)
     
     # Check GPU availability
-    gpu_available = torch.cuda.is_available()
-    gpu_count = torch.cuda.device_count() if gpu_available else 0
+    gpu_devices = _gpu_static_info()
+    gpu_available = bool(gpu_devices)
+    gpu_count = len(gpu_devices)
     
     status = {
         "status": "healthy",
@@ -69,17 +102,14 @@ async def health_status(settings: Settings = Depends(get_settings)) -> Dict[str,
         }
     }
     
-    # Add GPU device info if available
-    if gpu_available:
-        for i in range(gpu_count):
-            gpu_props = torch.cuda.get_device_properties(i)
-            status["gpu"]["devices"].append({
-                "id": i,
-                "name": gpu_props.name,
-                "memory_total_gb": round(gpu_props.total_memory / (1024**3), 2),
-                "memory_allocated_gb": round(torch.cuda.memory_allocated(i) / (1024**3), 2),
-                "memory_cached_gb": round(torch.cuda.memory_reserved(i) / (1024**3), 2)
-            })
+    # Add GPU device info if available; only the memory counters are re-queried
+    for device in gpu_devices:
+        i = device["id"]
+        status["gpu"]["devices"].append({
+            **device,
+            "memory_allocated_gb": round(torch.cuda.memory_allocated(i) / (1024**3), 2),
+            "memory_cached_gb": round(torch.cuda.memory_reserved(i) / (1024**3), 2)
+        })
     
     return status
 
@@ -94,12 +124,7 @@ async def readiness_check() -> Dict[str, Any]:
     Returns:
         Dict containing readiness status
     """
-    try:
-        # Check if models can be imported (basic readiness check)
-        from ..models.text_summarizer import TextSummarizer
-        from ..models.image_captioning import ImageCaptioner
-        from ..models.audio_asr import AudioASR
-        
+    if _MODELS_IMPORTABLE:
         return {
             "status": "ready",
             "timestamp": str(int(time.time())),
@@ -109,13 +134,13 @@ async def readiness_check() -> Dict[str, Any]:
                 "dependencies_loaded": True
             }
         }
-    except Exception as e:
-        return {
-            "status": "not_ready",
-            "timestamp": str(int(time.time())),
-            "message": f"Service is not ready: {str(e)}",
-            "checks": {
-                "models_importable": False,
-                "dependencies_loaded": False
-            }
-        }
\ No newline at end of file
+    
+    return {
+        "status": "not_ready",
+        "timestamp": str(int(time.time())),
+        "message": f"Service is not ready: {_IMPORT_ERROR}",
+        "checks": {
+            "models_importable": False,
+            "dependencies_loaded": False
+        }
+    }
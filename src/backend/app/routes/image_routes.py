@@ -4,36 +4,83 @@ Provides endpoints for image captioning and object detection.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, UploadFile, File
-from typing import Dict, Any, List, Optional
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, BinaryIO, Dict, Any, List, Optional
+import asyncio
 import logging
+import orjson
 from PIL import Image
-import io
-from datetime import datetime
 import time
 from ..dependencies import (
     validate_image_file,
     check_rate_limit,
     get_settings,
-    get_image_captioner
+    get_image_captioner,
+    utc_timestamp
 )
-from ..models.image_captioning import ImageCaptioner
+from ..models.image_captioning import ImageCaptioner, decode_image
+from ..models.utils import ResultCache, run_with_retry
 from ..schemas.image_schemas import (
     ImageCaptioningRequest,
     ImageCaptioningResponse,
     VisualQuestionAnsweringRequest,
     VisualQuestionAnsweringResponse,
     BatchImageRequest,
-    BatchImageResponse,
     BatchImageResult,
     BatchImageStats,
     ImageProperties,
     ImageUploadResponse,
-    ImageDescriptionResponse
+    ImageDescriptionResponse,
+    ImageAnalysisResponse
 )
 from ..config import Settings
 
 logger = logging.getLogger(__name__)
 
+# Bounds concurrent model calls so a burst of requests cannot exhaust device memory
+_MODEL_SEMAPHORE = asyncio.Semaphore(get_settings().MAX_CONCURRENT_REQUESTS)
+
+# Captions for byte-identical uploads (client retries, duplicate submissions)
+_CAPTION_CACHE = ResultCache()
+
+# Focus areas described for each /describe detail level
+_DETAIL_LEVEL_FOCUS_AREAS = {
+    "basic": ["general"],
+    "medium": ["general", "objects", "scene"],
+    "detailed": ["general", "objects", "scene", "colors", "people", "activities"]
+}
+
+
+def _open_image_upload(file: UploadFile, max_size: int) -> BinaryIO:
+    """Validate one batch upload's declared type and size, returning its spooled file.
+    
+    Nothing is read here; the captioner decodes straight from the file.
+    """
+    if not file.content_type or not file.content_type.startswith('image/'):
+        raise ValueError(f"Invalid file type: {file.content_type}")
+    if file.size is not None and file.size > max_size:
+        raise ValueError("File size exceeds maximum allowed size")
+    
+    file.file.seek(0)
+    return file.file
+
+
+def _image_properties(image_info: Dict[str, Any], size_bytes: Optional[int]) -> ImageProperties:
+    """Build response image properties from a captioner result's ``image_info``."""
+    width, height = image_info["width"], image_info["height"]
+    return ImageProperties(
+        width=width,
+        height=height,
+        channels=len(image_info["mode"]),
+        format=image_info["format"] or "Unknown",
+        file_size_bytes=size_bytes or 0,
+        aspect_ratio=round(width / height, 3) if height else 0.0,
+        color_mode=image_info["mode"],
+        has_transparency=False,  # Decoded to RGB for the model
+        is_animated=False
+    )
+
+
 router = APIRouter(
     prefix="/image",
     tags=["image processing"]
@@ -59,9 +106,9 @@ async def upload_image(
         HTTPException: If file upload or validation fails
     """
     try:
-        # Read and validate image
-        contents = await file.read()
-        image = Image.open(io.BytesIO(contents))
+        # Parse only the image header straight from Starlette's spooled upload;
+        # the pixels are never decoded and the body is never copied into memory
+        image = Image.open(file.file)
         
         # Get image info
         width, height = image.size
@@ -72,7 +119,7 @@ async def upload_image(
         
         return ImageUploadResponse(
             filename=file.filename,
-            size_bytes=len(contents),
+            size_bytes=file.size,
             width=width,
             height=height,
             format=format_type,
@@ -119,23 +166,27 @@ async def caption_image(
         HTTPException: If captioning fails
     """
     try:
+        start_time = time.perf_counter()
         logger.info(f"Processing image captioning for file: {file.filename}")
         
-        # Read and process image
+        # Read image; repeated uploads of the same bytes reuse the cached caption
         contents = await file.read()
-        image = Image.open(io.BytesIO(contents))
-        
-        # Generate caption
-        caption = await captioner.caption_image(
-            image=image,
-            max_length=max_length,
-            min_length=min_length,
-            use_lora=use_lora,
-            lora_adapter=lora_adapter
-        )
-        
-        # Get image dimensions
-        width, height = image.size
+        cache_key = ResultCache.key(contents, max_length, min_length)
+        caption = _CAPTION_CACHE.get(cache_key)
+        
+        if caption is None:
+            image = await asyncio.get_running_loop().run_in_executor(None, decode_image, contents)
+            
+            # Generate caption; concurrent requests are batched into one generate call
+            async with _MODEL_SEMAPHORE:
+                result = await run_with_retry(
+                    captioner.caption_image,
+                    image_input=image,
+                    max_length=max_length,
+                    min_length=min_length
+                )
+            caption = result["caption"]
+            _CAPTION_CACHE.set(cache_key, caption)
         
         # Log successful processing
         background_tasks.add_task(
@@ -148,8 +199,8 @@ async def caption_image(
             original_caption=caption,
             confidence=0.85,
             caption_length=len(caption),
-            processing_time_seconds=0.5,  # Placeholder
-            timestamp=datetime.utcnow().isoformat()
+            processing_time_seconds=time.perf_counter() - start_time,
+            timestamp=utc_timestamp()
         )
         
     except Exception as e:
@@ -191,6 +242,7 @@ async def visual_question_answering(
         HTTPException: If VQA processing fails
     """
     try:
+        start_time = time.perf_counter()
         if not question.strip():
             raise HTTPException(
                 status_code=400,
@@ -199,21 +251,23 @@ async def visual_question_answering(
         
         logger.info(f"Processing VQA for file: {file.filename}, question: {question[:50]}...")
         
-        # Read and process image
-        contents = await file.read()
-        image = Image.open(io.BytesIO(contents))
-        
-        # Generate answer using VQA
-        answer = await captioner.visual_question_answering(
-            image=image,
-            question=question,
-            max_length=max_length,
-            use_lora=use_lora,
-            lora_adapter=lora_adapter
-        )
+        # Decode straight from the spooled upload, already size-checked from
+        # file.size, without copying its bytes into memory first
+        file.file.seek(0)
+        image = await asyncio.get_running_loop().run_in_executor(None, decode_image, file.file)
+        
+        # Generate answer using VQA; concurrent questions are batched like captions
+        async with _MODEL_SEMAPHORE:
+            result = await run_with_retry(
+                captioner.visual_question_answering,
+                image_input=image,
+                question=question,
+                max_length=max_length
+            )
+        answer = result["answer"]
         
-        # Get image dimensions
-        width, height = image.size
+        # Get image dimensions, as uploaded rather than as downscaled for the model
+        width, height = image.info["original_size"]
         
         # Calculate confidence (simplified)
         confidence = min(0.9, max(0.3, len(answer) / 50))
@@ -229,8 +283,8 @@ async def visual_question_answering(
             confidence=confidence,
             question_length=len(question),
             answer_length=len(answer),
-            processing_time_seconds=0.5,  # Placeholder
-            timestamp=datetime.utcnow().isoformat()
+            processing_time_seconds=time.perf_counter() - start_time,
+            timestamp=utc_timestamp()
         )
         
     except Exception as e:
@@ -241,19 +295,22 @@ async def visual_question_answering(
         )
 
 
-@router.post("/batch-caption", response_model=BatchImageResponse)
+@router.post("/batch-caption", response_class=StreamingResponse)
 async def batch_caption_images(
     files: List[UploadFile] = File(...),
     max_length: Optional[int] = 50,
     min_length: Optional[int] = 10,
     use_lora: Optional[bool] = False,
     lora_adapter: Optional[str] = None,
-    background_tasks: BackgroundTasks = BackgroundTasks(),
     captioner: ImageCaptioner = Depends(get_image_captioner),
     _: None = Depends(check_rate_limit),
     settings: Settings = Depends(get_settings)
-) -> BatchImageResponse:
-    """Generate captions for multiple uploaded images.
+) -> StreamingResponse:
+    """Generate captions for multiple uploaded images, streamed as NDJSON.
+    
+    Each line is a ``BatchImageResult``, written as soon as that image's batch
+    finishes, so clients can render progressively. The final line carries the
+    ``batch_stats`` and ``timestamp`` of a ``BatchImageResponse``.
     
     Args:
         files: List of uploaded image files
@@ -261,16 +318,16 @@ async def batch_caption_images(
         min_length: Minimum caption length
         use_lora: Whether to use LoRA adapter
         lora_adapter: Specific LoRA adapter name
-        background_tasks: FastAPI background tasks
         captioner: Image captioner model instance
         
     Returns:
-        BatchImageResponse containing all captions
+        StreamingResponse of newline-delimited JSON results
         
     Raises:
         HTTPException: If batch processing fails
     """
     try:
+        start_time = time.perf_counter()
         logger.info(f"Processing batch captioning for {len(files)} images")
         
         # Validate batch size
@@ -280,121 +337,84 @@ async def batch_caption_images(
                 detail=f"Batch size exceeds maximum allowed size of {settings.MAX_BATCH_SIZE}"
             )
         
-        captions = []
-        failed_indices = []
-        
-        # Process each image
+        # Validate every upload, routing rejects straight to the failure list
+        rejected = []
+        valid = []
+        images = []
         for i, file in enumerate(files):
             try:
-                # Validate file
-                if not file.content_type or not file.content_type.startswith('image/'):
-                    raise ValueError(f"Invalid file type: {file.content_type}")
-                
-                # Read and process image
-                contents = await file.read()
-                if len(contents) > settings.MAX_FILE_SIZE:
-                    raise ValueError(f"File size exceeds maximum allowed size")
-                
-                image = Image.open(io.BytesIO(contents))
-                
-                # Generate caption
-                caption = await captioner.caption_image(
-                    image=image,
-                    max_length=max_length,
-                    min_length=min_length,
-                    use_lora=use_lora,
-                    lora_adapter=lora_adapter
-                )
-                
-                width, height = image.size
-                
-                captions.append({
-                    "index": i,
-                    "filename": file.filename,
-                    "caption": caption,
-                    "image_width": width,
-                    "image_height": height,
-                    "confidence": 0.85
-                })
-                
-            except Exception as e:
-                logger.warning(f"Failed to caption image {i+1} ({file.filename}): {str(e)}")
-                failed_indices.append(i)
-                captions.append({
-                    "index": i,
-                    "filename": file.filename,
-                    "caption": None,
-                    "error": str(e),
-                    "image_width": 0,
-                    "image_height": 0,
-                    "confidence": 0
-                })
+                images.append(_open_image_upload(file, settings.MAX_FILE_SIZE))
+                valid.append(i)
+            except ValueError as e:
+                rejected.append((i, str(e)))
         
-        # Log successful processing
-        background_tasks.add_task(
-            logger.info,
-            f"Batch captioning completed. Successful: {len(captions) - len(failed_indices)}, Failed: {len(failed_indices)}"
+    except Exception as e:
+        logger.error(f"Error in batch captioning: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to process batch captioning: {str(e)}"
         )
-        
-        # Convert captions to BatchImageResult format
-        results = []
-        total_processing_time = 0.0
+    
+    async def stream_results() -> AsyncIterator[bytes]:
+        successful_count = 0
         total_caption_length = 0
         total_confidence = 0.0
-        successful_count = 0
         
-        for caption_data in captions:
-            if caption_data.get('caption'):
-                result = BatchImageResult(
-                    index=caption_data['index'],
-                    status="success",
-                    caption=caption_data['caption'],
-                    confidence=caption_data['confidence'],
-                    caption_length=len(caption_data['caption']),
-                    processing_time_seconds=1.0,  # Placeholder
-                    image_properties=ImageProperties(
-                        width=caption_data['image_width'],
-                        height=caption_data['image_height'],
-                        format="JPEG",  # Placeholder
-                        size_bytes=0  # Placeholder
+        for i, error in rejected:
+            logger.warning(f"Failed to caption image {i+1} ({files[i].filename}): {error}")
+            yield orjson.dumps(BatchImageResult(index=i, status="failed", error=error).model_dump()) + b"\n"
+        
+        # Decode each image from its spooled file in worker threads and caption
+        # them in batched forward passes, emitting every batch as it completes
+        async with _MODEL_SEMAPHORE:
+            async for j, output in captioner.iter_batch_caption(
+                images,
+                max_length=max_length,
+                min_length=min_length
+            ):
+                i = valid[j]
+                if output.get("error") is not None:
+                    logger.warning(f"Failed to caption image {i+1} ({files[i].filename}): {output['error']}")
+                    result = BatchImageResult(index=i, status="failed", error=output["error"])
+                else:
+                    caption = output["caption"]
+                    result = BatchImageResult(
+                        index=i,
+                        status="success",
+                        caption=caption,
+                        confidence=0.85,
+                        caption_length=len(caption),
+                        # Time until this image's result was ready
+                        processing_time_seconds=time.perf_counter() - start_time,
+                        image_properties=_image_properties(output["image_info"], files[i].size)
                     )
-                )
-                total_caption_length += len(caption_data['caption'])
-                total_confidence += caption_data['confidence']
-                successful_count += 1
-            else:
-                result = BatchImageResult(
-                    index=caption_data['index'],
-                    status="failed",
-                    error=caption_data.get('error', 'Unknown error')
-                )
-            results.append(result)
-            total_processing_time += 1.0  # Placeholder
+                    total_caption_length += len(caption)
+                    total_confidence += 0.85
+                    successful_count += 1
+                yield orjson.dumps(result.model_dump()) + b"\n"
+        
+        total_processing_time = time.perf_counter() - start_time
+        logger.info(
+            f"Batch captioning completed. Successful: {successful_count}, Failed: {len(files) - successful_count}"
+        )
         
         # Calculate batch statistics
         batch_stats = BatchImageStats(
             total_images=len(files),
             successful_count=successful_count,
-            failed_count=len(failed_indices),
+            failed_count=len(files) - successful_count,
             total_processing_time_seconds=total_processing_time,
             average_processing_time=total_processing_time / len(files) if len(files) > 0 else 0.0,
             average_caption_length=total_caption_length / successful_count if successful_count > 0 else 0.0,
             average_confidence=total_confidence / successful_count if successful_count > 0 else 0.0,
-            throughput_images_per_second=len(files) / total_processing_time if total_processing_time > 0 else 0.0
-        )
-        
-        return BatchImageResponse(
-            results=results,
-            batch_stats=batch_stats,
-            timestamp=datetime.now().isoformat()
-        )
-        
-    except Exception as e:
-        logger.error(f"Error in batch captioning: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Failed to process batch captioning: {str(e)}"
+            throughput_images_per_second=successful_count / total_processing_time if total_processing_time > 0 else 0.0
         )
+        yield orjson.dumps({
+            "batch_stats": batch_stats.model_dump(),
+            "timestamp": utc_timestamp()
+        }) + b"\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
 
 
 @router.post("/describe", response_model=ImageDescriptionResponse)
@@ -425,23 +445,23 @@ async def describe_image(
         HTTPException: If description generation fails
     """
     try:
-        start_time = time.time()
+        start_time = time.perf_counter()
         logger.info(f"Processing detailed description for file: {file.filename}")
         
-        # Read and process image
-        contents = await file.read()
-        image = Image.open(io.BytesIO(contents))
-        
-        # Generate detailed description
-        description = await captioner.detailed_description(
-            image=image,
-            detail_level=detail_level,
-            use_lora=use_lora,
-            lora_adapter=lora_adapter
-        )
-        
-        # Get image dimensions
-        width, height = image.size
+        # Decode straight from the spooled upload, already size-checked from
+        # file.size, without copying its bytes into memory first
+        file.file.seek(0)
+        image = await asyncio.get_running_loop().run_in_executor(None, decode_image, file.file)
+        
+        # Generate detailed description; concurrent requests share one vision pass
+        focus_areas = _DETAIL_LEVEL_FOCUS_AREAS.get(detail_level, _DETAIL_LEVEL_FOCUS_AREAS["medium"])
+        async with _MODEL_SEMAPHORE:
+            result = await run_with_retry(
+                captioner.describe_image_details,
+                image_input=image,
+                focus_areas=focus_areas
+            )
+        description = " ".join(result["detailed_descriptions"][area] for area in focus_areas)
         
         # Log successful processing
         background_tasks.add_task(
@@ -454,14 +474,10 @@ async def describe_image(
             description_type=detail_level,
             description_length=len(description),
             confidence=0.8,
-            processing_time_seconds=time.time() - start_time,
-            timestamp=datetime.now().isoformat(),
-            image_properties=ImageProperties(
-                width=width,
-                height=height,
-                channels=3,
-                format=file.content_type
-            )
+            processing_time_seconds=time.perf_counter() - start_time,
+            timestamp=utc_timestamp(),
+            # Dimensions as uploaded rather than as downscaled for the model
+            image_properties=_image_properties(result["image_info"], file.size)
         )
         
     except Exception as e:
@@ -472,6 +488,82 @@ async def describe_image(
         )
 
 
+@router.post("/analyze", response_model=ImageAnalysisResponse)
+async def analyze_image(
+    file: UploadFile = File(...),
+    detail_level: Optional[str] = "medium",
+    max_length: Optional[int] = 50,
+    min_length: Optional[int] = 10,
+    background_tasks: BackgroundTasks = BackgroundTasks(),
+    captioner: ImageCaptioner = Depends(get_image_captioner),
+    _: None = Depends(check_rate_limit),
+    _validated: UploadFile = Depends(validate_image_file)
+) -> ImageAnalysisResponse:
+    """Caption and describe an uploaded image in one request.
+    
+    Equivalent to calling /caption and /describe on the same file, but the
+    vision encoder runs once and both results decode from its output.
+    
+    Args:
+        file: Uploaded image file
+        detail_level: Level of detail (basic, medium, detailed)
+        max_length: Maximum caption length
+        min_length: Minimum caption length
+        background_tasks: FastAPI background tasks
+        captioner: Image captioner model instance
+        
+    Returns:
+        ImageAnalysisResponse containing the caption and description
+        
+    Raises:
+        HTTPException: If analysis fails
+    """
+    try:
+        start_time = time.perf_counter()
+        logger.info(f"Processing image analysis for file: {file.filename}")
+        
+        # Decode straight from the spooled upload, already size-checked from
+        # file.size, without copying its bytes into memory first
+        file.file.seek(0)
+        image = await asyncio.get_running_loop().run_in_executor(None, decode_image, file.file)
+        
+        focus_areas = _DETAIL_LEVEL_FOCUS_AREAS.get(detail_level, _DETAIL_LEVEL_FOCUS_AREAS["medium"])
+        async with _MODEL_SEMAPHORE:
+            result = await run_with_retry(
+                captioner.analyze_image,
+                image_input=image,
+                focus_areas=focus_areas,
+                max_length=max_length,
+                min_length=min_length
+            )
+        caption = result["caption"]
+        description = " ".join(result["detailed_descriptions"][area] for area in focus_areas)
+        
+        # Log successful processing
+        background_tasks.add_task(
+            logger.info,
+            f"Successfully analyzed {file.filename}: {caption[:50]}..."
+        )
+        
+        return ImageAnalysisResponse(
+            caption=caption,
+            caption_length=len(caption),
+            description=description,
+            description_type=detail_level,
+            description_length=len(description),
+            processing_time_seconds=time.perf_counter() - start_time,
+            timestamp=utc_timestamp(),
+            image_properties=_image_properties(result["image_info"], file.size)
+        )
+        
+    except Exception as e:
+        logger.error(f"Error in image analysis: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to analyze image: {str(e)}"
+        )
+
+
 @router.get("/model-info")
 async def get_model_info(
     captioner: ImageCaptioner = Depends(get_image_captioner)
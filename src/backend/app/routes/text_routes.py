@@ -5,15 +5,17 @@ Provides endpoints for text summarization and question answering.
 
 from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
 from typing import Dict, Any, List
-from datetime import datetime
+import asyncio
 import logging
 from ..dependencies import (
     get_text_summarizer,
     validate_text_input,
     check_rate_limit,
-    get_settings
+    get_settings,
+    utc_timestamp
 )
 from ..models.text_summarizer import TextSummarizer
+from ..models.utils import ResultCache
 from ..schemas.text_schemas import (
     TextSummarizationRequest,
     TextSummarizationResponse
@@ -22,6 +24,12 @@ from ..config import Settings
 
 logger = logging.getLogger(__name__)
 
+# Bounds concurrent model calls so a burst of requests cannot exhaust device memory
+_MODEL_SEMAPHORE = asyncio.Semaphore(get_settings().MAX_CONCURRENT_REQUESTS)
+
+# Summaries for identical texts and parameters
+_SUMMARY_CACHE = ResultCache()
+
 router = APIRouter(
     prefix="/text",
     tags=["text processing"]
@@ -66,19 +74,35 @@ async def summarize_text(
                 detail=f"Text length exceeds maximum allowed length of {settings.MAX_TEXT_LENGTH} characters"
             )
         
+        cache_key = ResultCache.key(
+            request.text,
+            request.summary_type,
+            request.max_length,
+            request.min_length,
+            request.use_lora,
+            request.lora_adapter
+        )
+        summary = _SUMMARY_CACHE.get(cache_key)
+        
         # Generate summary
-        if request.summary_type == "abstractive":
-            summary = await summarizer.summarize(
-                text=request.text,
-                max_length=request.max_length,
-                min_length=request.min_length,
-                use_lora=request.use_lora,
-                lora_adapter=request.lora_adapter
-            )
+        if summary is not None:
+            logger.info("Reusing cached summary")
+        elif request.summary_type == "abstractive":
+            async with _MODEL_SEMAPHORE:
+                summary = await summarizer.summarize(
+                    text=request.text,
+                    max_length=request.max_length,
+                    min_length=request.min_length,
+                    use_lora=request.use_lora,
+                    lora_adapter=request.lora_adapter
+                )
         elif request.summary_type == "extractive":
-            summary = await summarizer.extractive_summarize(
-                text=request.text,
-                num_sentences=3
+            # Sentence scoring is CPU-bound; keep it off the event loop
+            summary = await asyncio.get_running_loop().run_in_executor(
+                None,
+                summarizer.extractive_summarize,
+                request.text,
+                3
             )
         else:
             raise HTTPException(
@@ -86,6 +110,8 @@ async def summarize_text(
                 detail="Invalid summarization method. Use 'abstractive' or 'extractive'"
             )
         
+        _SUMMARY_CACHE.set(cache_key, summary)
+        
         # Log successful processing
         background_tasks.add_task(
             logger.info,
@@ -100,7 +126,7 @@ async def summarize_text(
             summary_length=len(summary),
             compression_ratio=round(len(summary) / len(request.text), 3),
             processing_time_seconds=0.0,
-            timestamp=datetime.now().isoformat()
+            timestamp=utc_timestamp()
         )
         
     except Exception as e:
@@ -37,6 +37,7 @@ from .image_schemas import (
     BatchImageStats,
     ImageDescriptionRequest,
     ImageDescriptionResponse,
+    ImageAnalysisResponse,
     ImageProperties,
     ImageModelInfo,
     ImageServiceStats,
@@ -54,6 +55,7 @@ from .audio_schemas import (
     AudioTranslationRequest,
     AudioTranslationResponse,
     BatchAudioRequest,
+    BatchAudioItem,
     BatchAudioResponse,
     BatchAudioResult,
     BatchAudioStats,
@@ -120,6 +122,7 @@ __all__ = [
     "BatchImageStats",
     "ImageDescriptionRequest",
     "ImageDescriptionResponse",
+    "ImageAnalysisResponse",
     "ImageProperties",
     "ImageModelInfo",
     "ImageServiceStats",
@@ -135,6 +138,7 @@ __all__ = [
     "AudioTranslationRequest",
     "AudioTranslationResponse",
     "BatchAudioRequest",
+    "BatchAudioItem",
     "BatchAudioResponse",
     "BatchAudioResult",
     "BatchAudioStats",
@@ -1,12 +1,61 @@
 """Pydantic schemas for audio processing endpoints.
 
 Defines request and response models for speech-to-text and audio translation.
+
+The audio routes take raw audio as streamed multipart uploads, so the bytes
+are never base64-encoded or decoded. The base64 ``audio_data`` request models
+here are the compatibility form for JSON-only transports.
 """
 
-from typing import List, Optional, Dict, Any, Union
-from pydantic import BaseModel, Field, validator
+from typing import List, Optional, Dict, Any, Type, TypeVar, Union
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from datetime import datetime
-import base64
+import re
+
+from ..config import settings
+
+
+# Canonical base64: alphabet characters with at most two trailing '=' pads
+_BASE64_RE = re.compile(r'[A-Za-z0-9+/]*={0,2}')
+_LINE_BREAKS = str.maketrans('', '', '\r\n')
+
+# Whisper tasks accepted by the request validators
+_TASKS = frozenset(('transcribe', 'translate'))
+
+
+def _is_base64(value: str) -> bool:
+    """Structurally validate base64 text without decoding it.
+    
+    Multi-megabyte audio payloads are checked in one scan with no decoded
+    copy; the audio models decode them once, when they are actually used.
+    Line breaks from MIME-wrapped encoders are ignored, as the decoder does.
+    """
+    if '\n' in value or '\r' in value:
+        value = value.translate(_LINE_BREAKS)
+    return len(value) % 4 == 0 and _BASE64_RE.fullmatch(value) is not None
+
+
+_Model = TypeVar('_Model', bound=BaseModel)
+
+
+def construct_trusted(model: Type[_Model], **fields: Any) -> _Model:
+    """Build a model from trusted server-side data without validation.
+    
+    For responses assembled from service and model outputs, and for request
+    models whose payload was already validated upstream (e.g. a
+    ``BatchAudioRequest`` fanned out to workers), which would otherwise
+    rescan every base64 payload. Routes that return a raw ``Response`` skip
+    FastAPI's ``response_model`` validation, so nothing checks these values
+    again; callers must pass data that already matches the schema. Nested
+    models must be passed as instances, since nothing is coerced. Never use
+    this for client input.
+    
+    With ``DEBUG`` enabled the fields are fully validated instead, so data
+    that does not match the schema fails in development.
+    """
+    if settings.DEBUG:
+        return model.model_validate(fields)
+    return model.model_construct(**fields)
 
 
 class AudioUploadRequest(BaseModel):
@@ -25,12 +74,11 @@ class AudioUploadRequest(BaseModel):
         description="Whether to only validate the audio without processing"
     )
     
-    @validator('audio_data')
+    @field_validator('audio_data')
+    @classmethod
     def validate_audio_data(cls, v):
-        try:
-            # Basic validation of base64 data
-            base64.b64decode(v)
-        except Exception:
+        # Basic validation of base64 data
+        if not _is_base64(v):
             raise ValueError('Invalid base64 audio data')
         return v
 
@@ -107,17 +155,17 @@ class SpeechToTextRequest(BaseModel):
         description="Specific LoRA adapter name to use"
     )
     
-    @validator('audio_data')
+    @field_validator('audio_data')
+    @classmethod
     def validate_audio_data(cls, v):
-        try:
-            base64.b64decode(v)
-        except Exception:
+        if not _is_base64(v):
             raise ValueError('Invalid base64 audio data')
         return v
     
-    @validator('task')
+    @field_validator('task')
+    @classmethod
     def validate_task(cls, v):
-        if v not in ['transcribe', 'translate']:
+        if v not in _TASKS:
             raise ValueError('task must be either "transcribe" or "translate"')
         return v
 
@@ -211,11 +259,10 @@ class AudioTranslationRequest(BaseModel):
         description="Specific LoRA adapter name to use"
     )
     
-    @validator('audio_data')
+    @field_validator('audio_data')
+    @classmethod
     def validate_audio_data(cls, v):
-        try:
-            base64.b64decode(v)
-        except Exception:
+        if not _is_base64(v):
             raise ValueError('Invalid base64 audio data')
         return v
 
@@ -257,13 +304,44 @@ class AudioTranslationResponse(BaseModel):
     )
 
 
+class BatchAudioItem(BaseModel):
+    """Schema for one audio file in a batch request."""
+    
+    # Clients may attach their own metadata alongside the audio
+    model_config = ConfigDict(extra='allow')
+    
+    audio_data: str = Field(
+        ...,
+        description="Base64 encoded audio data"
+    )
+    audio_id: Optional[str] = Field(
+        default=None,
+        description="Client-side identifier for the audio file"
+    )
+    filename: Optional[str] = Field(
+        default=None,
+        description="Original filename of the audio file"
+    )
+    language: Optional[str] = Field(
+        default=None,
+        description="Language code for this file (overrides the batch language)"
+    )
+    
+    @field_validator('audio_data')
+    @classmethod
+    def validate_audio_data(cls, v):
+        if not _is_base64(v):
+            raise ValueError('Invalid base64 audio data')
+        return v
+
+
 class BatchAudioRequest(BaseModel):
     """Request schema for batch audio processing."""
     
-    audio_files: List[Dict[str, Any]] = Field(
+    audio_files: List[BatchAudioItem] = Field(
         ...,
-        min_items=1,
-        max_items=10,
+        min_length=1,
+        max_length=10,
         description="List of audio files with their data and optional metadata"
     )
     language: Optional[str] = Field(
@@ -287,20 +365,10 @@ class BatchAudioRequest(BaseModel):
         description="Specific LoRA adapter name to use"
     )
     
-    @validator('audio_files')
-    def validate_audio_files(cls, v):
-        for i, audio in enumerate(v):
-            if 'audio_data' not in audio:
-                raise ValueError(f'Audio file at index {i} missing "audio_data" field')
-            try:
-                base64.b64decode(audio['audio_data'])
-            except Exception:
-                raise ValueError(f'Invalid base64 audio data at index {i}')
-        return v
-    
-    @validator('task')
+    @field_validator('task')
+    @classmethod
     def validate_task(cls, v):
-        if v not in ['transcribe', 'translate']:
+        if v not in _TASKS:
             raise ValueError('task must be either "transcribe" or "translate"')
         return v
 
@@ -432,6 +432,36 @@ class ImageDescriptionResponse(BaseModel):
     )
 
 
+class ImageAnalysisResponse(BaseModel):
+    """Response schema for combined captioning and detailed description."""
+    
+    caption: str = Field(
+        description="Generated image caption"
+    )
+    caption_length: int = Field(
+        description="Length of the caption"
+    )
+    description: str = Field(
+        description="Generated detailed description"
+    )
+    description_type: str = Field(
+        description="Type of description generated"
+    )
+    description_length: int = Field(
+        description="Length of the description"
+    )
+    processing_time_seconds: float = Field(
+        description="Time taken to process the request"
+    )
+    timestamp: str = Field(
+        description="ISO timestamp of processing completion"
+    )
+    image_properties: Optional[ImageProperties] = Field(
+        default=None,
+        description="Optional image properties analysis"
+    )
+
+
 class ImageModelInfo(BaseModel):
     """Schema for image model information."""
     
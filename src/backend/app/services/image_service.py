@@ -166,7 +166,9 @@ class ImageService:
             
             # Convert bytes to PIL Image if necessary
             if isinstance(image, bytes):
-                image = Image.open(io.BytesIO(image))
+                with io.BytesIO(image) as buffer:
+                    image = Image.open(buffer)
+                    image.load()
             
             # Store original size
             original_size = image.size
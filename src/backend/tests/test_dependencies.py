@@ -0,0 +1,401 @@
+"""Tests for common dependencies.
+
+This module contains tests for the upload buffering, multipart streaming
+and rate limiting helpers shared by the routes.
+"""
+
+import io
+import queue
+import httpx
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from fastapi import HTTPException, Request, UploadFile
+
+from app.config import settings
+from app import dependencies
+from app.dependencies import (
+    _acquire_buffer,
+    _release_buffer,
+    looks_like_audio,
+    rate_limit_dependency,
+    read_upload,
+    sniff_upload,
+    stream_upload,
+    sweep_rate_limit_storage,
+    validate_audio_content_type
+)
+
+# Small stand-in for MAX_FILE_SIZE so pooled buffers stay cheap
+_BUFFER_SIZE = 16
+
+
+@pytest.fixture
+def small_buffers():
+    """Shrink MAX_FILE_SIZE to the test buffer size."""
+    with patch.object(settings, "MAX_FILE_SIZE", _BUFFER_SIZE):
+        yield
+
+
+def make_request(pool_size=2, filled=0):
+    """Build a minimal request carrying an upload buffer pool."""
+    pool = queue.Queue(maxsize=pool_size)
+    for _ in range(filled):
+        pool.put_nowait(bytearray(_BUFFER_SIZE))
+    return SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(buffer_pool=pool)))
+
+
+class TestBufferPool:
+    """Test cases for upload buffer acquire/release."""
+    
+    def test_acquire_reuses_pooled_buffer(self, small_buffers):
+        """Acquiring takes a pooled buffer when one fits."""
+        request = make_request(filled=1)
+        pooled = request.app.state.buffer_pool.queue[0]
+        
+        buffer = _acquire_buffer(request, _BUFFER_SIZE)
+        
+        assert buffer is pooled
+        assert request.app.state.buffer_pool.empty()
+    
+    def test_acquire_allocates_when_pool_empty(self, small_buffers):
+        """An empty pool falls back to a fresh allocation."""
+        request = make_request()
+        
+        buffer = _acquire_buffer(request, _BUFFER_SIZE)
+        
+        assert len(buffer) == _BUFFER_SIZE
+    
+    def test_acquire_oversized_leaves_pool(self, small_buffers):
+        """Requests above MAX_FILE_SIZE allocate a one-off buffer without draining the pool."""
+        request = make_request(filled=1)
+        
+        buffer = _acquire_buffer(request, _BUFFER_SIZE * 4)
+        _release_buffer(request, buffer)
+        
+        assert len(buffer) == _BUFFER_SIZE * 4
+        assert request.app.state.buffer_pool.qsize() == 1
+        assert len(request.app.state.buffer_pool.get_nowait()) == _BUFFER_SIZE
+    
+    def test_release_returns_buffer(self, small_buffers):
+        """Released standard buffers go back into the pool."""
+        request = make_request()
+        buffer = _acquire_buffer(request, _BUFFER_SIZE)
+        
+        _release_buffer(request, buffer)
+        
+        assert request.app.state.buffer_pool.get_nowait() is buffer
+    
+    def test_release_drops_buffer_when_pool_full(self, small_buffers):
+        """Buffers beyond the pool size are dropped instead of growing the pool."""
+        request = make_request(pool_size=2, filled=2)
+        
+        _release_buffer(request, bytearray(_BUFFER_SIZE))
+        
+        assert request.app.state.buffer_pool.qsize() == 2
+    
+    def test_release_drops_oversized_buffer(self, small_buffers):
+        """Buffers that are not MAX_FILE_SIZE are never pooled."""
+        request = make_request()
+        
+        _release_buffer(request, bytearray(_BUFFER_SIZE * 4))
+        
+        assert request.app.state.buffer_pool.empty()
+    
+    def test_release_without_pool(self, small_buffers):
+        """Releasing is a no-op when the app has no pool."""
+        request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace()))
+        
+        _release_buffer(request, bytearray(_BUFFER_SIZE))
+
+
+class TestReadUpload:
+    """Test cases for read_upload."""
+    
+    @pytest.mark.asyncio
+    async def test_read_upload_yields_contents(self, small_buffers):
+        """Uploads within the limit are yielded and the buffer is pooled again."""
+        request = make_request()
+        file = UploadFile(io.BytesIO(b"audio"), filename="clip.wav")
+        
+        async with read_upload(request, file, max_size=_BUFFER_SIZE) as data:
+            assert bytes(data) == b"audio"
+        
+        assert request.app.state.buffer_pool.qsize() == 1
+    
+    @pytest.mark.asyncio
+    async def test_read_upload_rejects_oversized_stream(self, small_buffers):
+        """Bodies crossing max_size while streaming raise 413 and still release the buffer."""
+        request = make_request()
+        file = UploadFile(io.BytesIO(b"x" * (_BUFFER_SIZE + 1)), filename="clip.wav")
+        
+        with pytest.raises(HTTPException) as exc_info:
+            async with read_upload(request, file, max_size=_BUFFER_SIZE):
+                pass
+        
+        assert exc_info.value.status_code == 413
+        assert request.app.state.buffer_pool.qsize() == 1
+    
+    @pytest.mark.asyncio
+    async def test_read_upload_rejects_declared_size(self, small_buffers):
+        """A declared size over the limit is rejected before reading."""
+        request = make_request()
+        file = UploadFile(io.BytesIO(b""), filename="clip.wav", size=_BUFFER_SIZE + 1)
+        
+        with pytest.raises(HTTPException) as exc_info:
+            async with read_upload(request, file, max_size=_BUFFER_SIZE):
+                pass
+        
+        assert exc_info.value.status_code == 413
+        assert request.app.state.buffer_pool.empty()
+
+
+@pytest.fixture
+def rate_limit_storage():
+    """Empty in-process rate-limit storage, restored afterwards."""
+    saved = dict(dependencies.rate_limit_storage)
+    dependencies.rate_limit_storage.clear()
+    yield dependencies.rate_limit_storage
+    dependencies.rate_limit_storage.clear()
+    dependencies.rate_limit_storage.update(saved)
+
+
+def make_client_request(host="10.0.0.1", redis=None):
+    """Build a minimal request from the given client address."""
+    state = SimpleNamespace(redis=redis, rate_limit_sha="sha")
+    return SimpleNamespace(client=SimpleNamespace(host=host), app=SimpleNamespace(state=state))
+
+
+class TestRateLimit:
+    """Test cases for the rolling-window rate limiter."""
+    
+    @pytest.mark.asyncio
+    async def test_in_process_limit(self, rate_limit_storage):
+        """Requests beyond max_requests in the window are rejected with 429."""
+        request = make_client_request()
+        
+        with patch("app.dependencies.time.monotonic", return_value=100.0):
+            await rate_limit_dependency(request, max_requests=2, window_seconds=60)
+            await rate_limit_dependency(request, max_requests=2, window_seconds=60)
+            with pytest.raises(HTTPException) as exc_info:
+                await rate_limit_dependency(request, max_requests=2, window_seconds=60)
+        
+        assert exc_info.value.status_code == 429
+        assert len(rate_limit_storage["10.0.0.1"]) == 2
+    
+    @pytest.mark.asyncio
+    async def test_in_process_window_rolls(self, rate_limit_storage):
+        """Requests older than the window stop counting against the limit."""
+        request = make_client_request()
+        
+        with patch("app.dependencies.time.monotonic", return_value=100.0):
+            await rate_limit_dependency(request, max_requests=1, window_seconds=60)
+        with patch("app.dependencies.time.monotonic", return_value=161.0):
+            await rate_limit_dependency(request, max_requests=1, window_seconds=60)
+        
+        assert list(rate_limit_storage["10.0.0.1"]) == [161.0]
+    
+    @pytest.mark.asyncio
+    async def test_limits_are_per_client(self, rate_limit_storage):
+        """Each client address has its own window."""
+        with patch("app.dependencies.time.monotonic", return_value=100.0):
+            await rate_limit_dependency(make_client_request("10.0.0.1"), max_requests=1, window_seconds=60)
+            await rate_limit_dependency(make_client_request("10.0.0.2"), max_requests=1, window_seconds=60)
+        
+        assert set(rate_limit_storage) == {"10.0.0.1", "10.0.0.2"}
+    
+    @pytest.mark.asyncio
+    async def test_redis_limit(self, rate_limit_storage):
+        """With Redis configured, the script decides and local storage is untouched."""
+        redis = SimpleNamespace(evalsha=AsyncMock(side_effect=[1, 0]))
+        request = make_client_request(redis=redis)
+        
+        await rate_limit_dependency(request, max_requests=5, window_seconds=60)
+        with pytest.raises(HTTPException) as exc_info:
+            await rate_limit_dependency(request, max_requests=5, window_seconds=60)
+        
+        assert exc_info.value.status_code == 429
+        sha, num_keys, key, _, window, max_requests, _ = redis.evalsha.await_args.args
+        assert (sha, num_keys, key, window, max_requests) == ("sha", 1, "rate_limit:10.0.0.1", 60, 5)
+        assert not rate_limit_storage
+    
+    def test_sweep_forgets_idle_clients(self, rate_limit_storage):
+        """Sweeping drops expired timestamps and clients with none left."""
+        rate_limit_storage["idle"].extend([10.0, 20.0])
+        rate_limit_storage["active"].extend([10.0, 90.0])
+        
+        with patch("app.dependencies.time.monotonic", return_value=100.0):
+            sweep_rate_limit_storage(window_seconds=60)
+        
+        assert "idle" not in rate_limit_storage
+        assert list(rate_limit_storage["active"]) == [90.0]
+
+
+def make_multipart_request(files, chunk_size=7, content_length=True, pool=None):
+    """Build a streaming request carrying a multipart body split into small chunks."""
+    built = httpx.Request("POST", "http://testserver/upload", files=files)
+    body = built.read()
+    headers = [(b"content-type", built.headers["content-type"].encode())]
+    if content_length:
+        headers.append((b"content-length", str(len(body)).encode()))
+    messages = [
+        {"type": "http.request", "body": body[i:i + chunk_size], "more_body": True}
+        for i in range(0, len(body), chunk_size)
+    ]
+    messages.append({"type": "http.request", "body": b"", "more_body": False})
+    
+    async def receive():
+        return messages.pop(0)
+    
+    app = SimpleNamespace(state=SimpleNamespace(buffer_pool=pool))
+    scope = {"type": "http", "method": "POST", "path": "/upload", "headers": headers, "app": app}
+    scope["pending_messages"] = messages
+    return Request(scope, receive)
+
+
+class TestStreamUpload:
+    """Test cases for stream_upload."""
+    
+    @pytest.mark.asyncio
+    async def test_parses_every_part(self, small_buffers):
+        """All parts of the field land in one buffer with their headers."""
+        request = make_multipart_request([
+            ("files", ("a.wav", b"RIFFaaaa", "audio/wav")),
+            ("files", ("b.ogg", b"OggSbb", "audio/ogg")),
+            ("other", ("c.txt", b"ignored", "text/plain"))
+        ])
+        
+        async with stream_upload(request, field="files", max_size=_BUFFER_SIZE) as parts:
+            uploaded = [(p.filename, p.content_type, bytes(p.data), p.size) for p in parts]
+        
+        assert uploaded == [
+            ("a.wav", "audio/wav", b"RIFFaaaa", 8),
+            ("b.ogg", "audio/ogg", b"OggSbb", 6)
+        ]
+    
+    @pytest.mark.asyncio
+    async def test_oversized_part_is_dropped(self, small_buffers):
+        """Parts over part_max_size come back empty with their true size."""
+        request = make_multipart_request([
+            ("files", ("big.wav", b"x" * 12, "audio/wav")),
+            ("files", ("ok.wav", b"RIFF", "audio/wav"))
+        ])
+        
+        async with stream_upload(request, field="files", max_size=_BUFFER_SIZE, part_max_size=8) as parts:
+            uploaded = [(bytes(p.data), p.size) for p in parts]
+        
+        assert uploaded == [(b"", 12), (b"RIFF", 4)]
+    
+    @pytest.mark.asyncio
+    async def test_rejects_declared_length(self, small_buffers):
+        """A Content-Length far above max_size is rejected before reading."""
+        request = make_multipart_request([("file", ("a.wav", b"x" * 70_000, "audio/wav"))])
+        
+        with pytest.raises(HTTPException) as exc_info:
+            async with stream_upload(request, max_size=_BUFFER_SIZE):
+                pass
+        
+        assert exc_info.value.status_code == 413
+    
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_stream(self, small_buffers):
+        """Without Content-Length, bodies crossing max_size fail while streaming."""
+        pool = queue.Queue(maxsize=1)
+        request = make_multipart_request(
+            [("file", ("a.wav", b"x" * (_BUFFER_SIZE + 1), "audio/wav"))],
+            content_length=False,
+            pool=pool
+        )
+        
+        with pytest.raises(HTTPException) as exc_info:
+            async with stream_upload(request, max_size=_BUFFER_SIZE):
+                pass
+        
+        assert exc_info.value.status_code == 413
+        assert pool.qsize() == 1
+    
+    @pytest.mark.asyncio
+    async def test_missing_field(self, small_buffers):
+        """A body without the expected field is a 400."""
+        request = make_multipart_request([("other", ("a.wav", b"RIFF", "audio/wav"))])
+        
+        with pytest.raises(HTTPException) as exc_info:
+            async with stream_upload(request, max_size=_BUFFER_SIZE):
+                pass
+        
+        assert exc_info.value.status_code == 400
+
+
+class TestSniffUpload:
+    """Test cases for sniff_upload and audio magic-byte checks."""
+    
+    @pytest.mark.asyncio
+    async def test_keeps_head_and_counts_size(self):
+        """Only the leading bytes are kept while the full size is counted."""
+        request = make_multipart_request([("file", ("a.wav", b"RIFF" + b"x" * 60, "audio/wav"))])
+        
+        upload = await sniff_upload(request, head_size=8, max_size=1024)
+        
+        assert upload.filename == "a.wav"
+        assert upload.content_type == "audio/wav"
+        assert bytes(upload.data) == b"RIFFxxxx"
+        assert upload.size == 64
+    
+    @pytest.mark.asyncio
+    async def test_rejects_content_type_before_body(self):
+        """A wrong declared type fails as soon as the part headers are parsed."""
+        request = make_multipart_request([("file", ("a.txt", b"x" * 2048, "text/plain"))], chunk_size=256)
+        
+        with pytest.raises(HTTPException) as exc_info:
+            await sniff_upload(request, max_size=4096, validate_content_type=validate_audio_content_type)
+        
+        assert exc_info.value.status_code == 400
+        assert len(request.scope["pending_messages"]) > 1
+    
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_stream(self):
+        """Without Content-Length, files crossing max_size fail while streaming."""
+        request = make_multipart_request(
+            [("file", ("a.wav", b"x" * 64, "audio/wav"))],
+            content_length=False
+        )
+        
+        with pytest.raises(HTTPException) as exc_info:
+            await sniff_upload(request, max_size=32)
+        
+        assert exc_info.value.status_code == 413
+    
+    @pytest.mark.asyncio
+    async def test_rejects_declared_length(self):
+        """A Content-Length far above max_size is rejected before reading."""
+        request = make_multipart_request([("file", ("a.wav", b"x" * 70_000, "audio/wav"))])
+        
+        with pytest.raises(HTTPException) as exc_info:
+            await sniff_upload(request, max_size=32)
+        
+        assert exc_info.value.status_code == 413
+    
+    @pytest.mark.asyncio
+    async def test_missing_field(self):
+        """A body without the expected field is a 400."""
+        request = make_multipart_request([("other", ("a.wav", b"RIFF", "audio/wav"))])
+        
+        with pytest.raises(HTTPException) as exc_info:
+            await sniff_upload(request, max_size=1024)
+        
+        assert exc_info.value.status_code == 400
+    
+    @pytest.mark.parametrize("head, expected", [
+        (b"RIFF\x00\x00\x00\x00WAVE", True),
+        (b"OggS\x00\x02", True),
+        (b"fLaC\x00\x00", True),
+        (b"ID3\x04\x00", True),
+        (b"\xff\xfb\x90\x00", True),
+        (b"\xff\x00", False),
+        (b"\xff", False),
+        (b"PK\x03\x04", False),
+        (b"", False)
+    ])
+    def test_looks_like_audio(self, head, expected):
+        """Container signatures and MPEG frame sync are recognised."""
+        assert looks_like_audio(head) is expected
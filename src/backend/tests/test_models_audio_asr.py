@@ -0,0 +1,85 @@
+"""Tests for the audio ASR model wrapper.
+
+This module contains tests for the AudioASR batching paths, with the Whisper
+generate call replaced by a stub.
+"""
+
+import threading
+import numpy as np
+import pytest
+
+from app.models.audio_asr import AudioASR
+
+
+@pytest.fixture
+def asr():
+    """AudioASR without a loaded model; generate records the calling thread."""
+    model = AudioASR.__new__(AudioASR)
+    model.sample_rate = 16000
+    model.batch_size = 2
+    model.generate_threads = []
+    model.generate_kwargs = []
+    
+    def batched_generate(audios, return_timestamps=False, **generate_kwargs):
+        model.generate_threads.append(threading.current_thread())
+        model.generate_kwargs.append(generate_kwargs)
+        return [{"text": "hola", "language": "es"} for _ in audios]
+    
+    model._batched_generate = batched_generate
+    return model
+
+
+class TestBatchTranscribe:
+    """Test cases for AudioASR.batch_transcribe."""
+    
+    @pytest.mark.asyncio
+    async def test_generate_runs_off_event_loop(self, asr):
+        """Generate calls are offloaded from the event loop thread."""
+        audios = [np.zeros(1600, dtype=np.float32) for _ in range(3)]
+        
+        results = await asr.batch_transcribe(audios)
+        
+        assert len(results) == 3
+        assert len(asr.generate_threads) == 2
+        assert threading.main_thread() not in asr.generate_threads
+    
+    @pytest.mark.asyncio
+    async def test_reports_detected_language(self, asr):
+        """Without a requested language, each clip reports the detected one."""
+        results = await asr.batch_transcribe([np.zeros(1600, dtype=np.float32)])
+        
+        assert results[0]["language"] == "es"
+        assert results[0]["parameters"]["language"] is None
+    
+    @pytest.mark.asyncio
+    async def test_requested_language_wins(self, asr):
+        """An explicit language is reported as given."""
+        results = await asr.batch_transcribe([np.zeros(1600, dtype=np.float32)], language="en")
+        
+        assert results[0]["language"] == "en"
+    
+    @pytest.mark.asyncio
+    async def test_temperature_enables_sampling(self, asr):
+        """A positive temperature switches generate to sampling."""
+        await asr.batch_transcribe([np.zeros(1600, dtype=np.float32)], temperature=0.4)
+        await asr.batch_transcribe([np.zeros(1600, dtype=np.float32)])
+        
+        assert asr.generate_kwargs[0]["do_sample"] is True
+        assert asr.generate_kwargs[0]["temperature"] == 0.4
+        assert "do_sample" not in asr.generate_kwargs[1]
+
+
+class TestLongAudio:
+    """Test cases for AudioASR chunked long-audio transcription."""
+    
+    @pytest.mark.asyncio
+    async def test_chunks_generate_off_event_loop(self, asr):
+        """Chunk generate calls are offloaded and report the detected language."""
+        audio = np.zeros(16000 * 5, dtype=np.float32)
+        
+        result = await asr._transcribe_long_audio(audio, None, "transcribe", False, 2.0, 0.5)
+        
+        assert result["chunked"] is True
+        assert result["language"] == "es"
+        assert asr.generate_threads
+        assert threading.main_thread() not in asr.generate_threads
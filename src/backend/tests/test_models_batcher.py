@@ -0,0 +1,185 @@
+"""Tests for dynamic request batching.
+
+This module contains tests for the DynamicBatcher class that groups
+concurrent inference requests into batched model calls.
+"""
+
+import asyncio
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+
+from app.models.batcher import DynamicBatcher
+
+
+class RecordingProcessor:
+    """process_batch stub that records each call and echoes its items."""
+    
+    def __init__(self, fail_keys=()):
+        self.calls = []
+        self.threads = set()
+        self.fail_keys = set(fail_keys)
+    
+    def __call__(self, key, items):
+        self.calls.append((key, list(items)))
+        self.threads.add(threading.current_thread())
+        if key in self.fail_keys:
+            raise RuntimeError(f"batch failed for {key}")
+        return [f"{key}:{item}" for item in items]
+
+
+class TestDynamicBatcherGrouping:
+    """Test cases for batching and grouping by key."""
+    
+    @pytest.mark.asyncio
+    async def test_groups_requests_by_key(self):
+        """Concurrent requests sharing a key run in one call, in submission order."""
+        processor = RecordingProcessor()
+        batcher = DynamicBatcher(processor, name="test", max_batch_size=8, max_wait_ms=50)
+        
+        results = await asyncio.gather(
+            batcher.submit(1, key="a"),
+            batcher.submit(2, key="b"),
+            batcher.submit(3, key="a")
+        )
+        await batcher.stop()
+        
+        assert results == ["a:1", "b:2", "a:3"]
+        assert sorted(processor.calls) == [("a", [1, 3]), ("b", [2])]
+    
+    @pytest.mark.asyncio
+    async def test_runs_on_dedicated_thread(self):
+        """Batches run off the event loop on the batcher's own worker thread."""
+        processor = RecordingProcessor()
+        batcher = DynamicBatcher(processor, name="test", max_batch_size=8, max_wait_ms=1)
+        
+        await batcher.submit(1)
+        await batcher.submit(2)
+        await batcher.stop()
+        
+        assert len(processor.threads) == 1
+        assert threading.current_thread() not in processor.threads
+        assert next(iter(processor.threads)).name.startswith("test")
+
+
+class TestDynamicBatcherFlush:
+    """Test cases for when a pending batch is flushed."""
+    
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_before_wait(self):
+        """A batch that reaches max_batch_size runs without waiting out max_wait."""
+        processor = RecordingProcessor()
+        batcher = DynamicBatcher(processor, name="test", max_batch_size=2, max_wait_ms=10_000)
+        
+        results = await asyncio.wait_for(
+            asyncio.gather(batcher.submit(1), batcher.submit(2)),
+            timeout=5
+        )
+        await batcher.stop()
+        
+        assert results == ["None:1", "None:2"]
+        assert processor.calls == [(None, [1, 2])]
+    
+    @pytest.mark.asyncio
+    async def test_partial_batch_flushes_after_wait(self):
+        """A lone request runs once max_wait expires."""
+        processor = RecordingProcessor()
+        batcher = DynamicBatcher(processor, name="test", max_batch_size=8, max_wait_ms=20)
+        
+        result = await asyncio.wait_for(batcher.submit(1), timeout=5)
+        await batcher.stop()
+        
+        assert result == "None:1"
+        assert processor.calls == [(None, [1])]
+
+
+class TestDynamicBatcherErrors:
+    """Test cases for failures and cancellation."""
+    
+    @pytest.mark.asyncio
+    async def test_exception_only_fails_its_group(self):
+        """A failing group raises for its own requests while other groups succeed."""
+        processor = RecordingProcessor(fail_keys={"bad"})
+        batcher = DynamicBatcher(processor, name="test", max_batch_size=8, max_wait_ms=50)
+        
+        good, bad_1, bad_2 = await asyncio.gather(
+            batcher.submit(1, key="good"),
+            batcher.submit(2, key="bad"),
+            batcher.submit(3, key="bad"),
+            return_exceptions=True
+        )
+        
+        assert good == "good:1"
+        assert isinstance(bad_1, RuntimeError)
+        assert isinstance(bad_2, RuntimeError)
+        
+        # The worker survives the failure and keeps serving requests
+        assert await batcher.submit(4, key="good") == "good:4"
+        await batcher.stop()
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_request_does_not_break_batch(self):
+        """A caller that gives up does not prevent the rest of its batch from resolving."""
+        processor = RecordingProcessor()
+        batcher = DynamicBatcher(processor, name="test", max_batch_size=8, max_wait_ms=50)
+        
+        cancelled = asyncio.create_task(batcher.submit(1))
+        kept = asyncio.create_task(batcher.submit(2))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        
+        assert await kept == "None:2"
+        assert cancelled.cancelled()
+        await batcher.stop()
+    
+    @pytest.mark.asyncio
+    async def test_stop_releases_worker_and_restarts(self):
+        """Stopping cancels the worker and shuts its thread down; the next submit restarts both."""
+        processor = RecordingProcessor()
+        batcher = DynamicBatcher(processor, name="test", max_batch_size=8, max_wait_ms=1)
+        await batcher.submit(1)
+        worker = batcher._worker
+        
+        await batcher.stop()
+        await asyncio.sleep(0)
+        
+        assert worker.cancelled()
+        assert batcher._worker is None
+        assert batcher._executor is None
+        
+        assert await batcher.submit(2) == "None:2"
+        await batcher.stop()
+    
+    @pytest.mark.asyncio
+    async def test_stop_fails_waiting_requests(self):
+        """Requests still queued or collected when the batcher stops fail instead of hanging."""
+        processor = RecordingProcessor()
+        batcher = DynamicBatcher(processor, name="test", max_batch_size=8, max_wait_ms=10_000)
+        
+        waiting = [asyncio.create_task(batcher.submit(i)) for i in range(3)]
+        await asyncio.sleep(0.01)
+        await batcher.stop()
+        results = await asyncio.wait_for(asyncio.gather(*waiting, return_exceptions=True), timeout=5)
+        
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert "test batcher stopped" in str(results[0])
+        assert processor.calls == []
+    
+    @pytest.mark.asyncio
+    async def test_shared_executor_serializes_batchers(self):
+        """Batchers given one executor run on its thread and leave it running when stopped."""
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="shared")
+        processors = [RecordingProcessor(), RecordingProcessor()]
+        batchers = [
+            DynamicBatcher(processor, name=f"test{i}", max_wait_ms=1, executor=executor)
+            for i, processor in enumerate(processors)
+        ]
+        
+        await asyncio.gather(batchers[0].submit(1), batchers[1].submit(2))
+        for batcher in batchers:
+            await batcher.stop()
+        
+        assert processors[0].threads == processors[1].threads
+        assert next(iter(processors[0].threads)).name.startswith("shared")
+        assert executor.submit(lambda: "alive").result(timeout=5) == "alive"
+        executor.shutdown()
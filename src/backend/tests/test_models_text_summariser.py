@@ -0,0 +1,105 @@
+"""Tests for the LoRA BART summarization helpers.
+
+This module contains tests for how the summarizer is loaded and how
+summarize_texts builds its generate call, with the model and tokenizer
+replaced by mocks.
+"""
+
+import pytest
+import torch
+from unittest.mock import Mock, patch
+
+from app.models import text_summariser
+from app.models.text_summarizer import TextSummarizer
+
+
+@pytest.fixture
+def loaded_model():
+    """Patch in a mock model, tokenizer and draft model."""
+    tokenizer = Mock(pad_token_id=1, eos_token_id=2)
+    tokenizer.return_value = {"input_ids": torch.ones(1, 4, dtype=torch.long)}
+    tokenizer.batch_decode.return_value = ["summary"]
+    model = Mock()
+    model.generate.return_value = torch.ones(1, 3, dtype=torch.long)
+    draft = Mock()
+    with patch.object(text_summariser, "tokenizer", tokenizer), \
+            patch.object(text_summariser, "model", model), \
+            patch.object(text_summariser, "draft_model", draft):
+        yield model, draft
+
+
+class TestAssistedGeneration:
+    """Test cases for draft-model assisted decoding in summarize_texts."""
+    
+    def test_single_text_uses_draft(self, loaded_model):
+        """With a draft loaded, single texts decode greedily with the assistant and keep other kwargs."""
+        model, draft = loaded_model
+        
+        text_summariser.summarize_texts(["Some text"], max_output_length=40, num_beams=4, length_penalty=2.0)
+        
+        kwargs = model.generate.call_args.kwargs
+        assert kwargs["assistant_model"] is draft
+        assert kwargs["num_beams"] == 1
+        assert kwargs["do_sample"] is False
+        assert kwargs["max_length"] == 40
+        assert kwargs["length_penalty"] == 2.0
+        assert kwargs["early_stopping"] is True
+    
+    def test_multi_text_batch_is_greedy_without_draft(self, loaded_model):
+        """Batches of several texts cannot use the assistant but still decode greedily."""
+        model, _ = loaded_model
+        model.generate.return_value = torch.ones(2, 3, dtype=torch.long)
+        text_summariser.tokenizer.batch_decode.return_value = ["one", "two"]
+        
+        text_summariser.summarize_texts(["Some text", "Other text"], num_beams=4)
+        
+        kwargs = model.generate.call_args.kwargs
+        assert "assistant_model" not in kwargs
+        assert kwargs["num_beams"] == 1
+    
+    def test_beam_search_without_draft(self, loaded_model):
+        """Without a draft model the caller's beam search is kept."""
+        model, _ = loaded_model
+        
+        with patch.object(text_summariser, "draft_model", None):
+            text_summariser.summarize_texts(["Some text"], num_beams=5)
+        
+        kwargs = model.generate.call_args.kwargs
+        assert "assistant_model" not in kwargs
+        assert kwargs["num_beams"] == 5
+
+
+class TestLoading:
+    """Test cases for loading the served summarization model."""
+    
+    def test_load_kwargs_reach_base_model(self):
+        """ModelLoader's precision settings apply to the model that serves requests."""
+        base = Mock()
+        base.eval.return_value = base
+        load_kwargs = {"torch_dtype": torch.float16, "quantization_config": Mock()}
+        with patch.object(text_summariser, "AutoTokenizer"), \
+                patch.object(text_summariser, "AutoModelForSeq2SeqLM") as auto_model, \
+                patch.object(text_summariser, "model", None), \
+                patch.object(text_summariser, "tokenizer", None), \
+                patch.object(text_summariser.settings, "TEXT_SUMMARIZER_DRAFT_MODEL", None):
+            auto_model.from_pretrained.return_value = base
+            
+            _, model = text_summariser.load_model_and_tokenizer("bart", "/missing-lora", load_kwargs=load_kwargs)
+            
+            assert text_summariser.model is base
+        
+        assert model is base
+        auto_model.from_pretrained.assert_called_once_with("bart", **load_kwargs)
+        base.to.assert_not_called()
+    
+    def test_summarizer_reuses_loader_model(self):
+        """A wrapper built on a ModelLoader does not load a second copy of the weights."""
+        loader = Mock()
+        loader.get_model.return_value = Mock()
+        
+        with patch.object(text_summariser, "load_model_and_tokenizer") as load:
+            summarizer = TextSummarizer(model_loader=loader)
+        
+        assert summarizer.model_loaded
+        load.assert_not_called()
+        loader.get_model.assert_called_with("text_summarizer")
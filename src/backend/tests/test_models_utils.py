@@ -0,0 +1,158 @@
+"""Tests for model utilities.
+
+This module contains tests for the device, precision and quantization helpers
+shared by the model wrappers.
+"""
+
+import pytest
+import torch
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+from transformers import WhisperConfig, WhisperForConditionalGeneration
+
+from app.config import settings
+from app.models import text_summariser
+from app.models.audio_asr import AudioASR
+from app.models.utils import ModelLoader, ResultCache, get_autocast_context
+
+
+@pytest.fixture
+def quantized_whisper():
+    """A tiny randomly initialized Whisper with int8 dynamically quantized linears."""
+    config = WhisperConfig(
+        vocab_size=100,
+        num_mel_bins=8,
+        encoder_layers=1,
+        decoder_layers=1,
+        encoder_attention_heads=2,
+        decoder_attention_heads=2,
+        encoder_ffn_dim=16,
+        decoder_ffn_dim=16,
+        d_model=16,
+        max_source_positions=8,
+        max_target_positions=16,
+        pad_token_id=0,
+        bos_token_id=1,
+        eos_token_id=2,
+        decoder_start_token_id=1
+    )
+    torch.manual_seed(0)
+    model = WhisperForConditionalGeneration(config).eval()
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class TestAutocastContext:
+    """Test cases for get_autocast_context."""
+    
+    def test_cpu_keeps_full_precision(self):
+        """CPU inference runs without autocast."""
+        with get_autocast_context("cpu"):
+            assert not torch.is_autocast_enabled("cpu")
+            result = torch.ones(2, 2) @ torch.ones(2, 2)
+        
+        assert result.dtype == torch.float32
+    
+    def test_quantized_whisper_generates_on_cpu(self, quantized_whisper):
+        """The int8 CPU Whisper path generates under the ASR's precision context."""
+        asr = SimpleNamespace(device="cpu")
+        input_features = torch.randn(1, 8, 16)
+        
+        predicted_ids, token_timestamps = AudioASR._generate(
+            asr, quantized_whisper, input_features, max_new_tokens=3
+        )
+        
+        assert predicted_ids.shape[0] == 1
+        assert token_timestamps is None
+
+
+@pytest.fixture
+def cuda_loader(tmp_path):
+    """ModelLoader on a pretend compute capability 8.0 GPU."""
+    loader = ModelLoader.__new__(ModelLoader)
+    loader.device = "cuda"
+    loader.cache_dir = tmp_path
+    loader.models, loader.tokenizers, loader.processors = {}, {}, {}
+    loader.compute_types, loader.compile_modes = {}, {}
+    with patch("app.models.utils.torch.cuda.get_device_capability", return_value=(8, 0)):
+        yield loader
+
+
+class TestQuantizedTextSummarizer:
+    """Test cases for loading the served summarizer under QUANT_MODE."""
+    
+    @pytest.mark.asyncio
+    async def test_nf4_config_reaches_served_model(self, cuda_loader):
+        """The NF4 config is passed to text_summariser and the packed model is left eager."""
+        model = Mock()
+        with patch.object(settings, "QUANT_MODE", "nf4"), \
+                patch.object(settings, "TORCH_COMPILE", True), \
+                patch.object(text_summariser, "load_model_and_tokenizer", return_value=(Mock(), model)) as load:
+            await cuda_loader._load_text_summarizer()
+        
+        quantization_config = load.call_args.kwargs["load_kwargs"]["quantization_config"]
+        assert quantization_config.load_in_4bit
+        assert quantization_config.bnb_4bit_quant_type == "nf4"
+        assert cuda_loader.models["text_summarizer"] is model
+        assert cuda_loader.compute_types["text_summarizer"] == "nf4"
+        assert "text_summarizer" not in cuda_loader.compile_modes
+
+
+class TestResultCache:
+    """Test cases for ResultCache."""
+    
+    def test_key_depends_on_content_and_params(self):
+        """Keys differ when either the content or any parameter differs."""
+        key = ResultCache.key("text", "abstractive", 150)
+        
+        assert key == ResultCache.key(b"text", "abstractive", 150)
+        assert key != ResultCache.key("other", "abstractive", 150)
+        assert key != ResultCache.key("text", "abstractive", 100)
+        assert key != ResultCache.key("text", "abstractive", 150, None)
+    
+    def test_get_returns_stored_value(self):
+        """Stored values are returned until they expire."""
+        cache = ResultCache(maxsize=2, ttl=60)
+        cache.set(b"a", "value")
+        
+        assert cache.get(b"a") == "value"
+        assert cache.get(b"missing") is None
+    
+    def test_entries_expire_after_ttl(self):
+        """Entries older than the TTL are dropped on lookup."""
+        cache = ResultCache(maxsize=2, ttl=10)
+        with patch("app.models.utils.time.monotonic", return_value=100.0):
+            cache.set(b"a", "value")
+        
+        with patch("app.models.utils.time.monotonic", return_value=109.0):
+            assert cache.get(b"a") == "value"
+        with patch("app.models.utils.time.monotonic", return_value=111.0):
+            assert cache.get(b"a") is None
+        assert b"a" not in cache._entries
+    
+    def test_least_recently_used_entry_is_evicted(self):
+        """When full, the entry read or written longest ago is evicted."""
+        cache = ResultCache(maxsize=2, ttl=60)
+        cache.set(b"a", 1)
+        cache.set(b"b", 2)
+        cache.get(b"a")
+        
+        cache.set(b"c", 3)
+        
+        assert cache.get(b"b") is None
+        assert cache.get(b"a") == 1
+        assert cache.get(b"c") == 3
+    
+    def test_zero_size_disables_cache(self):
+        """A maxsize of zero stores nothing."""
+        cache = ResultCache(maxsize=0, ttl=60)
+        cache.set(b"a", 1)
+        
+        assert cache.get(b"a") is None
+    
+    def test_clear_drops_entries(self):
+        """Clearing removes every entry."""
+        cache = ResultCache(maxsize=2, ttl=60)
+        cache.set(b"a", 1)
+        cache.clear()
+        
+        assert cache.get(b"a") is None
@@ -8,9 +8,21 @@ import pytest
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 from unittest.mock import Mock, AsyncMock, patch
+import io
 import json
 import time
 import base64
+import numpy as np
+import soundfile as sf
+import torch
+from fastapi import FastAPI
+from transformers import WhisperFeatureExtractor
+
+from app.config import settings
+from app.dependencies import check_rate_limit, get_settings
+from app.models.audio_asr import AudioASR
+from app.routes.audio_routes import router as audio_router
+from app.schemas.audio_schemas import AudioTranslationResponse, BatchAudioResponse, SpeechToTextResponse
 
 
 class TestSpeechToTextRoute:
@@ -532,4 +544,209 @@ class TestAudioRouteIntegration:
                 "source_language": "es",
                 "target_language": "en"
             })
-            assert translate_response.status_code == 200
\ No newline at end of file
+            assert translate_response.status_code == 200
+
+
+@pytest.fixture
+def audio_app():
+    """Minimal app serving the audio router with a mocked ASR model."""
+    app = FastAPI()
+    app.include_router(audio_router)
+    app.dependency_overrides[check_rate_limit] = lambda: None
+    app.state.audio_asr = Mock()
+    return app
+
+
+class TestBatchTranscribeResponse:
+    """Test cases for the streamed batch transcription endpoint."""
+    
+    def test_batch_transcribe_body_matches_schema(self, audio_app):
+        """The raw JSON body parses as a BatchAudioResponse."""
+        audio_app.state.audio_asr.batch_transcribe = AsyncMock(return_value=[
+            {"transcription": "hello world", "language": "en", "confidence": 1.0, "duration": 2.0}
+        ])
+        files = [
+            ("files", ("clip.wav", b"RIFF0000WAVE", "audio/wav")),
+            ("files", ("notes.txt", b"not audio", "text/plain"))
+        ]
+        
+        with TestClient(audio_app) as client:
+            response = client.post("/audio/batch-transcribe", files=files)
+        
+        assert response.status_code == 200
+        body = BatchAudioResponse.model_validate_json(response.content)
+        assert [result.status for result in body.results] == ["success", "failed"]
+        assert body.results[0].text == "hello world"
+        assert body.results[0].language == "en"
+        assert body.batch_stats.successful_count == 1
+        assert body.batch_stats.failed_count == 1
+    
+    def test_batch_transcribe_passes_temperature(self, audio_app):
+        """The temperature query parameter reaches the model."""
+        audio_app.state.audio_asr.batch_transcribe = AsyncMock(return_value=[
+            {"transcription": "hello", "language": "en", "confidence": 1.0, "duration": 1.0}
+        ])
+        files = [("files", ("clip.wav", b"RIFF0000WAVE", "audio/wav"))]
+        
+        with TestClient(audio_app) as client:
+            response = client.post("/audio/batch-transcribe?temperature=0.3", files=files)
+        
+        assert response.status_code == 200
+        assert audio_app.state.audio_asr.batch_transcribe.call_args.kwargs["temperature"] == 0.3
+
+
+# Token ids emitted by the stub Whisper model: start-of-transcript, language,
+# task, two words, end-of-text
+_STUB_TOKENS = {50258: "<|startoftranscript|>", 50262: "<|es|>", 50359: "<|transcribe|>", 10: " hola", 11: " mundo", 50257: "<|endoftext|>"}
+_STUB_IDS = [50258, 50262, 50359, 10, 11, 50257]
+
+
+class StubWhisper:
+    """Stand-in for WhisperForConditionalGeneration with the real generate signature subset."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def generate(self, input_features, task=None, language=None, return_timestamps=False,
+                 return_token_timestamps=False, do_sample=False, temperature=None):
+        self.calls.append({"task": task, "language": language, "do_sample": do_sample, "temperature": temperature})
+        sequences = torch.tensor([_STUB_IDS] * input_features.shape[0])
+        if return_token_timestamps:
+            times = torch.arange(len(_STUB_IDS), dtype=torch.float32).repeat(input_features.shape[0], 1) * 0.5
+            return {"sequences": sequences, "token_timestamps": times}
+        return sequences
+
+
+def make_stub_processor():
+    """Processor with a real mel filterbank and a tokenizer over the stub vocabulary."""
+    tokenizer = Mock(eos_token_id=50257)
+    tokenizer.decode = lambda ids: "".join(_STUB_TOKENS[i] for i in ids)
+    tokenizer.convert_ids_to_tokens = lambda ids: [_STUB_TOKENS[i] for i in ids]
+    processor = Mock(tokenizer=tokenizer, feature_extractor=WhisperFeatureExtractor())
+    processor.batch_decode = lambda ids, **kwargs: [
+        "".join(_STUB_TOKENS[i] for i in row if i < 50257) for row in ids.tolist()
+    ]
+    return processor
+
+
+def make_wav(seconds=1.0):
+    """Encode a short silent 16kHz mono WAV."""
+    buffer = io.BytesIO()
+    sf.write(buffer, np.zeros(int(16000 * seconds), dtype=np.float32), 16000, format="WAV")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def stub_asr_app(audio_app):
+    """Audio app backed by a real AudioASR whose Whisper model is a stub."""
+    model = StubWhisper()
+    loader = Mock(compile_modes={}, compute_types={})
+    loader.get_model.return_value = model
+    loader.get_processor.return_value = make_stub_processor()
+    audio_app.state.audio_asr = AudioASR(model_loader=loader)
+    audio_app.state.audio_asr.device = "cpu"
+    yield audio_app, model
+
+
+class TestSpeechToTextStubModel:
+    """Test cases for the single-file audio routes against a real AudioASR."""
+    
+    def test_speech_to_text(self, stub_asr_app):
+        """Transcription goes through the batcher and maps onto SpeechToTextResponse."""
+        app, model = stub_asr_app
+        
+        with TestClient(app) as client:
+            response = client.post(
+                "/audio/speech-to-text?word_timestamps=true&temperature=0.2",
+                files={"file": ("clip.wav", make_wav(), "audio/wav")}
+            )
+        
+        assert response.status_code == 200, response.text
+        body = SpeechToTextResponse.model_validate_json(response.content)
+        assert body.text == "hola mundo"
+        assert body.language == "es"
+        assert body.task == "transcribe"
+        assert body.word_count == 2
+        assert [word.word for word in body.word_timestamps] == ["hola", "mundo"]
+        assert model.calls == [{"task": "transcribe", "language": None, "do_sample": True, "temperature": 0.2}]
+    
+    def test_translate(self, stub_asr_app):
+        """Translation runs Whisper's translate task and reports the source language."""
+        app, model = stub_asr_app
+        
+        with TestClient(app) as client:
+            response = client.post(
+                "/audio/translate",
+                files={"file": ("clip.wav", make_wav(), "audio/wav")}
+            )
+        
+        assert response.status_code == 200, response.text
+        body = AudioTranslationResponse.model_validate_json(response.content)
+        assert body.translated_text == "hola mundo"
+        assert body.source_language == "es"
+        assert body.target_language == "en"
+        assert model.calls == [{"task": "translate", "language": None, "do_sample": False, "temperature": None}]
+
+
+class TestAudioRouteClientErrors:
+    """Test cases for client errors raised while streaming audio uploads."""
+    
+    @pytest.mark.parametrize("path", ["/audio/speech-to-text", "/audio/translate"])
+    def test_wrong_content_type_is_400(self, stub_asr_app, path):
+        """A non-audio part is rejected with 400 rather than wrapped as a 500."""
+        app, model = stub_asr_app
+        
+        with TestClient(app) as client:
+            response = client.post(path, files={"file": ("notes.txt", b"text", "text/plain")})
+        
+        assert response.status_code == 400
+        assert model.calls == []
+    
+    @pytest.mark.parametrize("path", ["/audio/speech-to-text", "/audio/translate"])
+    def test_missing_file_is_400(self, stub_asr_app, path):
+        """A body without the file field is rejected with 400."""
+        app, _ = stub_asr_app
+        
+        with TestClient(app) as client:
+            response = client.post(path, files={"other": ("clip.wav", make_wav(), "audio/wav")})
+        
+        assert response.status_code == 400
+    
+    def test_oversized_batch_is_400(self, stub_asr_app):
+        """Batches above MAX_BATCH_SIZE are rejected with 400."""
+        app, model = stub_asr_app
+        files = [("files", (f"{i}.wav", b"RIFF", "audio/wav")) for i in range(settings.MAX_BATCH_SIZE + 1)]
+        
+        with TestClient(app) as client:
+            response = client.post("/audio/batch-transcribe", files=files)
+        
+        assert response.status_code == 400
+        assert model.calls == []
+
+
+class TestAudioRouteUploadLimits:
+    """Test cases for oversized audio uploads."""
+    
+    @pytest.mark.parametrize("path", ["/audio/upload", "/audio/speech-to-text", "/audio/translate"])
+    def test_oversized_file_is_413(self, stub_asr_app, path):
+        """Files above MAX_FILE_SIZE are rejected with 413 before reaching the model."""
+        app, model = stub_asr_app
+        audio = b"RIFF" + bytes(settings.MAX_FILE_SIZE + 128 * 1024)
+        
+        with TestClient(app) as client:
+            response = client.post(path, files={"file": ("clip.wav", audio, "audio/wav")})
+        
+        assert response.status_code == 413
+        assert model.calls == []
+    
+    def test_oversized_batch_body_is_413(self, stub_asr_app):
+        """A batch body above MAX_FILE_SIZE * MAX_BATCH_SIZE is rejected with 413."""
+        app, model = stub_asr_app
+        app.dependency_overrides[get_settings] = lambda: settings.model_copy(update={"MAX_FILE_SIZE": 1024})
+        files = [("files", ("clip.wav", make_wav(seconds=2.0), "audio/wav")) for _ in range(3)]
+        
+        with TestClient(app) as client:
+            response = client.post("/audio/batch-transcribe", files=files)
+        
+        assert response.status_code == 413
+        assert model.calls == []
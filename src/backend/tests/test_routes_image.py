@@ -8,9 +8,16 @@ import pytest
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
 from unittest.mock import Mock, AsyncMock, patch
+import io
 import json
 import time
 import base64
+from fastapi import FastAPI
+from PIL import Image
+
+from app.dependencies import check_rate_limit
+from app.routes.image_routes import router as image_router
+from app.schemas.image_schemas import BatchImageResult, BatchImageStats, ImageAnalysisResponse
 
 
 class TestImageCaptioningRoute:
@@ -488,4 +495,126 @@ class TestImageRouteIntegration:
                 "image_data": sample_base64_image,
                 "max_length": 50
             })
-            assert process_response.status_code == 200
\ No newline at end of file
+            assert process_response.status_code == 200
+
+
+def make_png(width=4, height=2):
+    """Encode a small RGB PNG."""
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "red").save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def image_app():
+    """Minimal app serving the image router with a mocked captioner."""
+    app = FastAPI()
+    app.include_router(image_router)
+    app.dependency_overrides[check_rate_limit] = lambda: None
+    app.state.image_captioner = Mock()
+    return app
+
+
+class TestBatchCaptionStream:
+    """Test cases for the NDJSON batch captioning endpoint."""
+    
+    def test_streams_one_line_per_image_then_stats(self, image_app):
+        """Each image gets its own result line and the last line holds the batch stats."""
+        image_info = {"width": 4, "height": 2, "mode": "RGB", "format": "PNG"}
+        
+        async def iter_batch_caption(images, max_length, min_length):
+            # Spooled uploads must still be readable while the response streams
+            contents = [image.read() for image in images]
+            yield 1, {"error": "cannot identify image"}
+            yield 0, {"caption": "a red square", "image_info": image_info}
+            assert all(content.startswith(b"\x89PNG") for content in contents)
+        
+        image_app.state.image_captioner.iter_batch_caption = iter_batch_caption
+        files = [
+            ("files", ("a.png", make_png(), "image/png")),
+            ("files", ("b.png", make_png(), "image/png")),
+            ("files", ("c.txt", b"not an image", "text/plain"))
+        ]
+        
+        with TestClient(image_app) as client:
+            response = client.post("/image/batch-caption", files=files)
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 4
+        
+        results = {line["index"]: BatchImageResult(**line) for line in lines[:3]}
+        assert results[2].status == "failed"
+        assert results[1].status == "failed"
+        assert results[1].error == "cannot identify image"
+        assert results[0].status == "success"
+        assert results[0].caption == "a red square"
+        assert results[0].image_properties.width == 4
+        
+        stats = BatchImageStats(**lines[3]["batch_stats"])
+        assert stats.total_images == 3
+        assert stats.successful_count == 1
+        assert stats.failed_count == 2
+        assert "timestamp" in lines[3]
+
+
+class TestAnalyzeRoute:
+    """Test cases for the combined caption and description endpoint."""
+    
+    def test_analyze_returns_caption_and_description(self, image_app):
+        """Caption and the requested focus areas come back from one analyze call."""
+        image_app.state.image_captioner.analyze_image = AsyncMock(return_value={
+            "caption": "a red square",
+            "detailed_descriptions": {
+                "general": "A red square.",
+                "objects": "No objects.",
+                "scene": "A flat background."
+            },
+            "image_info": {"width": 4, "height": 2, "mode": "RGB", "format": "PNG"}
+        })
+        
+        with TestClient(image_app) as client:
+            response = client.post(
+                "/image/analyze?detail_level=medium&max_length=30",
+                files={"file": ("a.png", make_png(), "image/png")}
+            )
+        
+        assert response.status_code == 200
+        body = ImageAnalysisResponse(**response.json())
+        assert body.caption == "a red square"
+        assert body.caption_length == len("a red square")
+        assert body.description == "A red square. No objects. A flat background."
+        assert body.description_type == "medium"
+        assert body.image_properties.aspect_ratio == 2.0
+        
+        call = image_app.state.image_captioner.analyze_image.await_args.kwargs
+        assert call["focus_areas"] == ["general", "objects", "scene"]
+        assert call["max_length"] == 30
+        assert call["image_input"].size == (4, 2)
+    
+    def test_analyze_rejects_non_image(self, image_app):
+        """Uploads with a non-image content type never reach the model."""
+        image_app.state.image_captioner.analyze_image = AsyncMock()
+        
+        with TestClient(image_app) as client:
+            response = client.post(
+                "/image/analyze",
+                files={"file": ("a.txt", b"not an image", "text/plain")}
+            )
+        
+        assert response.status_code == 400
+        image_app.state.image_captioner.analyze_image.assert_not_awaited()
+    
+    def test_analyze_model_failure(self, image_app):
+        """Model errors surface as a 500 with the cause."""
+        image_app.state.image_captioner.analyze_image = AsyncMock(side_effect=ValueError("bad image"))
+        
+        with TestClient(image_app) as client:
+            response = client.post(
+                "/image/analyze",
+                files={"file": ("a.png", make_png(), "image/png")}
+            )
+        
+        assert response.status_code == 500
+        assert "bad image" in response.json()["detail"]
@@ -10,6 +10,10 @@ from httpx import AsyncClient
 from unittest.mock import Mock, AsyncMock, patch
 import json
 import time
+from fastapi import FastAPI
+
+from app.dependencies import check_rate_limit
+from app.routes import text_routes
 
 
 class TestTextSummarizationRoute:
@@ -385,4 +389,43 @@ class TestTextRouteIntegration:
                 "text": "Sample text for processing",
                 "max_length": 50
             })
-            assert process_response.status_code == 200
\ No newline at end of file
+            assert process_response.status_code == 200
+
+
+@pytest.fixture
+def text_app():
+    """Minimal app serving the text router with a mocked summarizer and an empty cache."""
+    app = FastAPI()
+    app.include_router(text_routes.router)
+    app.dependency_overrides[check_rate_limit] = lambda: None
+    app.state.text_summarizer = Mock()
+    app.state.text_summarizer.summarize = AsyncMock(return_value="A short summary.")
+    text_routes._SUMMARY_CACHE.clear()
+    yield app
+    text_routes._SUMMARY_CACHE.clear()
+
+
+class TestSummaryCache:
+    """Test cases for the summarization result cache."""
+    
+    def test_identical_request_is_cached(self, text_app):
+        """Repeating a request reuses the cached summary."""
+        payload = {"text": "This is a long enough text to summarize."}
+        
+        with TestClient(text_app) as client:
+            first = client.post("/text/summarize", json=payload)
+            second = client.post("/text/summarize", json=payload)
+        
+        assert first.status_code == second.status_code == 200
+        assert text_app.state.text_summarizer.summarize.await_count == 1
+    
+    def test_lora_settings_are_part_of_key(self, text_app):
+        """Requests that differ only in LoRA settings are summarized separately."""
+        payload = {"text": "This is a long enough text to summarize."}
+        
+        with TestClient(text_app) as client:
+            client.post("/text/summarize", json=payload)
+            client.post("/text/summarize", json={**payload, "use_lora": True})
+            client.post("/text/summarize", json={**payload, "use_lora": True, "lora_adapter": "news"})
+        
+        assert text_app.state.text_summarizer.summarize.await_count == 3
@@ -0,0 +1,73 @@
+"""Tests for audio schemas.
+
+This module contains tests for the structural base64 check used by the
+audio request validators.
+"""
+
+import base64
+import binascii
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.audio_schemas import SpeechToTextRequest, _is_base64
+
+
+def decodes(value: str) -> bool:
+    """Reference check: strict standard-alphabet decoding."""
+    try:
+        base64.b64decode(value, validate=True)
+    except (binascii.Error, ValueError):
+        return False
+    return True
+
+
+class TestIsBase64:
+    """Test cases for _is_base64."""
+    
+    @pytest.mark.parametrize("value", [
+        "",
+        "QQ==",
+        "QUI=",
+        "QUJD",
+        "AB+/",
+        base64.b64encode(bytes(range(256))).decode()
+    ])
+    def test_accepts_canonical_base64(self, value):
+        """Padded standard-alphabet strings are accepted."""
+        assert _is_base64(value)
+        assert decodes(value)
+    
+    def test_accepts_mime_wrapped_base64(self):
+        """Line-wrapped encoder output is accepted, as the audio models decode it."""
+        value = base64.encodebytes(bytes(range(256))).decode()
+        
+        assert "\n" in value
+        assert _is_base64(value)
+        assert _is_base64(value.replace("\n", "\r\n"))
+        assert not _is_base64("QU\nJ")
+    
+    @pytest.mark.parametrize("value", [
+        "Q",
+        "QQ",
+        "QQ=",
+        "Q===",
+        "====",
+        "QQ=A",
+        "A=A=",
+        "QQ== ",
+        "QU JD",
+        "QU\tJD",
+        "ab-_",
+        "QUJDé===",
+        "QUJD\x00"
+    ])
+    def test_rejects_malformed_base64(self, value):
+        """Unpadded, over-padded, misplaced padding, non-newline whitespace and foreign characters are rejected."""
+        assert not _is_base64(value)
+        assert not decodes(value)
+    
+    def test_request_rejects_invalid_audio_data(self):
+        """Request models surface the check as a validation error."""
+        assert SpeechToTextRequest(audio_data="QUJD").audio_data == "QUJD"
+        with pytest.raises(ValidationError, match="Invalid base64 audio data"):
+            SpeechToTextRequest(audio_data="not base64!")